@@ -0,0 +1,474 @@
+"""
+Vectorized batch simulator for Monte Carlo descent analysis.
+
+Runs the Player physics from simulation.py for many jumpers at once with NumPy
+arrays of shape (N,): gravity and max_speed clamping, parachute deployment,
+wind drift, screen clamping, obstacle collision, the landing-speed crash rule
+and scoring. Every jumper has its own layout, wind sequence, deploy altitude
+and steering target.
+
+Layouts and wind can also be taken from seeded scalar Simulations, in which
+case the results match Simulation.step() exactly (see --verify).
+
+Usage:
+    python3 batch_sim.py -n 1000000 --deploy-altitude 150 350 --steer nearest-zone
+"""
+
+import argparse
+import json
+import random
+import time
+
+import numpy as np
+
+import simulation
+from simulation import SCREEN_WIDTH, GROUND_Y, TICK_RATE, Inputs
+
+MAX_OBSTACLES = 8
+# One zone before the first obstacle, one per gap and one after the last
+MAX_ZONES = MAX_OBSTACLES + 1
+
+PLAYER_WIDTH = 40
+PLAYER_HEIGHT = 60
+
+# Ticks until the player leaves the plane; identical for every run because
+# the plane always starts at the same place and speed
+_plane = simulation.Plane()
+JUMP_TICK = 1
+while _plane.x + _plane.speed + _plane.width // 2 <= SCREEN_WIDTH // 3:
+    _plane.x += _plane.speed
+    JUMP_TICK += 1
+JUMP_X = _plane.x + _plane.speed + _plane.width // 2
+JUMP_Y = _plane.y + _plane.height
+
+# A descent always ends well before this; leaves room for any steering policy
+MAX_TICKS = 2000
+WIND_SLOTS = MAX_TICKS // (3 * TICK_RATE) + 2
+
+# Steering dead band around the target, in pixels
+STEER_TOLERANCE = 5
+
+CRASH_NONE = 0
+CRASH_OBSTACLE = 1
+CRASH_TOO_FAST = 2
+
+
+def landing_zones(ox, ow, count):
+    """Vectorized create_landing_zones: returns zone x, width and a valid mask of shape (N, MAX_ZONES)"""
+    n = len(ox)
+    rows = np.arange(n)
+    zx = np.zeros((n, MAX_ZONES), dtype=np.int64)
+    zw = np.zeros((n, MAX_ZONES), dtype=np.int64)
+    valid = np.zeros((n, MAX_ZONES), dtype=bool)
+
+    # Landing zone before the first obstacle
+    first = ox[:, 0]
+    has_first = (count > 0) & (first > 100)
+    width = np.minimum(100, first - 50)
+    zx[:, 0] = first - width - 10
+    zw[:, 0] = width
+    valid[:, 0] = has_first
+
+    # Landing zones between obstacles
+    for i in range(MAX_OBSTACLES - 1):
+        gap = ox[:, i + 1] - (ox[:, i] + ow[:, i])
+        ok = (i + 1 < count) & (gap > 80)
+        zone_width = np.minimum(gap - 20, 100)
+        zx[:, i + 1] = ox[:, i] + ow[:, i] + (gap - zone_width) // 2
+        zw[:, i + 1] = zone_width
+        valid[:, i + 1] = ok
+
+    # Landing zone after the last obstacle
+    last = np.maximum(count - 1, 0)
+    last_right = ox[rows, last] + ow[rows, last]
+    has_last = (count > 0) & (last_right < SCREEN_WIDTH - 100)
+    zx[:, -1] = last_right + 10
+    zw[:, -1] = np.minimum(100, SCREEN_WIDTH - last_right - 50)
+    valid[:, -1] = has_last
+
+    return zx, zw, valid
+
+
+def random_layouts(n, rng):
+    """Draw n layouts with the same distribution as Simulation.reset()"""
+    count = rng.integers(5, MAX_OBSTACLES + 1, size=n)
+    slots = np.arange(MAX_OBSTACLES)
+    unused = slots[None, :] >= count[:, None]
+
+    # random.sample draws distinct positions; redraw the rare rows with duplicates
+    ox = rng.integers(100, SCREEN_WIDTH - 100, size=(n, MAX_OBSTACLES))
+    while True:
+        ox[unused] = SCREEN_WIDTH * 2  # sorts past every real position
+        ox.sort(axis=1)
+        dup = np.any((ox[:, 1:] == ox[:, :-1]) & ~unused[:, 1:], axis=1)
+        if not dup.any():
+            break
+        ox[dup] = rng.integers(100, SCREEN_WIDTH - 100, size=(int(dup.sum()), MAX_OBSTACLES))
+
+    ow = rng.integers(30, 81, size=(n, MAX_OBSTACLES))
+    oh = rng.integers(40, 101, size=(n, MAX_OBSTACLES))
+    ow[unused] = 0
+    oh[unused] = 0
+    ox[unused] = 0
+
+    zx, zw, zvalid = landing_zones(ox, ow, count)
+    return {"ox": ox, "ow": ow, "oh": oh, "count": count, "zx": zx, "zw": zw, "zvalid": zvalid}
+
+
+def random_wind(n, rng):
+    """Draw wind change timers and directions with the distribution of update_wind()"""
+    timers = rng.integers(3 * TICK_RATE, 6 * TICK_RATE + 1, size=(n, WIND_SLOTS))
+    directions = rng.uniform(-1, 1, size=(n, WIND_SLOTS))
+    return {"timers": timers, "directions": directions}
+
+
+def from_simulations(sims):
+    """Copy layouts and upcoming wind sequences out of freshly reset scalar Simulations"""
+    n = len(sims)
+    ox = np.zeros((n, MAX_OBSTACLES), dtype=np.int64)
+    ow = np.zeros((n, MAX_OBSTACLES), dtype=np.int64)
+    oh = np.zeros((n, MAX_OBSTACLES), dtype=np.int64)
+    count = np.zeros(n, dtype=np.int64)
+    timers = np.zeros((n, WIND_SLOTS), dtype=np.int64)
+    directions = np.zeros((n, WIND_SLOTS))
+
+    for i, sim in enumerate(sims):
+        count[i] = len(sim.obstacles)
+        for j, obstacle in enumerate(sim.obstacles):
+            ox[i, j] = obstacle.x
+            ow[i, j] = obstacle.width
+            oh[i, j] = obstacle.height
+        # The wind draws are the only thing left on the gameplay stream after reset()
+        rng = random.Random()
+        rng.setstate(sim.rng.getstate())
+        for k in range(WIND_SLOTS):
+            timers[i, k] = rng.randint(3 * TICK_RATE, 6 * TICK_RATE)
+            directions[i, k] = rng.uniform(-1, 1)
+
+    zx, zw, zvalid = landing_zones(ox, ow, count)
+    layouts = {"ox": ox, "ow": ow, "oh": oh, "count": count, "zx": zx, "zw": zw, "zvalid": zvalid}
+    return layouts, {"timers": timers, "directions": directions}
+
+
+def nearest_zone_targets(layouts, x=JUMP_X + PLAYER_WIDTH // 2):
+    """Centre of the safe zone nearest to x for every layout, NaN when there is none"""
+    centers = layouts["zx"] + layouts["zw"] // 2
+    distance = np.where(layouts["zvalid"], np.abs(centers - x), np.iinfo(np.int64).max)
+    best = distance.argmin(axis=1)
+    targets = centers[np.arange(len(best)), best].astype(float)
+    targets[~layouts["zvalid"].any(axis=1)] = np.nan
+    return targets
+
+
+def scalar_policy(deploy_altitude, target_x):
+    """The batch policy for one jumper, as a Simulation.run() policy"""
+    def policy(sim):
+        player = sim.player
+        deploy = GROUND_Y - (player.y + player.height) <= deploy_altitude
+        # A NaN target compares False both ways, so the jumper never steers
+        center = player.x + player.width / 2
+        right = center < target_x - STEER_TOLERANCE
+        left = center > target_x + STEER_TOLERANCE
+        return Inputs(left, right, deploy)
+    return policy
+
+
+def simulate(layouts, wind, deploy_altitude, target_x):
+    """Run one descent per row. Returns a dict of per-jumper result arrays."""
+    n = len(deploy_altitude)
+    ox, ow, oh, count = layouts["ox"], layouts["ow"], layouts["oh"], layouts["count"]
+    obstacle_valid = np.arange(MAX_OBSTACLES)[None, :] < count[:, None]
+    # Obstacle edges with unused slots moved where nothing can touch them
+    # (int16 keeps the per-tick gathers small)
+    oy = np.where(obstacle_valid, GROUND_Y - oh, GROUND_Y).astype(np.int16)
+    oleft = np.where(obstacle_valid, ox, SCREEN_WIDTH * 2).astype(np.int16)
+    oright = np.where(obstacle_valid, ox + ow, SCREEN_WIDTH * 2).astype(np.int16)
+    wind_timers, wind_directions = wind["timers"], wind["directions"]
+
+    # Results, written once per jumper when its descent ends
+    out_alive = np.zeros(n, dtype=bool)
+    out_x = np.zeros(n)
+    out_deploy_height = np.zeros(n)
+    out_deployed = np.zeros(n, dtype=bool)
+    out_cause = np.zeros(n, dtype=np.int8)
+    out_ticks = np.zeros(n, dtype=np.int64)
+
+    # Working state for the jumpers still descending, compacted as they finish.
+    # idx maps each working row back to its row in the inputs.
+    idx = np.arange(n)
+    x = np.full(n, float(SCREEN_WIDTH // 2))
+    y = np.full(n, 50.0)
+    sx = np.zeros(n)
+    sy = np.ones(n)
+    gravity = np.full(n, 0.2)
+    max_speed = np.full(n, 7.0)
+    deployed = np.zeros(n, dtype=bool)
+    deploy_height = np.zeros(n)
+    player_wind = np.zeros(n)
+    # Horizontal wind push per tick: player.wind * 0.1 once the parachute is open
+    drift = np.zeros(n)
+    altitude = np.asarray(deploy_altitude, dtype=float).copy()
+    # Cheap pre-filter for the deploy rule: nobody can deploy while above this
+    # height, and it becomes infinite once the parachute is open
+    deploy_from = (GROUND_Y - PLAYER_HEIGHT - 1) - altitude
+    target = np.asarray(target_x, dtype=float)
+    # Steering dead band edges; NaN targets compare False both ways, so those jumpers never steer
+    steer_below = target - STEER_TOLERANCE
+    steer_above = target + STEER_TOLERANCE
+    # Nothing can be hit while the player's feet are above the tallest obstacle
+    top = oy.min(axis=1)
+    steering = not np.isnan(target).all()
+
+    # Wind is event driven: the tick of each jumper's next change, as the
+    # countdown in Simulation.update_wind() would reach it
+    next_wind = np.ones(n, dtype=np.int64)
+    wind_slot = np.zeros(n, dtype=np.int64)
+    earliest_wind = 1
+
+    for tick in range(1, MAX_TICKS + 1):
+        if len(idx) == 0:
+            break
+
+        if tick >= earliest_wind:
+            change = np.flatnonzero(next_wind == tick)
+            rows = idx[change]
+            k = wind_slot[change]
+            player_wind[change] = wind_directions[rows, k]
+            drift[change] = np.where(deployed[change], player_wind[change] * 0.1, 0.0)
+            next_wind[change] = tick + wind_timers[rows, k]
+            wind_slot[change] = k + 1
+            earliest_wind = next_wind.min()
+
+        if tick < JUMP_TICK:
+            continue
+
+        # Inputs come from the state before this tick, like a policy passed to run()
+        opening = None
+        candidates = y > deploy_from
+        if candidates.any():
+            candidates = np.flatnonzero(candidates)
+            deploy = GROUND_Y - (y[candidates] + PLAYER_HEIGHT) <= altitude[candidates]
+            opening = candidates[deploy]
+        if steering:
+            center = x + PLAYER_WIDTH / 2
+            right = center < steer_below
+            left = center > steer_above
+
+        if tick == JUMP_TICK:
+            x.fill(JUMP_X)
+            y.fill(JUMP_Y)
+
+        # Deploy parachute
+        if opening is not None and len(opening):
+            deploy_from[opening] = np.inf
+            deployed[opening] = True
+            deploy_height[opening] = y[opening]
+            gravity[opening] = 0.05
+            max_speed[opening] = 2.0
+            drift[opening] = player_wind[opening] * 0.1
+
+        # Left-right movement. Masked selects are written as sums of products
+        # with exactly one non-zero term: branch-free and still bit-exact.
+        slowed = np.maximum(sx - 0.1, 0.0)
+        slowed += np.minimum(sx + 0.1, 0.0)
+        if steering:
+            # |speed_x| never exceeds 3 by more than one tick of drift, so a
+            # symmetric clip equals max(-3, sx - 0.2) / min(3, sx + 0.2)
+            steer = left | right
+            pushed = right.view(np.int8) - left.view(np.int8)
+            pushed = np.clip(sx + pushed * 0.2, -3.0, 3.0)
+            pushed *= steer
+            slowed *= ~steer
+            sx = pushed
+            sx += slowed
+        else:
+            sx = slowed
+        sx += drift
+        x += sx
+
+        # Keep player within screen bounds
+        out_of_bounds = (x < 0.0) | (x > float(SCREEN_WIDTH - PLAYER_WIDTH))
+        if out_of_bounds.any():
+            out_of_bounds = np.flatnonzero(out_of_bounds)
+            x[out_of_bounds] = np.clip(x[out_of_bounds], 0.0, float(SCREEN_WIDTH - PLAYER_WIDTH))
+            sx[out_of_bounds] = 0.0
+
+        # Apply gravity
+        np.minimum(max_speed, sy + gravity, out=sy)
+        y += sy
+
+        # Obstacle collision, only for players low enough to reach one
+        # (the player's top edge is always above the ground, so only three
+        # of the four Rect.colliderect comparisons can fail)
+        feet = y + PLAYER_HEIGHT
+        hit = np.zeros(len(idx), dtype=bool)
+        near = np.flatnonzero(feet > top)
+        if len(near):
+            rows = idx[near]
+            rx = x[near].astype(np.int16)[:, None]
+            ry = y[near].astype(np.int16)[:, None]
+            overlap = rx < oright[rows]
+            overlap &= oleft[rows] < rx + PLAYER_WIDTH
+            overlap &= oy[rows] < ry + PLAYER_HEIGHT
+            hit[near[overlap.any(axis=1)]] = True
+
+        # Ground contact and the landing-speed rule
+        ground = ~hit & (feet >= GROUND_Y)
+        done = hit | ground
+        if not done.any():
+            continue
+
+        y[ground] = GROUND_Y - PLAYER_HEIGHT
+        finished = idx[done]
+        out_alive[finished] = ground[done] & (sy[done] <= 3)
+        out_cause[finished] = np.where(hit[done], CRASH_OBSTACLE,
+                                       np.where(sy[done] > 3, CRASH_TOO_FAST, CRASH_NONE))
+        out_x[finished] = x[done]
+        out_deploy_height[finished] = deploy_height[done]
+        out_deployed[finished] = deployed[done]
+        out_ticks[finished] = tick
+
+        # Drop finished jumpers from the working set
+        keep = np.flatnonzero(~done)
+        idx = idx[keep]
+        x, y, sx, sy = x[keep], y[keep], sx[keep], sy[keep]
+        gravity, max_speed = gravity[keep], max_speed[keep]
+        deployed, deploy_height, player_wind = deployed[keep], deploy_height[keep], player_wind[keep]
+        drift = drift[keep]
+        altitude, deploy_from, top = altitude[keep], deploy_from[keep], top[keep]
+        steer_below, steer_above = steer_below[keep], steer_above[keep]
+        next_wind, wind_slot = next_wind[keep], wind_slot[keep]
+        if len(idx):
+            earliest_wind = next_wind.min()
+
+    score, safe = score_landings(layouts, out_x, out_deploy_height, out_alive)
+    return {
+        "alive": out_alive,
+        "score": score,
+        "safe_zone": safe,
+        "x": out_x,
+        "deploy_height": out_deploy_height,
+        "deployed": out_deployed,
+        "crash_cause": out_cause,
+        "ticks": out_ticks,
+    }
+
+
+def score_landings(layouts, x, deploy_height, survived):
+    """Vectorized Simulation.compute_score for the rows that survived"""
+    ox, ow, count = layouts["ox"], layouts["ow"], layouts["count"]
+
+    # Summed distance to every obstacle centre, in the same steps as
+    # CenterSums.distance_sum so the floating point result matches
+    valid = np.arange(MAX_OBSTACLES)[None, :] < count[:, None]
+    centers = np.where(valid, ox + ow // 2, 0)
+    left_of = valid & (centers <= x[:, None])
+    k = left_of.sum(axis=1)
+    below = np.where(left_of, centers, 0).sum(axis=1)
+    total = x * (2 * k - count) + (centers.sum(axis=1) - 2 * below)
+    landing_score = 1000 - total // np.maximum(count, 1)
+
+    # Bonus for landing in safe zone
+    cx = (x + PLAYER_WIDTH // 2).astype(np.int64)
+    zx, zw = layouts["zx"], layouts["zw"]
+    in_zone = layouts["zvalid"] & (zx <= cx[:, None]) & (cx[:, None] < zx + zw)
+    safe = survived & in_zone.any(axis=1)
+    landing_score = landing_score + np.where(safe, 500, 0)
+
+    time_bonus = np.maximum(0, 200 - deploy_height)
+    score = np.where(survived, np.maximum(0, landing_score + time_bonus), 0.0)
+    return score, safe
+
+
+def make_policies(n, rng, deploy_range, steer, layouts):
+    deploy_altitude = rng.uniform(deploy_range[0], deploy_range[1], size=n)
+    if steer == "nearest-zone":
+        target_x = nearest_zone_targets(layouts)
+    elif steer == "random":
+        target_x = rng.uniform(0, SCREEN_WIDTH, size=n)
+    else:
+        target_x = np.full(n, np.nan)
+    return deploy_altitude, target_x
+
+
+def summarize(results, elapsed):
+    n = len(results["alive"])
+    alive = results["alive"]
+    scores = results["score"][alive]
+    landed_safe = results["safe_zone"]
+    cause = results["crash_cause"]
+    summary = {
+        "descents": n,
+        "seconds": round(elapsed, 3),
+        "descents_per_second": round(n / elapsed) if elapsed > 0 else None,
+        "survival_rate": round(float(alive.mean()), 4),
+        "safe_zone_hit_rate": round(float(landed_safe.mean()), 4),
+        "safe_zone_rate_of_landings": round(float(landed_safe[alive].mean()), 4) if alive.any() else 0.0,
+        "crash_obstacle_rate": round(float((cause == CRASH_OBSTACLE).mean()), 4),
+        "crash_too_fast_rate": round(float((cause == CRASH_TOO_FAST).mean()), 4),
+    }
+    if len(scores):
+        counts, edges = np.histogram(scores, bins=10)
+        summary["score"] = {
+            "mean": round(float(scores.mean()), 2),
+            "std": round(float(scores.std()), 2),
+            "percentiles": {str(p): round(float(v), 2)
+                            for p, v in zip((5, 25, 50, 75, 95), np.percentile(scores, (5, 25, 50, 75, 95)))},
+            "histogram": {"edges": [round(float(e), 1) for e in edges], "counts": counts.tolist()},
+        }
+    return summary
+
+
+def verify(n, seed, deploy_range, steer):
+    """Run the same seeded descents through Simulation.run and the batch engine and compare"""
+    rng = np.random.default_rng(seed)
+    sims = [simulation.Simulation(seed=seed + i) for i in range(n)]
+    layouts, wind = from_simulations(sims)
+    deploy_altitude, target_x = make_policies(n, rng, deploy_range, steer, layouts)
+    results = simulate(layouts, wind, deploy_altitude, target_x)
+
+    mismatches = 0
+    for i, sim in enumerate(sims):
+        score = sim.run(scalar_policy(deploy_altitude[i], target_x[i]))
+        if (sim.player.alive, score) != (bool(results["alive"][i]), results["score"][i]):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"Mismatch for seed {seed + i}: scalar {sim.player.alive}/{score}, "
+                      f"batch {bool(results['alive'][i])}/{results['score'][i]}")
+    print(f"Verified {n} descents against Simulation.run: {mismatches} mismatches")
+    return mismatches == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo descent analysis")
+    parser.add_argument("-n", "--jumpers", type=int, default=100000, help="number of descents")
+    parser.add_argument("--seed", type=int, default=0, help="seed for layouts, wind and policies")
+    parser.add_argument("--deploy-altitude", type=float, nargs=2, default=(100.0, 400.0),
+                        metavar=("MIN", "MAX"), help="deploy altitude range in pixels above ground")
+    parser.add_argument("--steer", choices=("none", "nearest-zone", "random"), default="nearest-zone",
+                        help="steering policy")
+    parser.add_argument("--chunk", type=int, default=1 << 13, help="descents per vectorized batch")
+    parser.add_argument("--verify", type=int, default=0, metavar="N",
+                        help="check N seeded descents against the scalar simulation and exit")
+    args = parser.parse_args()
+
+    if args.verify:
+        raise SystemExit(0 if verify(args.verify, args.seed, args.deploy_altitude, args.steer) else 1)
+
+    rng = np.random.default_rng(args.seed)
+    parts = []
+    start = time.perf_counter()
+    for offset in range(0, args.jumpers, args.chunk):
+        n = min(args.chunk, args.jumpers - offset)
+        layouts = random_layouts(n, rng)
+        wind = random_wind(n, rng)
+        deploy_altitude, target_x = make_policies(n, rng, args.deploy_altitude, args.steer, layouts)
+        parts.append(simulate(layouts, wind, deploy_altitude, target_x))
+    elapsed = time.perf_counter() - start
+
+    results = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+    print(json.dumps(summarize(results, elapsed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
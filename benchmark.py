@@ -0,0 +1,330 @@
+"""
+Reproducible benchmarks for the parachute game loop.
+
+Runs the pygame client headless (SDL dummy video and audio drivers) through
+seeded, scripted scenarios and times every frame's Game.update, Game.draw and
+display flip. A second pass over the same frames with tracemalloc running
+measures the memory allocated per frame. Tracing is slow, so it never runs
+during the timed pass.
+
+Scenarios:
+    freefall   the player falls without a parachute
+    descent    the player opens the parachute at once and steers for a safe
+               zone while the wind changes
+    game_over  the game over screen with the high score table
+
+    python3 benchmark.py --output baseline.json
+    python3 benchmark.py --compare baseline.json --threshold 0.15
+
+Each scenario is timed in several repeats, each from a fresh game. The
+repeats take turns with the other scenarios', so a slow stretch on the
+machine lands on one repeat of each rather than every repeat of one. A timing's
+p50 is the median of the repeats' medians, and p50_spread is how far those
+medians were apart. With --compare, the exit status is 1 when any scenario's
+median time or allocation grew by more than the threshold over the baseline.
+A timing only counts when it also grew by more than --min-delta-ms and by
+more than the two runs' spreads added together, so scheduler noise on a busy
+machine does not show up as a regression.
+"""
+
+import os
+
+# Benchmarks always run headless unless the caller picked a driver
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from parachute_game import Game, sound_bank, text_renderer
+from score_store import ScoreStore
+from simulation import SCREEN_WIDTH, SCREEN_HEIGHT, Inputs, NO_INPUT
+
+# Frames are drawn halfway between ticks so interpolation is exercised
+ALPHA = 0.5
+
+# Fixed high score table for the game over screen
+BENCH_SCORES = tuple(1500.0 - 37 * i for i in range(10))
+
+TIMINGS = ("update_ms", "draw_ms", "flip_ms", "frame_ms")
+
+
+def wait_for_jump(game):
+    """Step without input until the player has left the plane"""
+    while not game.jumping:
+        game.update(NO_INPUT)
+
+
+def steer_to_zone(game):
+    """Open the parachute and steer toward the nearest safe zone"""
+    player = game.player
+    center = player.x + player.width // 2
+    if not game.landing_zones:
+        return Inputs(False, False, True)
+    target = min((zone.centerx for zone in game.landing_zones), key=lambda x: abs(x - center))
+    return Inputs(center > target + 5, center < target - 5, True)
+
+
+def land(game):
+    """Play the descent scenario to the end"""
+    while not game.game_over:
+        game.update(steer_to_zone(game))
+
+
+# name -> (set up a fresh descent, inputs for each timed frame, restart when the descent ends)
+SCENARIOS = {
+    "freefall": (wait_for_jump, lambda game: NO_INPUT, True),
+    "descent": (wait_for_jump, steer_to_zone, True),
+    "game_over": (land, lambda game: NO_INPUT, False),
+}
+
+
+def make_game(render_mode, seed):
+    game = Game(render_mode=render_mode, seed=seed, replay_dir="", scores_path=":memory:")
+    # Use the same high score table on every machine, not the one imported from high_scores.json
+    game.score_store = ScoreStore(":memory:")
+    for score in BENCH_SCORES:
+        game.score_store.add(score)
+    game.load_high_scores()
+    return game
+
+
+def run_frames(screen, scenario, render_mode, seed, frames, warmup, measure):
+    """Play a scenario for warmup + frames frames, handing the timed ones to measure()"""
+    prepare, policy, restart = SCENARIOS[scenario]
+    game = make_game(render_mode, seed)
+    prepare(game)
+    restarts = 0
+
+    for frame in range(warmup + frames):
+        if restart and game.game_over:
+            restarts += 1
+            game.reset(seed + restarts)
+            prepare(game)
+        inputs = policy(game)
+        if frame < warmup:
+            draw_frame(screen, game, inputs)
+        else:
+            measure(screen, game, inputs)
+    return restarts
+
+
+def draw_frame(screen, game, inputs):
+    game.update(inputs)
+    rects = game.draw(screen, ALPHA)
+    if rects is None:
+        pygame.display.flip()
+    else:
+        pygame.display.update(rects)
+    text_renderer.end_frame()
+
+
+def time_scenario(screen, scenario, render_mode, seed, frames, warmup):
+    """One timed run: restarts and per-frame update, draw, flip and frame times"""
+    update_ns = []
+    draw_ns = []
+    flip_ns = []
+    clock = time.perf_counter_ns
+
+    def measure(screen, game, inputs):
+        start = clock()
+        game.update(inputs)
+        updated = clock()
+        rects = game.draw(screen, ALPHA)
+        drawn = clock()
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        flipped = clock()
+        text_renderer.end_frame()
+        update_ns.append(updated - start)
+        draw_ns.append(drawn - updated)
+        flip_ns.append(flipped - drawn)
+
+    restarts = run_frames(screen, scenario, render_mode, seed, frames, warmup, measure)
+    frame_ns = [u + d + f for u, d, f in zip(update_ns, draw_ns, flip_ns)]
+    return restarts, update_ns, draw_ns, flip_ns, frame_ns
+
+
+def trace_scenario(screen, scenario, render_mode, seed, frames, warmup):
+    peaks = []
+    net = 0
+
+    def measure(screen, game, inputs):
+        nonlocal net
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        draw_frame(screen, game, inputs)
+        current, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+        net += current - before
+
+    tracemalloc.start()
+    try:
+        run_frames(screen, scenario, render_mode, seed, frames, warmup, measure)
+    finally:
+        tracemalloc.stop()
+    peaks.sort()
+    return {
+        "alloc_peak_bytes": {
+            "mean": round(sum(peaks) / len(peaks), 1),
+            "p50": percentile(peaks, 50),
+            "max": peaks[-1],
+        },
+        "alloc_net_bytes": net,
+    }
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples_ns):
+    values = sorted(ns / 1e6 for ns in samples_ns)
+    return {
+        "mean": round(sum(values) / len(values), 4),
+        "p50": round(percentile(values, 50), 4),
+        "p95": round(percentile(values, 95), 4),
+        "p99": round(percentile(values, 99), 4),
+        "max": round(values[-1], 4),
+    }
+
+
+def summarize_repeats(repeats_ns):
+    """Summary of every frame of every repeat, with the median and spread of the repeats' medians"""
+    summary = summarize([ns for samples_ns in repeats_ns for ns in samples_ns])
+    medians = sorted(percentile(sorted(samples_ns), 50) / 1e6 for samples_ns in repeats_ns)
+    middle = len(medians) // 2
+    median = medians[middle] if len(medians) % 2 else (medians[middle - 1] + medians[middle]) / 2
+    summary["p50"] = round(median, 4)
+    summary["p50_spread"] = round(medians[-1] - medians[0], 4)
+    return summary
+
+
+def run(scenarios, render_modes, seed, frames, alloc_frames, warmup, repeats):
+    pygame.init()
+    try:
+        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+        sound_bank.load_all()
+    except pygame.error as e:
+        print(f"Benchmarking without sound: {e}", file=sys.stderr)
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+
+    cases = [(scenario, render_mode) for scenario in scenarios for render_mode in render_modes]
+    runs = {case: [] for case in cases}
+    for _ in range(repeats):
+        for case in cases:
+            runs[case].append(time_scenario(screen, *case, seed, frames, warmup))
+
+    results = {}
+    for scenario, render_mode in cases:
+        repeated = runs[scenario, render_mode]
+        result = {
+            "frames": frames,
+            "repeats": repeats,
+            "restarts": repeated[0][0],
+        }
+        for index, key in enumerate(TIMINGS, 1):
+            result[key] = summarize_repeats([run[index] for run in repeated])
+        if alloc_frames:
+            result.update(trace_scenario(screen, scenario, render_mode, seed, alloc_frames, warmup))
+        results[f"{scenario}/{render_mode}"] = result
+
+    meta = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(map(str, pygame.get_sdl_version())),
+        "platform": platform.platform(),
+        "video_driver": pygame.display.get_driver(),
+        "seed": seed,
+        "frames": frames,
+        "alloc_frames": alloc_frames,
+        "warmup": warmup,
+        "repeats": repeats,
+    }
+    pygame.quit()
+    return {"meta": meta, "scenarios": results}
+
+
+def compare(report, baseline, threshold, min_delta_ms):
+    """Print median changes against a baseline report. Returns the list of regressions."""
+    regressions = []
+    for name, result in report["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            print(f"{name}: not in baseline")
+            continue
+
+        # Medians this far apart can come from the same code when each moved
+        # within its spread between repeats; baselines from before repeats have no spread
+        checks = [(key, result[key]["p50"], base[key]["p50"],
+                   max(min_delta_ms, result[key].get("p50_spread", 0) + base[key].get("p50_spread", 0)))
+                  for key in TIMINGS]
+        if "alloc_peak_bytes" in result and "alloc_peak_bytes" in base:
+            checks.append(("alloc_peak_bytes", result["alloc_peak_bytes"]["p50"],
+                           base["alloc_peak_bytes"]["p50"], 0))
+
+        for key, current, previous, min_delta in checks:
+            change = (current - previous) / previous if previous else 0.0
+            regressed = current > previous * (1 + threshold) and current - previous > min_delta
+            flag = "REGRESSION" if regressed else ""
+            print(f"{name:20} {key:18} {previous:>12.4f} -> {current:>12.4f} {change:+8.1%} {flag}")
+            if regressed:
+                regressions.append((name, key))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the parachute game loop headless")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append",
+                        help="scenario to run (repeatable, default: all)")
+    parser.add_argument("--render-mode", choices=("full", "dirty"), action="append",
+                        help="rendering path to run (repeatable, default: both)")
+    parser.add_argument("--seed", type=int, default=1234, help="seed for the first layout")
+    parser.add_argument("--frames", type=int, default=600, help="timed frames per scenario")
+    parser.add_argument("--alloc-frames", type=int, default=200,
+                        help="frames traced with tracemalloc per scenario (0 skips the pass)")
+    parser.add_argument("--warmup", type=int, default=30, help="untimed frames before measuring")
+    parser.add_argument("--repeats", type=int, default=5,
+                        help="timed runs per scenario; medians are taken over their medians")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed relative growth of a median before it counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=0.1,
+                        help="ignore timing changes smaller than this many milliseconds")
+    args = parser.parse_args(argv)
+
+    scenarios = args.scenario or list(SCENARIOS)
+    render_modes = args.render_mode or ["full", "dirty"]
+    report = run(scenarios, render_modes, args.seed, args.frames, args.alloc_frames, args.warmup,
+                 max(1, args.repeats))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    elif not args.compare:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
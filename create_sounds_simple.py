@@ -1,12 +1,8 @@
-import pygame
-import numpy as np
 import os
-import wave
-import struct
 
-# Initialize pygame
-pygame.init()
-pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+import numpy as np
+
+import synth
 
 # Make sounds directory if it doesn't exist
 if not os.path.exists("sounds"):
@@ -14,26 +10,14 @@ if not os.path.exists("sounds"):
 
 # Function to create WAV files directly
 def create_wav_file(filename, duration=1.0, frequency=440):
-    sample_rate = 44100
-    amplitude = 32767  # Max amplitude for 16-bit audio
-    num_samples = int(sample_rate * duration)
-    
-    # Create empty arrays for left and right channels
-    data = []
-    for i in range(num_samples):
-        # Simple sine wave
-        value = int(amplitude * np.sin(2 * np.pi * frequency * i / sample_rate))
-        # Pack as signed 16-bit value
-        data.append(struct.pack('<h', value))
+    sample_rate = synth.SAMPLE_RATE
     
-    # Convert to bytes
-    data = b''.join(data)
+    # Simple sine wave for the whole sound at once, faded in and out to avoid clicks
+    t = synth.timeline(duration, sample_rate)
+    wave_data = np.sin(2 * np.pi * frequency * t) * synth.envelope(len(t), sample_rate)
     
-    # Write to WAV file
-    with wave.open(filename, 'wb') as wav_file:
-        # Set parameters (nchannels, sampwidth, framerate, nframes, comptype, compname)
-        wav_file.setparams((1, 2, sample_rate, num_samples, 'NONE', 'not compressed'))
-        wav_file.writeframes(data)
+    # Write to WAV file as 16-bit stereo to match the mixer
+    synth.write_wav(filename, synth.to_int16(wave_data * 0.8), sample_rate)
     
     print(f"Created {filename}")
 
@@ -52,4 +36,4 @@ for sound_file, duration, frequency in sound_files:
     path = os.path.join("sounds", sound_file)
     create_wav_file(path, duration, frequency)
 
-print("All sound files created successfully!")
\ No newline at end of file
+print("All sound files created successfully!")
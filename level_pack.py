@@ -0,0 +1,246 @@
+"""
+Prebuilt level packs for the parachute game.
+
+Simulation.reset() rolls a fresh layout from its seed and never checks that
+a safe landing exists. A level pack is built offline instead: candidate seeds
+are generated and planned in parallel worker processes, and only seeds whose
+ideal descent (planner.py) reaches a safe zone are kept. Each kept layout is
+written as one fixed-size record, so a level is found by index with one
+multiplication and unpacked with a single struct call from a memory-mapped
+file. Nothing is parsed up front, however many levels the pack holds.
+
+File layout (little endian):
+
+    header   16 bytes   magic b"PCLP", version H, record size H, count I, padding
+    records  count x RECORD.size
+
+    record   seed q, draws H, obstacle count B, zone count B, grade B, pad,
+             ideal score f, 8 x obstacle (x H, width B, height B),
+             9 x landing zone (x H, width B)
+
+The landing zones are exactly what make_landing_zones() builds for the
+obstacles. draws is the number of 32-bit words the layout took from the
+gameplay random stream. Simulation.load_layout() skips that many words in one
+call, so a packed level gets the same wind as Simulation(seed), and replays of
+packed levels verify like any other.
+
+    python3 level_pack.py levels.pack --build 10000 --workers 0
+    python3 level_pack.py levels.pack --verify 1000 --bench
+"""
+
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import planner
+from simulation import Simulation, make_landing_zones, make_obstacles
+
+MAGIC = b"PCLP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI4x")
+
+MAX_OBSTACLES = 8
+MAX_ZONES = MAX_OBSTACLES + 1
+RECORD = struct.Struct("<qHBBBxf" + "HBB" * MAX_OBSTACLES + "HB" * MAX_ZONES)
+# Values unpacked before the first obstacle
+_LEVEL_FIELDS = 6
+
+# Grades as stored in records, in planner.GRADES order
+GRADE_NAMES = tuple(name for name, _ in planner.GRADES)
+
+# One packed level: obstacles as (x, width, height), zones as (x, width)
+Level = namedtuple("Level", ["index", "seed", "draws", "grade", "ideal_score", "obstacles", "landing_zones"])
+
+
+class CountingRandom(random.Random):
+    """Random that counts the 32-bit words drawn through getrandbits(), which
+    randint() and sample() use underneath"""
+
+    def getrandbits(self, k):
+        self.words += (k - 1) // 32 + 1
+        return super().getrandbits(k)
+
+
+def generate(seed):
+    """The layout Simulation(seed) builds, and how many words it drew"""
+    rng = CountingRandom(seed)
+    rng.words = 0
+    obstacles = make_obstacles(rng)
+    return obstacles, make_landing_zones(obstacles), rng.words
+
+
+def pack_level(seed, obstacles, zones, draws, grade, ideal_score):
+    values = [seed, draws, len(obstacles), len(zones), grade, ideal_score]
+    for i in range(MAX_OBSTACLES):
+        values += (obstacles[i].x, obstacles[i].width, obstacles[i].height) if i < len(obstacles) else (0, 0, 0)
+    for i in range(MAX_ZONES):
+        values += (zones[i].x, zones[i].width) if i < len(zones) else (0, 0)
+    return RECORD.pack(*values)
+
+
+def check_seed(seed):
+    """Packed record for seed if its ideal descent lands in a safe zone, else None"""
+    obstacles, zones, draws = generate(seed)
+    plan = planner.plan_layout(Simulation(seed))
+    if not (plan.verified and plan.safe_zone):
+        return None
+    return pack_level(seed, obstacles, zones, draws, GRADE_NAMES.index(plan.grade), plan.score)
+
+
+def build(path, count, start_seed=0, workers=None, progress=True):
+    """Write a pack of count playable levels from consecutive seeds. Returns
+    the number of seeds rejected."""
+    records = []
+    rejected = 0
+    seed = start_seed
+    started = time.perf_counter()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+    try:
+        while len(records) < count:
+            # A few extra seeds per batch make up for the rejected ones
+            batch = range(seed, seed + max(16, (count - len(records)) * 21 // 20))
+            seed = batch.stop
+            if pool is None:
+                results = map(check_seed, batch)
+            else:
+                results = pool.map(check_seed, batch, chunksize=max(1, len(batch) // 256))
+            for record in results:
+                if record is None:
+                    rejected += 1
+                elif len(records) < count:
+                    records.append(record)
+            if progress:
+                print(f"{len(records)}/{count} levels, {rejected} rejected, "
+                      f"{time.perf_counter() - started:.1f}s")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # Written beside the target and renamed, so a reader never sees half a pack
+    partial = path + ".tmp"
+    with open(partial, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, len(records)))
+        f.write(b"".join(records))
+    os.replace(partial, path)
+    return rejected
+
+
+class LevelPack:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, count = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.map.close()
+            raise ValueError(f"{path} is not a version {VERSION} level pack")
+        if len(self.map) < HEADER.size + count * RECORD.size:
+            self.map.close()
+            raise ValueError(f"{path} is truncated")
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def level(self, index):
+        """The level at index, read straight from the mapped file"""
+        if not 0 <= index < self.count:
+            raise IndexError(f"No level {index} in a pack of {self.count}")
+        values = RECORD.unpack_from(self.map, HEADER.size + index * RECORD.size)
+        end = _LEVEL_FIELDS + 3 * values[2]
+        obstacles = list(zip(values[_LEVEL_FIELDS:end:3], values[_LEVEL_FIELDS + 1:end:3],
+                             values[_LEVEL_FIELDS + 2:end:3]))
+        start = _LEVEL_FIELDS + 3 * MAX_OBSTACLES
+        end = start + 2 * values[3]
+        zones = list(zip(values[start:end:2], values[start + 1:end:2]))
+        return Level(index, values[0], values[1], GRADE_NAMES[values[4]], values[5], obstacles, zones)
+
+    __getitem__ = level
+
+    def close(self):
+        self.map.close()
+
+
+def verify(pack, samples, seed=0):
+    """Check packed levels against generating their seeds: same layout, same
+    zones and the same gameplay stream afterwards"""
+    rng = random.Random(seed)
+    indices = range(len(pack)) if samples >= len(pack) else rng.sample(range(len(pack)), samples)
+    failures = 0
+    loaded = Simulation()
+    for index in indices:
+        level = pack.level(index)
+        generated = Simulation(level.seed)
+        loaded.reset(level=level)
+        same = ([(o.x, o.width, o.height) for o in loaded.obstacles] ==
+                [(o.x, o.width, o.height) for o in generated.obstacles]
+                and [tuple(z) for z in loaded.landing_zones] == [tuple(z) for z in generated.landing_zones]
+                and loaded.rng.getstate() == generated.rng.getstate())
+        if not same:
+            failures += 1
+            print(f"MISMATCH level {index} (seed {level.seed})")
+    print(f"{len(indices) - failures}/{len(indices)} packed levels match their generated layouts")
+    return failures == 0
+
+
+def bench(pack, loads=100000, seed=0):
+    rng = random.Random(seed)
+    indices = [rng.randrange(len(pack)) for _ in range(loads)]
+    start = time.perf_counter()
+    for index in indices:
+        pack.level(index)
+    read = (time.perf_counter() - start) / loads
+
+    # The layout alone, without the player, plane and clouds every reset builds
+    sim = Simulation()
+    layouts = min(loads, 20000)
+    levels = [pack.level(index) for index in indices[:layouts]]
+    start = time.perf_counter()
+    for level in levels:
+        sim.load_layout(level)
+    packed = (time.perf_counter() - start) / layouts
+    start = time.perf_counter()
+    for _ in range(layouts):
+        sim.create_layout()
+    generated = (time.perf_counter() - start) / layouts
+
+    size = os.path.getsize(pack.path)
+    print(f"{len(pack)} levels, {RECORD.size} bytes each, {size / 1e6:.1f} MB")
+    print(f"read level:        {read * 1e6:6.2f} us")
+    print(f"layout from pack:  {packed * 1e6:6.2f} us")
+    print(f"layout generated:  {generated * 1e6:6.2f} us")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and check level packs")
+    parser.add_argument("path", help="level pack file")
+    parser.add_argument("--build", type=int, metavar="COUNT", help="build a pack of COUNT playable levels")
+    parser.add_argument("--start-seed", type=int, default=0, help="first candidate seed when building")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (0 for one per CPU)")
+    parser.add_argument("--verify", type=int, default=0, metavar="N",
+                        help="check N random levels against generating their seeds")
+    parser.add_argument("--bench", action="store_true", help="time level loads")
+    args = parser.parse_args(argv)
+
+    if args.build:
+        start = time.perf_counter()
+        rejected = build(args.path, args.build, args.start_seed, args.workers or None)
+        print(f"Built {args.path}: {args.build} levels in {time.perf_counter() - start:.1f}s, "
+              f"{rejected} seeds rejected without a reachable safe zone")
+
+    pack = LevelPack(args.path)
+    ok = verify(pack, args.verify) if args.verify else True
+    if args.bench:
+        bench(pack)
+    pack.close()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
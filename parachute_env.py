@@ -0,0 +1,229 @@
+"""
+Gym-style environment for training and benchmarking autopilot agents.
+
+ParachuteEnv wraps the headless Simulation with reset(seed) / step(action).
+Actions are NOOP, LEFT, RIGHT and DEPLOY; the reward is the landing score
+from Simulation.compute_score() on a safe landing and 0 otherwise, paid when
+the episode ends.
+
+VectorEnv fans N environments out over a multiprocessing worker pool. Each
+worker owns a contiguous slice of the environments and exchanges actions,
+observations, rewards and done flags through shared-memory arrays, so only a
+one-word command crosses the pipe per step.
+
+Usage:
+    python3 parachute_env.py --envs 64 --workers 4 --steps 20000
+"""
+
+import argparse
+import multiprocessing as mp
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from simulation import Simulation, Inputs, SCREEN_WIDTH, SCREEN_HEIGHT, GROUND_Y, NO_INPUT
+
+# Discrete actions
+NOOP = 0
+LEFT = 1
+RIGHT = 2
+DEPLOY = 3
+ACTION_INPUTS = (
+    NO_INPUT,
+    Inputs(True, False, False),
+    Inputs(False, True, False),
+    Inputs(False, False, True),
+)
+NUM_ACTIONS = len(ACTION_INPUTS)
+
+# Observation layout (float32)
+OBSERVATION_FIELDS = (
+    "x",               # player x / screen width
+    "altitude",        # height of the player's feet above ground / screen height
+    "speed_x",         # horizontal speed / 3
+    "speed_y",         # vertical speed / 7
+    "parachute",       # 1 once the parachute is open
+    "wind",            # wind direction, -1 to 1
+    "zone_dx",         # offset from player centre to the nearest safe zone centre / screen width
+    "has_zone",        # 1 if the layout has any safe zone
+)
+OBSERVATION_SIZE = len(OBSERVATION_FIELDS)
+
+# Episodes longer than this are cut off (a descent normally takes a few hundred ticks)
+MAX_EPISODE_STEPS = 2000
+
+
+class ParachuteEnv:
+    def __init__(self, seed=None):
+        self.sim = Simulation(seed)
+        self.steps = 0
+
+    def reset(self, seed=None):
+        """Start a new episode at the moment the player leaves the plane"""
+        self.sim.reset(seed)
+        self.steps = 0
+        # Nothing the agent does matters before the jump
+        while not self.sim.jumping:
+            self.sim.step(NO_INPUT)
+        return self.observation()
+
+    def observation(self, out=None):
+        """Fill out (or a new array) with the current observation"""
+        if out is None:
+            out = np.empty(OBSERVATION_SIZE, dtype=np.float32)
+        player = self.sim.player
+        center = player.x + player.width / 2
+        zone_dx = 0.0
+        if self.sim.landing_zones:
+            zone_dx = min((zone.centerx - center for zone in self.sim.landing_zones), key=abs)
+        out[0] = player.x / SCREEN_WIDTH
+        out[1] = (GROUND_Y - (player.y + player.height)) / SCREEN_HEIGHT
+        out[2] = player.speed_x / 3
+        out[3] = player.speed_y / 7
+        out[4] = player.parachute_deployed
+        out[5] = self.sim.wind_direction
+        out[6] = zone_dx / SCREEN_WIDTH
+        out[7] = bool(self.sim.landing_zones)
+        return out
+
+    def step(self, action):
+        """Apply action for one tick. Returns (observation, reward, done, info)."""
+        events = self.sim.step(ACTION_INPUTS[action])
+        self.steps += 1
+        done = self.sim.game_over or self.steps >= MAX_EPISODE_STEPS
+        reward = float(self.sim.score) if self.sim.game_over and self.sim.player.alive else 0.0
+        info = {"events": events, "truncated": done and not self.sim.game_over}
+        return self.observation(), reward, done, info
+
+
+def _worker(pipe, start, stop, buffer_names, num_envs):
+    """Run environments start..stop-1, reading actions from and writing results to shared memory"""
+    buffers = [shared_memory.SharedMemory(name=name) for name in buffer_names]
+    observations, rewards, dones, actions = _views(buffers, num_envs)
+    envs = [ParachuteEnv() for _ in range(start, stop)]
+    try:
+        while True:
+            command, arg = pipe.recv()
+            if command == "step":
+                for i, env in enumerate(envs, start):
+                    _, reward, done, _ = env.step(actions[i])
+                    if done:
+                        # Auto-reset so every slot always holds a live episode
+                        env.reset()
+                    env.observation(observations[i])
+                    rewards[i] = reward
+                    dones[i] = done
+            elif command == "reset":
+                for i, env in enumerate(envs, start):
+                    env.reset(None if arg is None else arg + i)
+                    env.observation(observations[i])
+                    rewards[i] = 0.0
+                    dones[i] = False
+            elif command == "close":
+                break
+            pipe.send(None)
+    finally:
+        del observations, rewards, dones, actions
+        for shm in buffers:
+            shm.close()
+        pipe.close()
+
+
+def _views(buffers, num_envs):
+    return (
+        np.ndarray((num_envs, OBSERVATION_SIZE), dtype=np.float32, buffer=buffers[0].buf),
+        np.ndarray(num_envs, dtype=np.float32, buffer=buffers[1].buf),
+        np.ndarray(num_envs, dtype=np.bool_, buffer=buffers[2].buf),
+        np.ndarray(num_envs, dtype=np.int8, buffer=buffers[3].buf),
+    )
+
+
+class VectorEnv:
+    """N ParachuteEnvs stepped in lockstep by a pool of worker processes.
+
+    The arrays returned by reset() and step() are views of shared memory and
+    are overwritten by the next call; copy them if they need to be kept."""
+
+    def __init__(self, num_envs, num_workers=None):
+        self.num_envs = num_envs
+        self.num_workers = max(1, min(num_workers or mp.cpu_count(), num_envs))
+        sizes = (num_envs * OBSERVATION_SIZE * 4, num_envs * 4, num_envs, num_envs)
+        self.buffers = [shared_memory.SharedMemory(create=True, size=size) for size in sizes]
+        self.observations, self.rewards, self.dones, self.actions = _views(self.buffers, num_envs)
+
+        self.pipes = []
+        self.processes = []
+        bounds = np.linspace(0, num_envs, self.num_workers + 1).astype(int)
+        names = [shm.name for shm in self.buffers]
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            parent, child = mp.Pipe()
+            process = mp.Process(target=_worker, args=(child, int(start), int(stop), names, num_envs),
+                                 daemon=True)
+            process.start()
+            child.close()
+            self.pipes.append(parent)
+            self.processes.append(process)
+
+    def _broadcast(self, command, arg=None):
+        for pipe in self.pipes:
+            pipe.send((command, arg))
+        for pipe in self.pipes:
+            pipe.recv()
+
+    def reset(self, seed=None):
+        """Reset every environment; env i gets seed + i. Returns the observations."""
+        self._broadcast("reset", seed)
+        return self.observations
+
+    def step(self, actions):
+        """Step every environment. Returns (observations, rewards, dones).
+        Finished environments are reset automatically."""
+        self.actions[:] = actions
+        self._broadcast("step")
+        return self.observations, self.rewards, self.dones
+
+    def close(self):
+        for pipe in self.pipes:
+            pipe.send(("close", None))
+        for process in self.processes:
+            process.join()
+        del self.observations, self.rewards, self.dones, self.actions
+        for shm in self.buffers:
+            shm.close()
+            shm.unlink()
+
+
+def benchmark(num_envs, num_workers, steps, seed):
+    env = VectorEnv(num_envs, num_workers)
+    rng = np.random.default_rng(seed)
+    try:
+        env.reset(seed)
+        episodes = 0
+        total_reward = 0.0
+        start = time.perf_counter()
+        for _ in range(steps):
+            _, rewards, dones = env.step(rng.integers(0, NUM_ACTIONS, size=num_envs))
+            episodes += int(dones.sum())
+            total_reward += float(rewards.sum())
+        elapsed = time.perf_counter() - start
+    finally:
+        env.close()
+    env_steps = steps * num_envs
+    print(f"{num_envs} envs on {env.num_workers} workers: {env_steps} env steps in {elapsed:.2f}s "
+          f"({env_steps / elapsed:.0f} steps/s), {episodes} episodes, "
+          f"mean reward {total_reward / max(1, episodes):.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized parachute environment")
+    parser.add_argument("--envs", type=int, default=64, help="number of environments")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--steps", type=int, default=2000, help="vector steps to run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    benchmark(args.envs, args.workers, args.steps, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
-import random
 import os
-import json
-import platform
 import sys
+import time
+import argparse
+
+# Start of the startup clock that --measure-startup reports against
+IMPORT_START = time.perf_counter()
 
 # Set environment variable to suppress the macOS warning
 os.environ['NSApplicationSupportsSecureRestorableState'] = 'NO'
@@ -10,9 +12,24 @@ os.environ['NSApplicationSupportsSecureRestorableState'] = 'NO'
 # Pygame needs to be imported after setting the environment variable
 import pygame
 
+import replay
+import rewind
+import simulation
+import startup
+import synth
+import world
+from simulation import SCREEN_WIDTH, SCREEN_HEIGHT, GROUND_Y, TICK_DT, Inputs, EVENT_LANDING
+from particles import ParticleSystem
+from profiler import Profiler
+from quality import LEVELS, LOW_RES, QualityController
+from score_store import ScoreStore
+from sound_bank import SoundBank
+from sprite_cache import SpriteCache
+from text_cache import TextRenderer
+
 # Import additional modules needed for warning suppression
 # These imports are needed to handle the warning message on macOS
-if platform.system() == 'Darwin':
+if sys.platform == 'darwin':
     try:
         # Try to suppress the warning by modifying sys.stderr
         # This is a workaround and the warning may still appear
@@ -21,20 +38,6 @@ if platform.system() == 'Darwin':
     except ImportError:
         pass
 
-# Initialize Pygame with error handling
-try:
-    pygame.init()
-    pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
-except Exception as e:
-    print(f"Error initializing pygame: {e}")
-    sys.exit(1)
-
-# Screen dimensions
-SCREEN_WIDTH = 800
-SCREEN_HEIGHT = 600
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-pygame.display.set_caption("Parachute Game")
-
 # Colors
 WHITE = (255, 255, 255)
 BLUE = (0, 0, 255)
@@ -44,6 +47,18 @@ BLACK = (0, 0, 0)
 SKY_BLUE = (135, 206, 235)
 YELLOW = (255, 255, 0)
 SAFE_ZONE_COLOR = (0, 200, 0, 100)  # Green with transparency
+SPECK_COLOR = (235, 242, 250)
+DUST_COLOR = (160, 110, 60)
+GHOST_COLOR = (255, 255, 255)
+
+# Sound played for each simulation event
+EVENT_SOUNDS = {
+    simulation.EVENT_JUMP: "jump.wav",
+    simulation.EVENT_PARACHUTE: "parachute_open.wav",
+    simulation.EVENT_WIND: "wind.wav",
+    simulation.EVENT_CRASH: "crash.wav",
+    simulation.EVENT_LANDING: "landing.wav",
+}
 
 # Create a transparent surface for safe zone markers
 def create_transparent_surface(width, height, color):
@@ -51,131 +66,113 @@ def create_transparent_surface(width, height, color):
     surface.fill(color)
     return surface
 
-# Load sound files
-def load_sound(sound_name):
-    try:
-        # First, ensure the sounds directory exists
-        if not os.path.exists("sounds"):
-            os.makedirs("sounds")
-            # Create sound files if they don't exist
-            print("Sound directory created. Please run create_sounds_simple.py to generate sound files.")
-            return None
-            
-        sound_path = os.path.join("sounds", sound_name)
-        
-        # Check if the sound file exists
-        if os.path.exists(sound_path):
-            try:
-                sound = pygame.mixer.Sound(sound_path)
-                # Set reasonable volume
-                sound.set_volume(0.7)
-                return sound
-            except pygame.error as e:
-                print(f"Error loading sound {sound_name}: {e}")
-                return None
-        else:
-            print(f"Sound file not found: {sound_name}")
-            return None
-    except Exception as e:
-        print(f"Error loading sound {sound_name}: {e}")
-        return None
+# Merge overlapping rects so display.update() gets as few areas as possible
+def merge_rects(rects):
+    merged = []
+    for rect in rects:
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+        rect = rect.copy()
+        # Keep absorbing overlapping rects until none are left
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
 
-# Check if sound files exist and suggest creating them if not
-if not os.path.exists("sounds") or not os.listdir("sounds"):
-    print("\nSound files missing! Creating sounds directory.")
-    if not os.path.exists("sounds"):
-        os.makedirs("sounds")
-    print("Please run 'python3 create_sounds_simple.py' to generate sound files before playing.")
+# Sounds are decoded once, off the main thread, so gameplay never touches the disk
+sound_bank = SoundBank()
 
-# Clock for controlling frame rate
-clock = pygame.time.Clock()
+# Fonts and rendered text are cached so the HUD only re-renders strings that change
+text_renderer = TextRenderer()
+
+# Frame profiler; costs next to nothing until it is enabled
+profiler = Profiler()
+
+# Player, plane and cloud poses drawn once and blitted every frame
+sprite_cache = SpriteCache()
+
+# Render frame rate cap; the simulation itself always runs at simulation.TICK_RATE
 FPS = 60
 
+# Steps drawing detail down when frames blow their budget, and back up with headroom
+quality = QualityController(1.0 / FPS)
+
+# Size of the frame drawn at the low-res quality level, relative to the window
+LOW_RES_SCALE = 0.5
+
+# Number of high scores kept in memory for the game over screen
+HIGH_SCORES_SHOWN = 10
+
+# Most simulation ticks to run per rendered frame before dropping the backlog
+MAX_CATCH_UP_TICKS = 8
+
+# Time each frame may spend building terrain ahead of the camera in glide levels
+TERRAIN_BUDGET = 0.002
+
+# Top of the terrain band baked per chunk: everything above it is plain sky
+TERRAIN_TOP = GROUND_Y - 120
+
+# Wind specks blown in per tick at full wind strength
+WIND_SPECK_RATE = 0.8
+
+# Seconds of ticks kept for rewinding, and how far back one press of Backspace goes
+REWIND_HISTORY_SECONDS = 10
+REWIND_SECONDS = 2
+
+# Ticks between the points of the ideal-line ghost
+GHOST_POINT_TICKS = 4
+
 # Player class
-class Player:
-    def __init__(self):
-        self.width = 40
-        self.height = 60
-        self.x = SCREEN_WIDTH // 2
-        self.y = 50
-        self.parachute_deployed = False
-        self.parachute_width = 80
-        self.parachute_height = 40
-        self.speed_x = 0
-        self.speed_y = 1
-        self.gravity = 0.2
-        self.max_speed = 7
-        self.alive = True
-        self.landed = False
-        self.wind = 0
-        self.parachute_deploy_height = 0  # Track height when parachute was deployed
-        
-    def deploy_parachute(self):
-        if not self.parachute_deployed:
-            self.parachute_deployed = True
-            # Record the deployment height for scoring
-            self.parachute_deploy_height = self.y
-            # Play parachute deployment sound
-            parachute_sound = load_sound("parachute_open.wav")
-            if parachute_sound:
-                parachute_sound.play()
-            self.gravity = 0.05
-            self.max_speed = 2
-    
-    def move(self, keys):
-        # Left-right movement based on key presses
-        if keys[pygame.K_LEFT]:
-            self.speed_x = max(-3, self.speed_x - 0.2)
-        elif keys[pygame.K_RIGHT]:
-            self.speed_x = min(3, self.speed_x + 0.2)
-        else:
-            # Gradually slow down when no key is pressed
-            if self.speed_x > 0:
-                self.speed_x = max(0, self.speed_x - 0.1)
-            elif self.speed_x < 0:
-                self.speed_x = min(0, self.speed_x + 0.1)
-        
-        # Apply wind effect when parachute is deployed
-        if self.parachute_deployed:
-            self.speed_x += self.wind * 0.1
-        
-        # Update position
-        self.x += self.speed_x
-        
-        # Keep player within screen bounds
-        if self.x < 0:
-            self.x = 0
-            self.speed_x = 0
-        elif self.x > SCREEN_WIDTH - self.width:
-            self.x = SCREEN_WIDTH - self.width
-            self.speed_x = 0
+class Player(simulation.Player):
+    def draw(self, surface, alpha=1.0, offset_x=0, scale=1):
+        x, y = self.interpolate(alpha)
+        x -= offset_x
+        if quality.simple_player:
+            self.draw_simple(surface, x, y, scale)
+            return
         
-        # Apply gravity
-        if not self.landed:
-            self.speed_y = min(self.max_speed, self.speed_y + self.gravity)
-            self.y += self.speed_y
+        # Room for the parachute above and the arms to either side
+        key = ("player", self.alive, self.parachute_deployed, self.width, self.height,
+               self.parachute_width, self.parachute_height)
+        size = (self.width + 44, self.height + self.parachute_height + 14)
+        sprite_cache.draw(surface, key, size, (22, self.parachute_height + 2), self.draw_shape, x, y, scale)
+    
+    def draw_simple(self, surface, x, y, scale=1):
+        """Draw just the body and open canopy, for low quality levels"""
+        if self.alive and self.parachute_deployed:
+            pygame.draw.ellipse(surface, RED, (
+                (x - (self.parachute_width - self.width) // 2) * scale,
+                (y - self.parachute_height) * scale,
+                self.parachute_width * scale,
+                self.parachute_height * scale
+            ))
+        pygame.draw.rect(surface, BLUE if self.alive else RED,
+                         (x * scale, y * scale, self.width * scale, self.height * scale))
     
-    def draw(self, surface):
+    def draw_shape(self, surface, x, y):
+        """Draw the player procedurally with its top-left corner at (x, y)"""
         if not self.alive:
             # Draw dead player (more detailed with X eyes and crashed position)
             # Body
-            pygame.draw.rect(surface, RED, (self.x, self.y, self.width, self.height))
+            pygame.draw.rect(surface, RED, (x, y, self.width, self.height))
             
             # X eyes
-            pygame.draw.line(surface, BLACK, (self.x + 12, self.y + 12), (self.x + 18, self.y + 18), 2)
-            pygame.draw.line(surface, BLACK, (self.x + 18, self.y + 12), (self.x + 12, self.y + 18), 2)
-            pygame.draw.line(surface, BLACK, (self.x + 22, self.y + 12), (self.x + 28, self.y + 18), 2)
-            pygame.draw.line(surface, BLACK, (self.x + 28, self.y + 12), (self.x + 22, self.y + 18), 2)
+            pygame.draw.line(surface, BLACK, (x + 12, y + 12), (x + 18, y + 18), 2)
+            pygame.draw.line(surface, BLACK, (x + 18, y + 12), (x + 12, y + 18), 2)
+            pygame.draw.line(surface, BLACK, (x + 22, y + 12), (x + 28, y + 18), 2)
+            pygame.draw.line(surface, BLACK, (x + 28, y + 12), (x + 22, y + 18), 2)
             
             # Sad mouth
-            pygame.draw.arc(surface, BLACK, (self.x + 10, self.y + 25, 20, 10), 3.14, 6.28, 2)
+            pygame.draw.arc(surface, BLACK, (x + 10, y + 25, 20, 10), 3.14, 6.28, 2)
             return
             
         if self.parachute_deployed:
             # Draw parachute dome with more detail
             pygame.draw.ellipse(surface, RED, (
-                self.x - (self.parachute_width - self.width) // 2, 
-                self.y - self.parachute_height, 
+                x - (self.parachute_width - self.width) // 2, 
+                y - self.parachute_height, 
                 self.parachute_width, 
                 self.parachute_height
             ))
@@ -183,447 +180,924 @@ class Player:
             # Add parachute panels
             panel_width = self.parachute_width // 4
             for i in range(4):
-                panel_x = self.x - (self.parachute_width - self.width) // 2 + i * panel_width
+                panel_x = x - (self.parachute_width - self.width) // 2 + i * panel_width
                 pygame.draw.line(surface, WHITE, 
-                               (panel_x, self.y - self.parachute_height + 5),
-                               (panel_x, self.y - 5), 
+                               (panel_x, y - self.parachute_height + 5),
+                               (panel_x, y - 5), 
                                1)
             
             # Draw strings
             pygame.draw.line(surface, BLACK, 
-                            (self.x + 10, self.y), 
-                            (self.x - 10 + (self.parachute_width - self.width) // 2, self.y - self.parachute_height + 10),
+                            (x + 10, y), 
+                            (x - 10 + (self.parachute_width - self.width) // 2, y - self.parachute_height + 10),
                             2)
             pygame.draw.line(surface, BLACK, 
-                            (self.x + self.width - 10, self.y), 
-                            (self.x + self.width + 10 - (self.parachute_width - self.width) // 2, self.y - self.parachute_height + 10),
+                            (x + self.width - 10, y), 
+                            (x + self.width + 10 - (self.parachute_width - self.width) // 2, y - self.parachute_height + 10),
                             2)
             # Add two more strings
             pygame.draw.line(surface, BLACK, 
-                           (self.x + 15, self.y), 
-                           (self.x + self.parachute_width//4, self.y - self.parachute_height + 10),
+                           (x + 15, y), 
+                           (x + self.parachute_width//4, y - self.parachute_height + 10),
                            1)
             pygame.draw.line(surface, BLACK, 
-                           (self.x + self.width - 15, self.y), 
-                           (self.x + 3*self.parachute_width//4, self.y - self.parachute_height + 10),
+                           (x + self.width - 15, y), 
+                           (x + 3*self.parachute_width//4, y - self.parachute_height + 10),
                            1)
         
         # Draw player with more detail (blue jumpsuit figure)
-        pygame.draw.rect(surface, BLUE, (self.x, self.y, self.width, self.height))
+        pygame.draw.rect(surface, BLUE, (x, y, self.width, self.height))
         
         # Add helmet
-        pygame.draw.ellipse(surface, WHITE, (self.x + 5, self.y - 5, self.width - 10, 12))
+        pygame.draw.ellipse(surface, WHITE, (x + 5, y - 5, self.width - 10, 12))
         
         # Draw face
-        pygame.draw.circle(surface, BLACK, (self.x + 15, self.y + 15), 3)  # Left eye
-        pygame.draw.circle(surface, BLACK, (self.x + 25, self.y + 15), 3)  # Right eye
+        pygame.draw.circle(surface, BLACK, (x + 15, y + 15), 3)  # Left eye
+        pygame.draw.circle(surface, BLACK, (x + 25, y + 15), 3)  # Right eye
         
         # Draw limbs
         if self.parachute_deployed:
             # Arms up holding parachute strings
-            pygame.draw.line(surface, BLUE, (self.x + 5, self.y + 20), (self.x - 5, self.y), 2)  # Left arm
-            pygame.draw.line(surface, BLUE, (self.x + self.width - 5, self.y + 20), (self.x + self.width + 5, self.y), 2)  # Right arm
+            pygame.draw.line(surface, BLUE, (x + 5, y + 20), (x - 5, y), 2)  # Left arm
+            pygame.draw.line(surface, BLUE, (x + self.width - 5, y + 20), (x + self.width + 5, y), 2)  # Right arm
         else:
             # Skydiving position
-            pygame.draw.line(surface, BLUE, (self.x + 5, self.y + 20), (self.x - 10, self.y + 15), 2)  # Left arm
-            pygame.draw.line(surface, BLUE, (self.x + self.width - 5, self.y + 20), (self.x + self.width + 10, self.y + 15), 2)  # Right arm
+            pygame.draw.line(surface, BLUE, (x + 5, y + 20), (x - 10, y + 15), 2)  # Left arm
+            pygame.draw.line(surface, BLUE, (x + self.width - 5, y + 20), (x + self.width + 10, y + 15), 2)  # Right arm
         
         # Legs
-        pygame.draw.line(surface, BLUE, (self.x + 15, self.y + self.height), (self.x + 10, self.y + self.height + 10), 2)  # Left leg
-        pygame.draw.line(surface, BLUE, (self.x + 25, self.y + self.height), (self.x + 30, self.y + self.height + 10), 2)  # Right leg
+        pygame.draw.line(surface, BLUE, (x + 15, y + self.height), (x + 10, y + self.height + 10), 2)  # Left leg
+        pygame.draw.line(surface, BLUE, (x + 25, y + self.height), (x + 30, y + self.height + 10), 2)  # Right leg
         
         if self.alive:
             # Happy mouth
-            pygame.draw.arc(surface, BLACK, (self.x + 10, self.y + 20, 20, 10), 0, 3.14, 2)
+            pygame.draw.arc(surface, BLACK, (x + 10, y + 20, 20, 10), 0, 3.14, 2)
         else:
             # Sad mouth
-            pygame.draw.arc(surface, BLACK, (self.x + 10, self.y + 25, 20, 10), 3.14, 6.28, 2)
-
-    def check_collision(self, obstacles):
-        player_rect = pygame.Rect(self.x, self.y, self.width, self.height)
-        
-        for obstacle in obstacles:
-            if player_rect.colliderect(obstacle.rect):
-                # Play crash sound
-                crash_sound = load_sound("crash.wav")
-                if crash_sound:
-                    crash_sound.play()
-                self.alive = False
-                return True
-        
-        # Check if player has reached the ground
-        if self.y + self.height >= SCREEN_HEIGHT - 20:  # Ground level
-            self.y = SCREEN_HEIGHT - 20 - self.height
-            self.landed = True
-            
-            # Check landing speed
-            if self.speed_y > 3:
-                # Too fast landing - crash
-                crash_sound = load_sound("crash.wav")
-                if crash_sound:
-                    crash_sound.play()
-                self.alive = False
-            else:
-                # Safe landing
-                landing_sound = load_sound("landing.wav")
-                if landing_sound:
-                    landing_sound.play()
-            
-            return self.landed
-        
-        return False
+            pygame.draw.arc(surface, BLACK, (x + 10, y + 25, 20, 10), 3.14, 6.28, 2)
+
+    def bounds(self, alpha=1.0, offset_x=0):
+        """Screen area the player may cover, including parachute, arms and legs"""
+        x, y = self.interpolate(alpha)
+        x -= offset_x
+        return pygame.Rect(x - 22, y - self.parachute_height - 2,
+                           self.width + 44, self.height + self.parachute_height + 14)
 
 # Obstacle class
-class Obstacle:
-    def __init__(self, x, width, height):
-        self.x = x
-        self.width = width
-        self.height = height
-        self.y = SCREEN_HEIGHT - 20 - height  # Position at ground level
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
-    
-    def draw(self, surface):
-        pygame.draw.rect(surface, GREEN, self.rect)
+class Obstacle(simulation.Obstacle):
+    def draw(self, surface, offset_x=0):
+        x = self.x - offset_x
+        pygame.draw.rect(surface, GREEN, (x, self.y, self.width, self.height))
         
         # Draw warning markers on obstacles
         for i in range(0, self.width, 15):
             if (i // 15) % 2 == 0:  # Alternating pattern
-                pygame.draw.rect(surface, YELLOW, (self.x + i, self.y, 15, 10))
+                pygame.draw.rect(surface, YELLOW, (x + i, self.y, 15, 10))
 
 # Plane class
-class Plane:
-    def __init__(self):
-        self.width = 100
-        self.height = 30
-        self.x = -self.width
-        self.y = 30
-        self.speed = 3
-        self.active = True
-    
-    def update(self):
-        if self.active:
-            self.x += self.speed
-            
-            # Reset plane when it goes off-screen
-            if self.x > SCREEN_WIDTH:
-                self.x = -self.width
-                self.active = False
-    
-    def draw(self, surface):
-        if self.active:
-            # Draw plane body
-            pygame.draw.rect(surface, WHITE, (self.x, self.y, self.width, self.height))
-            
-            # Draw wings
-            pygame.draw.polygon(surface, WHITE, [
-                (self.x + 30, self.y),
-                (self.x + 50, self.y - 15),
-                (self.x + 70, self.y)
-            ])
-            
-            # Draw tail
-            pygame.draw.polygon(surface, WHITE, [
-                (self.x + self.width - 20, self.y),
-                (self.x + self.width - 10, self.y - 15),
-                (self.x + self.width, self.y)
-            ])
-            
-            # Draw windows
-            for i in range(3):
-                pygame.draw.circle(surface, BLUE, (self.x + 30 + i*20, self.y + self.height//2), 5)
+class Plane(simulation.Plane):
+    def draw(self, surface, alpha=1.0, offset_x=0, scale=1):
+        x, y = self.interpolate(alpha)
+        x -= offset_x
+        if not self.active:
+            return
+        
+        # Room for the wings and tail above the body
+        sprite_cache.draw(surface, ("plane", self.width, self.height), (self.width + 2, self.height + 17),
+                          (1, 16), self.draw_shape, x, y, scale)
+    
+    def draw_shape(self, surface, x, y):
+        """Draw the plane procedurally with its body's top-left corner at (x, y)"""
+        # Draw plane body
+        pygame.draw.rect(surface, WHITE, (x, y, self.width, self.height))
+        
+        # Draw wings
+        pygame.draw.polygon(surface, WHITE, [
+            (x + 30, y),
+            (x + 50, y - 15),
+            (x + 70, y)
+        ])
+        
+        # Draw tail
+        pygame.draw.polygon(surface, WHITE, [
+            (x + self.width - 20, y),
+            (x + self.width - 10, y - 15),
+            (x + self.width, y)
+        ])
+        
+        # Draw windows
+        for i in range(3):
+            pygame.draw.circle(surface, BLUE, (x + 30 + i*20, y + self.height//2), 5)
+
+    def bounds(self, alpha=1.0, offset_x=0):
+        """Screen area covered by the plane body, wings and tail"""
+        x, y = self.interpolate(alpha)
+        x -= offset_x
+        return pygame.Rect(x - 1, y - 16, self.width + 2, self.height + 17)
 
 # Cloud class
-class Cloud:
-    def __init__(self):
-        self.width = random.randint(50, 150)
-        self.height = random.randint(30, 60)
-        self.x = random.randint(0, SCREEN_WIDTH)
-        self.y = random.randint(50, 200)
-        self.speed = random.uniform(0.2, 1.0)
-    
-    def update(self):
-        self.x += self.speed
-        if self.x > SCREEN_WIDTH:
-            self.x = -self.width
-            self.y = random.randint(50, 200)
-    
-    def draw(self, surface):
-        pygame.draw.ellipse(surface, WHITE, (self.x, self.y, self.width, self.height))
-        pygame.draw.ellipse(surface, WHITE, (self.x + self.width*0.2, self.y - self.height*0.2, self.width*0.6, self.height*0.6))
-        pygame.draw.ellipse(surface, WHITE, (self.x + self.width*0.4, self.y + self.height*0.2, self.width*0.6, self.height*0.6))
-
-# Game class
-class Game:
-    def __init__(self):
-        self.reset()
-        
-        # Load background sounds
-        self.wind_sound = load_sound("wind.wav")
-        self.background_music = load_sound("background.wav")
-        
-        # High scores list
+class Cloud(simulation.Cloud):
+    def draw(self, surface, alpha=1.0, scale=1):
+        x, y = self.interpolate(alpha)
+        
+        # The top puff rises a fifth of the height above the main ellipse
+        top = int(self.height * 0.2) + 2
+        sprite_cache.draw(surface, ("cloud", self.width, self.height), (self.width + 2, self.height + top + 1),
+                          (1, top), self.draw_shape, x, y, scale)
+    
+    def draw_shape(self, surface, x, y):
+        """Draw the cloud procedurally with its main ellipse's top-left corner at (x, y)"""
+        pygame.draw.ellipse(surface, WHITE, (x, y, self.width, self.height))
+        pygame.draw.ellipse(surface, WHITE, (x + self.width*0.2, y - self.height*0.2, self.width*0.6, self.height*0.6))
+        pygame.draw.ellipse(surface, WHITE, (x + self.width*0.4, y + self.height*0.2, self.width*0.6, self.height*0.6))
+
+    def bounds(self, alpha=1.0):
+        """Screen area covered by the three cloud ellipses"""
+        x, y = self.interpolate(alpha)
+        return pygame.Rect(x - 1, y - self.height*0.2 - 1, self.width + 2, self.height*1.2 + 3)
+
+# Game class: the pygame front-end on top of the headless simulation
+class Game(simulation.Simulation):
+    player_class = Player
+    plane_class = Plane
+    obstacle_class = Obstacle
+    cloud_class = Cloud
+
+    def __init__(self, render_mode="full", seed=None, replay_dir="replays", scores_path="high_scores.db",
+                 ghost=False, level_pack=None, level=0, telemetry=None):
+        # "full" redraws the whole frame; "dirty" blits a pre-baked background
+        # and only updates the screen areas that changed
+        self.render_mode = render_mode
+        self.background = None
+        self.dirty_rects = []
+        # The background shrunk once for frames drawn at the low-res quality level
+        self.scaled_background = None
+        
+        # Cosmetic weather and effect particles, never seen by the simulation
+        self.particles = ParticleSystem()
+        self.particle_rects = []
+        
+        # Every descent is recorded so its score can be re-simulated later
+        self.replay_dir = replay_dir
+        self.recorder = replay.Recorder()
+        
+        # Recent ticks for the rewind key; a rewound descent is practice and
+        # does not enter the high scores
+        self.history = rewind.SnapshotRing(REWIND_HISTORY_SECONDS * simulation.TICK_RATE)
+        self.rewound = False
+        
+        # Optional per-tick flight log (telemetry.py) for analysing how players fly
+        self.telemetry = telemetry
+        
+        # Ideal line and difficulty of each layout, planned at level load
+        self.show_ghost = ghost
+        self.plan = None
+        
+        # Prebuilt levels known to have a reachable safe landing, played in order
+        self.level_pack = None
+        self.level_index = level
+        if level_pack:
+            # Imported on demand so startup does not pay for it and the planner it uses
+            from level_pack import LevelPack
+            try:
+                self.level_pack = LevelPack(level_pack)
+            except (OSError, ValueError) as e:
+                print(f"Error opening level pack: {e}")
+        super().__init__(seed)
+        
+        # Background music comes from the sound bank once it has loaded
+        self.background_music = None
+        
+        # High scores live in a crash-safe store; the old JSON list is imported once
         self.high_scores = []
         self.high_scores_file = "high_scores.json"
+        self.score_store = None
+        try:
+            self.score_store = ScoreStore(scores_path)
+            self.score_store.import_json(self.high_scores_file)
+        except Exception as e:
+            print(f"Error opening high score store: {e}")
         self.load_high_scores()
+        self.start_music()
+    
+    def start_music(self):
+        """Loop the background music if the sound bank has loaded and it is not playing yet"""
+        if self.background_music is not None or not sound_bank.sounds:
+            return
+        self.background_music = sound_bank.get("background.wav")
         
         # Play background music (with error handling)
         try:
             if self.background_music:
-                self.background_music.play(-1)  # Loop indefinitely
+                sound_bank.play("background.wav", loops=-1)  # Loop indefinitely
         except Exception as e:
             print(f"Could not play background music: {e}")
     
-    def reset(self):
-        self.player = Player()
-        self.plane = Plane()
-        self.obstacles = []
-        self.clouds = [Cloud() for _ in range(5)]
-        self.game_over = False
-        self.jumping = False
-        self.score = 0
-        self.wind_direction = 0
-        self.wind_timer = 0
-        self.landing_zones = []
-        
-        # Create obstacles
-        num_obstacles = random.randint(5, 8)
-        obstacle_positions = sorted(random.sample(range(100, SCREEN_WIDTH - 100), num_obstacles))
-        
-        for pos in obstacle_positions:
-            width = random.randint(30, 80)
-            height = random.randint(40, 100)
-            self.obstacles.append(Obstacle(pos, width, height))
-        
-        # Create landing zones between obstacles
-        self.create_landing_zones()
-    
-    def create_landing_zones(self):
-        """Create safe landing zones between obstacles"""
-        self.landing_zones = []
-        
-        # Sort obstacles by x position
-        sorted_obstacles = sorted(self.obstacles, key=lambda o: o.x)
-        
-        # Add a landing zone before the first obstacle
-        if sorted_obstacles and sorted_obstacles[0].x > 100:
-            width = min(100, sorted_obstacles[0].x - 50)
-            self.landing_zones.append(pygame.Rect(
-                sorted_obstacles[0].x - width - 10,
-                SCREEN_HEIGHT - 30,
-                width,
-                10
-            ))
+    def reset(self, seed=None):
+        if seed is None and self.level_pack is not None and len(self.level_pack):
+            level = self.level_pack.level(self.level_index % len(self.level_pack))
+            self.level_index += 1
+            super().reset(level=level)
+        else:
+            super().reset(seed)
+        self.recorder.start(self.seed)
+        if self.telemetry is not None:
+            self.telemetry.start_run()
+        self.history.clear()
+        self.rewound = False
+        self.particles.clear(self.seed)
+        if self.show_ghost:
+            import planner  # Only needed with the ghost, so not imported at startup
+            self.plan = planner.plan_layout(self)
         
-        # Add landing zones between obstacles
-        for i in range(len(sorted_obstacles) - 1):
-            gap = sorted_obstacles[i+1].x - (sorted_obstacles[i].x + sorted_obstacles[i].width)
-            if gap > 80:  # Only create a zone if there's enough space
-                zone_width = min(gap - 20, 100)  # Leave some margin
-                zone_x = sorted_obstacles[i].x + sorted_obstacles[i].width + (gap - zone_width) // 2
-                self.landing_zones.append(pygame.Rect(
-                    zone_x,
-                    SCREEN_HEIGHT - 30,
-                    zone_width,
-                    10
-                ))
-        
-        # Add a landing zone after the last obstacle
-        if sorted_obstacles and sorted_obstacles[-1].x + sorted_obstacles[-1].width < SCREEN_WIDTH - 100:
-            width = min(100, SCREEN_WIDTH - (sorted_obstacles[-1].x + sorted_obstacles[-1].width) - 50)
-            self.landing_zones.append(pygame.Rect(
-                sorted_obstacles[-1].x + sorted_obstacles[-1].width + 10,
-                SCREEN_HEIGHT - 30,
-                width,
-                10
-            ))
+        # Static scenery only changes here, so bake it once per layout
+        self.bake_background()
+    
+    def bake_background(self):
+        """Render sky, ground, landing zones and obstacles into one background surface"""
+        self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        self.background.fill(SKY_BLUE)
+        self.draw_scenery(self.background)
+        self.scaled_background = None
+        # The next dirty-rect frame has to push the whole new background
+        self.dirty_rects = [pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)]
+    
+    def set_render_mode(self, render_mode):
+        """Switch between full redraw and dirty-rectangle rendering"""
+        self.render_mode = render_mode
+        self.dirty_rects = [pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)]
+    
+    def apply_quality(self):
+        """Re-bake the scenery for a new quality level; this also pushes the whole screen next"""
+        self.bake_background()
     
     def load_high_scores(self):
-        """Load high scores from file"""
+        """Load the top high scores from the store"""
+        if self.score_store is None:
+            return
         try:
-            if os.path.exists(self.high_scores_file):
-                with open(self.high_scores_file, 'r') as f:
-                    self.high_scores = json.load(f)
+            self.high_scores = self.score_store.top_scores(HIGH_SCORES_SHOWN)
         except Exception as e:
             print(f"Error loading high scores: {e}")
             self.high_scores = []
     
     def save_high_scores(self):
-        """Save high scores to file"""
+        """Append the current run to the store"""
+        if self.score_store is None:
+            return
         try:
-            with open(self.high_scores_file, 'w') as f:
-                json.dump(self.high_scores, f)
+            self.score_store.add(
+                self.score,
+                seed=self.seed,
+                deploy_height=self.player.parachute_deploy_height if self.player.parachute_deployed else None,
+                safe_zone=self.in_safe_zone(),
+                ticks=self.tick,
+            )
         except Exception as e:
             print(f"Error saving high scores: {e}")
     
+    def save_replay(self):
+        """Write the finished descent to the replay directory"""
+        if not self.replay_dir:
+            return
+        try:
+            os.makedirs(self.replay_dir, exist_ok=True)
+            data = self.recorder.finish(self.score)
+            stem = os.path.join(self.replay_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.seed}")
+            # Descents of one seed can end within the same second, even in
+            # separate game processes, so later ones get a numbered suffix
+            attempt = 1
+            while True:
+                suffix = f"-{attempt}" if attempt > 1 else ""
+                try:
+                    replay.save(f"{stem}{suffix}{replay.EXTENSION}", data, overwrite=False)
+                    break
+                except FileExistsError:
+                    attempt += 1
+        except Exception as e:
+            print(f"Error saving replay: {e}")
+    
     def update_high_scores(self):
         """Update high scores with current score"""
-        if self.player.alive:  # Only add score if player survived
-            self.high_scores.append(self.score)
-            self.high_scores.sort(reverse=True)  # Sort in descending order
-            self.high_scores = self.high_scores[:10]  # Keep only top 10
+        if self.player.alive and not self.rewound:  # Only add score if player survived
             self.save_high_scores()
+            self.load_high_scores()
     
-    def update_wind(self):
-        self.wind_timer -= 1
-        if self.wind_timer <= 0:
-            self.wind_timer = random.randint(180, 360)  # 3-6 seconds at 60 FPS
-            self.wind_direction = random.uniform(-1, 1)
-            self.player.wind = self.wind_direction
-            
-            # Play wind sound
-            wind_sound = load_sound("wind.wav")
-            if wind_sound:
-                wind_sound.play()
+    def update(self, inputs=None):
+        """Advance one tick with the given inputs, or the keyboard state if None"""
+        if inputs is None:
+            keys = pygame.key.get_pressed()
+            inputs = Inputs(keys[pygame.K_LEFT], keys[pygame.K_RIGHT], keys[pygame.K_SPACE])
+        
+        # Only ticks up to the end of the descent affect the score
+        recording = not self.game_over
+        if recording:
+            self.recorder.record(inputs)
+        
+        events = self.step(inputs)
+        if recording:
+            self.history.push(self)
+            if self.telemetry is not None:
+                self.telemetry.record(self, inputs, events)
+        
+        # Play a sound for everything that happened this tick
+        for event in events:
+            sound_bank.play(EVENT_SOUNDS[event])
+        
+        with profiler.scope("update/particles"):
+            self.update_particles(events)
+        
+        if EVENT_LANDING in events:
+            self.update_high_scores()
+        if recording and self.game_over:
+            self.save_replay()
+            if self.telemetry is not None:
+                # Handed to the writer thread, so a finished descent reaches the disk
+                self.telemetry.flush()
+    
+    def rewind(self, seconds=REWIND_SECONDS):
+        """Go back up to seconds of ticks in this descent. Returns True if it moved."""
+        if not self.history.rewind(self, int(seconds * simulation.TICK_RATE)):
+            return False
+        # The replay stays valid: it holds exactly the inputs that led here
+        self.recorder.truncate(self.tick)
+        self.rewound = True
+        return True
     
-    def update(self):
-        keys = pygame.key.get_pressed()
+    def view_left(self):
+        """World x of the left edge of the screen"""
+        return 0
+    
+    def update_particles(self, events):
+        """Emit this tick's wind specks and event effects, then move every particle"""
+        particles = self.particles
+        left = self.view_left()
         
-        # Update plane
-        self.plane.update()
+        # Specks blow in from the upwind edge, more of them the stronger the wind
+        count = particles.rng.poisson(abs(self.wind_direction) * WIND_SPECK_RATE)
+        if count:
+            edge = left if self.wind_direction > 0 else left + SCREEN_WIDTH
+            particles.emit(count, edge, 250, SPECK_COLOR, spread=(0.3, 0.2), life=(300, 500),
+                           drift=6.0, area=(0, 400))
         
-        # Update clouds
-        for cloud in self.clouds:
-            cloud.update()
+        player = self.player
+        center = player.x + player.width // 2
+        if simulation.EVENT_PARACHUTE in events:
+            # Puff of air pushed out of the canopy as it fills
+            particles.emit(40, center, player.y - player.parachute_height, WHITE, speed=(0, -0.5),
+                           spread=(2.0, 1.0), life=(15, 35), size=(1, 3), gravity=0.05, drift=1.0,
+                           area=(player.parachute_width, 10))
+        if simulation.EVENT_LANDING in events or simulation.EVENT_CRASH in events:
+            # Dust kicked up where the player touched down; a crash throws more
+            count = 30 if player.alive else 70
+            particles.emit(count, center, player.y + player.height - 2, DUST_COLOR, speed=(0, -1.5),
+                           spread=(1.5, 1.0), life=(20, 45), size=(1, 3), gravity=0.12, drift=0.5,
+                           area=(player.width, 0))
         
-        # Update wind
-        self.update_wind()
+        particles.update(self.wind_direction, left, left + SCREEN_WIDTH)
+    
+    def draw_scenery(self, surface):
+        """Draw the static ground layer: ground, landing zones and obstacles"""
+        self.draw_terrain(surface, self.obstacles, self.landing_zones)
+        if self.plan is not None:
+            self.draw_ghost(surface)
+    
+    def draw_ghost(self, surface):
+        """Draw the planned ideal line through the player's centre"""
+        path = self.plan.path
+        points = [(x + self.player.width / 2, y + self.player.height / 2)
+                  for x, y in path[::GHOST_POINT_TICKS] + path[-1:]]
+        if len(points) > 1:
+            pygame.draw.lines(surface, GHOST_COLOR, False, points, 2)
+    
+    def draw_terrain(self, surface, obstacles, landing_zones, offset_x=0):
+        """Draw ground, landing zones and obstacles shifted left by offset_x"""
+        # Draw ground
+        pygame.draw.rect(surface, (139, 69, 19), (0, SCREEN_HEIGHT - 20, surface.get_width(), 20))
         
-        # Check if player should jump from plane
-        if not self.jumping and self.plane.x + self.plane.width // 2 > SCREEN_WIDTH // 3:
-            self.jumping = True
-            self.player.x = self.plane.x + self.plane.width // 2
-            self.player.y = self.plane.y + self.plane.height
-            
-            # Play jump sound
-            jump_sound = load_sound("jump.wav")
-            if jump_sound:
-                jump_sound.play()
-        
-        # If player has jumped, allow movement
-        if self.jumping and not self.game_over and self.player.alive:
-            # Deploy parachute with space key
-            if keys[pygame.K_SPACE] and not self.player.parachute_deployed:
-                self.player.deploy_parachute()
-            
-            # Update player position
-            self.player.move(keys)
-            
-            # Check for collisions
-            if self.player.check_collision(self.obstacles):
-                self.game_over = True
-            
-            # Update score based on progress
-            if self.player.landed and self.player.alive:
-                # Base score from landing position
-                landing_score = 1000 - sum(abs(self.player.x - (obstacle.x + obstacle.width // 2)) 
-                                     for obstacle in self.obstacles) // len(self.obstacles)
+        # Draw landing zones
+        with profiler.scope("draw/landing_zones"):
+            for zone in landing_zones:
+                left = zone.left - offset_x
+                right = zone.right - offset_x
                 
-                # Bonus for landing in safe zone
-                for zone in self.landing_zones:
-                    if zone.collidepoint(self.player.x + self.player.width // 2, SCREEN_HEIGHT - 21):
-                        landing_score += 500
-                        break
+                # Create transparent surface for landing zone
+                if quality.zone_alpha:
+                    safe_surface = create_transparent_surface(zone.width, zone.height, SAFE_ZONE_COLOR)
+                    surface.blit(safe_surface, (left, zone.top))
                 
-                # Speed bonus for deploying parachute later
-                time_bonus = max(0, 200 - self.player.parachute_deploy_height)
+                # Add landing zone markings
+                pygame.draw.line(surface, WHITE, (left, SCREEN_HEIGHT - 20), (right, SCREEN_HEIGHT - 20), 3)
                 
-                self.score = max(0, landing_score + time_bonus)
-                self.update_high_scores()
-                self.game_over = True
+                # Add "SAFE" text
+                text = text_renderer.render("SAFE", 20, WHITE)
+                surface.blit(text, (zone.centerx - offset_x - text.get_width() // 2, SCREEN_HEIGHT - 35))
+        
+        # Draw obstacles
+        with profiler.scope("draw/obstacles"):
+            for obstacle in obstacles:
+                obstacle.draw(surface, offset_x)
     
-    def draw(self, surface):
+    def draw(self, surface, alpha=1.0):
+        """Draw a frame alpha of the way into the current tick.
+        Returns the rects to update, or None if the whole screen changed."""
+        if surface.get_width() != SCREEN_WIDTH:
+            return self.draw_scaled(surface, alpha, surface.get_width() / SCREEN_WIDTH)
+        if self.render_mode == "dirty":
+            return self.draw_dirty(surface, alpha)
+        
         # Draw sky background
-        surface.fill(SKY_BLUE)
+        with profiler.scope("draw/sky"):
+            surface.fill(SKY_BLUE)
         
         # Draw clouds
-        for cloud in self.clouds:
-            cloud.draw(surface)
+        with profiler.scope("draw/clouds"):
+            for cloud in self.clouds[::quality.cloud_step]:
+                cloud.draw(surface, alpha)
         
         # Draw plane
-        self.plane.draw(surface)
+        with profiler.scope("draw/plane"):
+            self.plane.draw(surface, alpha)
         
-        # Draw ground
-        pygame.draw.rect(surface, (139, 69, 19), (0, SCREEN_HEIGHT - 20, SCREEN_WIDTH, 20))
+        # Draw ground, landing zones and obstacles
+        self.draw_scenery(surface)
         
-        # Draw landing zones
-        for zone in self.landing_zones:
-            # Create transparent surface for landing zone
-            safe_surface = create_transparent_surface(zone.width, zone.height, SAFE_ZONE_COLOR)
-            surface.blit(safe_surface, (zone.left, zone.top))
-            
-            # Add landing zone markings
-            pygame.draw.line(surface, WHITE, (zone.left, SCREEN_HEIGHT - 20), (zone.right, SCREEN_HEIGHT - 20), 3)
-            
-            # Add "SAFE" text
-            font = pygame.font.SysFont(None, 20)
-            text = font.render("SAFE", True, WHITE)
-            surface.blit(text, (zone.centerx - text.get_width() // 2, SCREEN_HEIGHT - 35))
-        
-        # Draw obstacles
-        for obstacle in self.obstacles:
-            obstacle.draw(surface)
+        with profiler.scope("draw/particles"):
+            self.particles.draw(surface, alpha)
         
         # Draw player if jumped
-        if self.jumping:
-            self.player.draw(surface)
+        with profiler.scope("draw/player"):
+            if self.jumping:
+                self.player.draw(surface, alpha)
+        
+        with profiler.scope("draw/hud"):
+            self.draw_hud(surface)
+        profiler.draw_overlay(surface, text_renderer)
+        return None
+    
+    def draw_scaled(self, surface, alpha, scale):
+        """Draw a whole frame on a surface scale times the screen size, for the
+        low-res quality level. The baked background and the sprites are scaled
+        once and blitted, so every frame touches scale squared as many pixels."""
+        with profiler.scope("draw/sky"):
+            size = surface.get_size()
+            if self.scaled_background is None or self.scaled_background.get_size() != size:
+                self.scaled_background = pygame.transform.smoothscale(self.background, size)
+            surface.blit(self.scaled_background, (0, 0))
+        
+        with profiler.scope("draw/clouds"):
+            for cloud in self.clouds[::quality.cloud_step]:
+                cloud.draw(surface, alpha, scale)
+        
+        with profiler.scope("draw/plane"):
+            self.plane.draw(surface, alpha, 0, scale)
+        
+        with profiler.scope("draw/particles"):
+            self.particles.draw(surface, alpha, 0, scale)
+        
+        with profiler.scope("draw/player"):
+            if self.jumping:
+                self.player.draw(surface, alpha, 0, scale)
+        
+        with profiler.scope("draw/hud"):
+            self.draw_hud(surface, scale)
+        profiler.draw_overlay(surface, text_renderer)
+        return None
+    
+    def draw_dirty(self, surface, alpha=1.0):
+        """Draw only the moving sprites over the baked background"""
+        screen_rect = surface.get_rect()
+        
+        # Restore the background wherever something was drawn last frame
+        previous_rects = self.dirty_rects
+        previous_particle_rects = self.particle_rects
+        with profiler.scope("draw/restore"):
+            for rect in previous_rects:
+                surface.blit(self.background, rect, rect)
+            for rect in previous_particle_rects:
+                surface.blit(self.background, rect, rect)
+        
+        drawn_rects = []
+        with profiler.scope("draw/clouds"):
+            for cloud in self.clouds[::quality.cloud_step]:
+                cloud.draw(surface, alpha)
+                drawn_rects.append(cloud.bounds(alpha))
+        
+        with profiler.scope("draw/plane"):
+            if self.plane.active:
+                self.plane.draw(surface, alpha)
+                drawn_rects.append(self.plane.bounds(alpha))
+        
+        # Particles are tracked by screen tile: they are too many to merge one by one
+        with profiler.scope("draw/particles"):
+            self.particles.draw(surface, alpha)
+            self.particle_rects = self.particles.tile_rects()
+        
+        with profiler.scope("draw/player"):
+            if self.jumping:
+                self.player.draw(surface, alpha)
+                drawn_rects.append(self.player.bounds(alpha))
+        
+        with profiler.scope("draw/hud"):
+            drawn_rects.extend(self.draw_hud(surface))
+        drawn_rects.extend(profiler.draw_overlay(surface, text_renderer))
+        
+        self.dirty_rects = [rect.clip(screen_rect) for rect in drawn_rects]
+        return merge_rects(previous_rects + self.dirty_rects) + previous_particle_rects + self.particle_rects
+    
+    def draw_hud(self, surface, scale=1):
+        """Draw the wind indicator and game over screen, laid out for a surface
+        scale times the screen size. Returns the rects drawn."""
+        rects = []
+        center_x = surface.get_width() // 2
+        center_y = surface.get_height() // 2
+        
+        def render(text, size, color):
+            return text_renderer.render(text, round(size * scale), color)
         
         # Display wind indicator
         wind_text = f"Wind: {'←' if self.wind_direction < 0 else '→' if self.wind_direction > 0 else '—'}"
         wind_text += "." * (1 + int(abs(self.wind_direction) * 5))
-        font = pygame.font.SysFont(None, 24)
-        wind_surface = font.render(wind_text, True, BLACK)
-        surface.blit(wind_surface, (20, 20))
+        wind_surface = render(wind_text, 24, BLACK)
+        rects.append(surface.blit(wind_surface, (20 * scale, 20 * scale)))
+        
+        if self.plan is not None:
+            plan_text = f"Layout: {self.plan.grade} - ideal score {self.plan.score:.0f}"
+            rects.append(surface.blit(render(plan_text, 24, BLACK), (20 * scale, 45 * scale)))
         
         # Draw game over screen
         if self.game_over:
-            font = pygame.font.SysFont(None, 48)
             if self.player.alive:
-                text = font.render(f"You landed safely! Score: {self.score}", True, BLACK)
+                text = render(f"You landed safely! Score: {self.score}", 48, BLACK)
             else:
-                text = font.render("Game Over - You crashed!", True, RED)
+                text = render("Game Over - You crashed!", 48, RED)
             
-            surface.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 - 80))
+            rects.append(surface.blit(text, (center_x - text.get_width() // 2, center_y - 80 * scale)))
             
             # Draw high scores
             if self.high_scores:
-                font = pygame.font.SysFont(None, 36)
-                high_score_text = font.render("High Scores:", True, BLACK)
-                surface.blit(high_score_text, (SCREEN_WIDTH // 2 - high_score_text.get_width() // 2, SCREEN_HEIGHT // 2 - 30))
+                high_score_text = render("High Scores:", 36, BLACK)
+                rects.append(surface.blit(high_score_text, (center_x - high_score_text.get_width() // 2, center_y - 30 * scale)))
                 
                 for i, score in enumerate(self.high_scores[:5]):  # Show top 5 scores
-                    score_text = font.render(f"{i+1}. {score}", True, BLACK)
-                    surface.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, SCREEN_HEIGHT // 2 + i*30))
+                    score_text = render(f"{i+1}. {score}", 36, BLACK)
+                    rects.append(surface.blit(score_text, (center_x - score_text.get_width() // 2, center_y + i*30 * scale)))
+            
+            restart_text = render("Press R to restart", 32, BLACK)
+            rects.append(surface.blit(restart_text, (center_x - restart_text.get_width() // 2, center_y + 180 * scale)))
+        
+        # Tell operators when this machine has had to lower the drawing quality
+        if quality.level:
+            status = render(f"Quality: {quality.name}", 20, BLACK)
+            rects.append(surface.blit(status, (surface.get_width() - status.get_width() - 20 * scale, 20 * scale)))
+        
+        return rects
+
+
+class GlidePlayer(world.GlidePlayer, Player):
+    pass
+
+# Side-scrolling glide level: terrain streams in chunks around a camera that follows the player
+class GlideGame(Game, world.GlideSimulation):
+    player_class = GlidePlayer
+
+    def __init__(self, seed=None, scores_path="high_scores.db"):
+        self.camera = world.Camera()
+        self.chunk_surfaces = {}
+        # Chunk bands shrunk for frames drawn at the low-res quality level
+        self.scaled_chunks = {}
+        self.scratch = None
+        # The whole view scrolls, so every frame is a full redraw. Replays are
+        # verified against single-screen rules, so glide runs are not recorded.
+        super().__init__(render_mode="full", seed=seed, replay_dir="", scores_path=scores_path)
+    
+    def bake_background(self):
+        """Start streaming a new level from its first chunks"""
+        self.camera = world.Camera()
+        self.chunk_surfaces = {}
+        self.scaled_chunks = {}
+        self.stream_terrain(budget=None)
+    
+    def view_left(self):
+        return self.camera.x
+    
+    def set_render_mode(self, render_mode):
+        # Dirty rectangles cannot help when the camera moves every frame
+        self.render_mode = "full"
+    
+    def apply_quality(self):
+        # Re-bake the chunks where they are; bake_background() would restart the level
+        self.chunk_surfaces = {}
+        self.scaled_chunks = {}
+        self.stream_terrain(budget=None)
+    
+    def stream_terrain(self, budget=TERRAIN_BUDGET):
+        """Build chunk terrain and surfaces around the camera within the time budget"""
+        start = time.perf_counter()
+        self.world.stream(self.camera.left, self.camera.right, budget)
+        
+        # Forget the surfaces of evicted chunks
+        for index in [i for i in self.chunk_surfaces if i not in self.world.chunks]:
+            del self.chunk_surfaces[index]
+            self.scaled_chunks.pop(index, None)
+        
+        # Visible chunks are baked whatever the cost; the rest only while time is left
+        for chunk in self.world.loaded():
+            if chunk.index in self.chunk_surfaces:
+                continue
+            visible = chunk.right > self.camera.left and chunk.left < self.camera.right
+            if not visible and budget is not None and time.perf_counter() - start >= budget:
+                break
+            self.chunk_surfaces[chunk.index] = self.bake_chunk(chunk)
+    
+    def bake_chunk(self, chunk):
+        """Render one chunk's ground, landing zones and obstacles into a terrain band"""
+        if self.scratch is None:
+            self.scratch = pygame.Surface((world.CHUNK_WIDTH, SCREEN_HEIGHT)).convert()
+        self.scratch.fill(SKY_BLUE)
+        self.draw_terrain(self.scratch, chunk.obstacles, chunk.landing_zones, chunk.left)
+        band = pygame.Rect(0, TERRAIN_TOP, world.CHUNK_WIDTH, SCREEN_HEIGHT - TERRAIN_TOP)
+        return self.scratch.subsurface(band).copy()
+    
+    def scaled_band(self, index, band, scale):
+        """The terrain band of chunk index shrunk by scale, made once per chunk"""
+        scaled = self.scaled_chunks.get(index)
+        if scaled is None:
+            width, height = band.get_size()
+            scaled = pygame.transform.smoothscale(band, (round(width * scale), round(height * scale)))
+            self.scaled_chunks[index] = scaled
+        return scaled
+    
+    def draw(self, surface, alpha=1.0):
+        # A surface smaller than the screen is the low-res quality level
+        scale = surface.get_width() / SCREEN_WIDTH
+        if self.jumping:
+            x, _ = self.player.interpolate(alpha)
+            self.camera.follow(x, self.player.width)
+        with profiler.scope("draw/stream"):
+            self.stream_terrain()
+        offset_x = int(self.camera.x)
+        
+        with profiler.scope("draw/sky"):
+            surface.fill(SKY_BLUE)
+        
+        # Clouds are far away, so they stay put on screen
+        with profiler.scope("draw/clouds"):
+            for cloud in self.clouds[::quality.cloud_step]:
+                cloud.draw(surface, alpha, scale)
+        
+        with profiler.scope("draw/plane"):
+            self.plane.draw(surface, alpha, offset_x, scale)
+        
+        with profiler.scope("draw/terrain"):
+            for index in range(world.World.chunk_at(offset_x), world.World.chunk_at(offset_x + SCREEN_WIDTH - 1) + 1):
+                band = self.chunk_surfaces.get(index)
+                if band is not None:
+                    if scale != 1:
+                        band = self.scaled_band(index, band, scale)
+                    surface.blit(band, ((index * world.CHUNK_WIDTH - offset_x) * scale, TERRAIN_TOP * scale))
+        
+        with profiler.scope("draw/particles"):
+            self.particles.draw(surface, alpha, offset_x, scale)
+        
+        with profiler.scope("draw/player"):
+            if self.jumping:
+                self.player.draw(surface, alpha, offset_x, scale)
+        
+        with profiler.scope("draw/hud"):
+            self.draw_hud(surface, scale)
+        profiler.draw_overlay(surface, text_renderer)
+        return None
+    
+    def draw_hud(self, surface, scale=1):
+        rects = super().draw_hud(surface, scale)
+        distance_surface = text_renderer.render(f"Distance: {int(self.distance()) // 10} m", round(24 * scale), BLACK)
+        rects.append(surface.blit(distance_surface, (20 * scale, 45 * scale)))
+        return rects
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Parachute Game")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="start in dirty-rectangle rendering mode (F2 toggles)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for the first layout and wind sequence")
+    parser.add_argument("--glide", action="store_true",
+                        help="play a side-scrolling glide level many screens wide")
+    parser.add_argument("--replay-dir", default="replays",
+                        help="directory for recorded replays (empty string disables recording)")
+    parser.add_argument("--scores-db", default="high_scores.db",
+                        help="SQLite database holding the high scores")
+    parser.add_argument("--sound-stats", action="store_true",
+                        help="print sound bank counters on exit")
+    parser.add_argument("--synth-sounds", action="store_true",
+                        help="synthesize the sounds in memory instead of loading the WAV files")
+    parser.add_argument("--text-stats", action="store_true",
+                        help="print text cache counters on exit")
+    parser.add_argument("--no-sprite-cache", action="store_true",
+                        help="draw the player, plane and clouds procedurally every frame")
+    parser.add_argument("--level-pack", metavar="PATH",
+                        help="play prebuilt levels from a pack made by level_pack.py")
+    parser.add_argument("--level", type=int, default=0,
+                        help="index of the first level to play from the pack")
+    parser.add_argument("--ghost", action="store_true",
+                        help="plan each layout on load and show its ideal line and difficulty")
+    parser.add_argument("--profile", action="store_true",
+                        help="start with the profiler overlay shown (F3 toggles)")
+    parser.add_argument("--profile-export", metavar="PATH",
+                        help="stream per-frame timings to a CSV file, or JSON if PATH ends in .json")
+    parser.add_argument("--telemetry", metavar="DIR",
+                        help="log every tick of each descent to a new session in DIR (see telemetry.py)")
+    parser.add_argument("--quality", choices=("auto",) + LEVELS, default="auto",
+                        help="drawing quality: auto adapts to the frame budget, a level name pins it")
+    parser.add_argument("--measure-startup", action="store_true",
+                        help="report time to first frame by phase and import costs, then exit")
+    return parser.parse_args(argv)
+
+
+def set_display(low_res):
+    """Open the window. At low res the game draws a half-size frame, and SDL
+    scales it up to the window."""
+    if low_res:
+        try:
+            return pygame.display.set_mode((int(SCREEN_WIDTH * LOW_RES_SCALE), int(SCREEN_HEIGHT * LOW_RES_SCALE)),
+                                           pygame.SCALED)
+        except pygame.error as e:
+            print(f"Low resolution display unavailable, skipping that quality level: {e}")
+            quality.disable(LOW_RES)
+    return pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+
+
+def report_startup(timer):
+    """Print the startup phases and where the import time went"""
+    print("Startup, from the first import:")
+    for line in timer.report():
+        print(f"  {line}")
+    print(f"Time to first frame: {timer.elapsed('first frame') * 1000:.1f} ms")
+    
+    # A fresh interpreter, so modules already loaded here do not hide their cost
+    try:
+        interpreter, total, children = startup.import_costs("parachute_game")
+    except (OSError, RuntimeError) as e:
+        print(f"Could not measure import costs: {e}")
+        return
+    print(f"Imports (python -X importtime): interpreter {interpreter * 1000:.1f} ms, "
+          f"parachute_game {total * 1000:.1f} ms, heaviest:")
+    for name, cumulative in children:
+        print(f"  {name:<20}{cumulative * 1000:8.1f} ms")
+
+
+def main():
+    args = parse_args()
+    timer = startup.StartupTimer(IMPORT_START)
+    timer.mark("imports")
+    
+    # Initialize only what the first frame needs; the mixer is opened by the asset loader
+    try:
+        pygame.display.init()
+        pygame.font.init()
+    except Exception as e:
+        print(f"Error initializing pygame: {e}")
+        sys.exit(1)
+    timer.mark("display and font")
+    
+    # Decode every sound once so gameplay never touches the disk, on a thread
+    # so the plane run shows at once. Without WAV files the sounds are
+    # synthesized straight into mixer buffers.
+    synthesize = args.synth_sounds or not os.path.isdir("sounds") or not os.listdir("sounds")
+    loader = startup.AssetLoader(sound_bank, synthesize, timer).start()
+    
+    quality.adaptive = args.quality == "auto"
+    if not quality.adaptive:
+        quality.set_level(LEVELS.index(args.quality))
+    screen = set_display(quality.low_res)
+    pygame.display.set_caption("Parachute Game")
+    timer.mark("window")
+    
+    # Clock for controlling frame rate
+    clock = pygame.time.Clock()
+    
+    # Telemetry is imported only when asked for, to keep it out of startup
+    telemetry = None
+    if args.telemetry and not args.glide:
+        from telemetry import TelemetryRecorder
+        try:
+            telemetry = TelemetryRecorder(args.telemetry)
+        except OSError as e:
+            print(f"Error opening telemetry log: {e}")
+    
+    # Create game
+    if args.glide:
+        game = GlideGame(seed=args.seed, scores_path=args.scores_db)
+    else:
+        game = Game(render_mode="dirty" if args.dirty_rects else "full", seed=args.seed,
+                    replay_dir=args.replay_dir, scores_path=args.scores_db, ghost=args.ghost,
+                    level_pack=args.level_pack, level=args.level, telemetry=telemetry)
+    timer.mark("game")
+    
+    sprite_cache.enabled = not args.no_sprite_cache
+    
+    if args.profile_export:
+        profiler.start_export(args.profile_export)
+    if args.profile:
+        profiler.toggle_overlay()
+    
+    # Main game loop: the simulation advances in fixed ticks, however long frames take
+    running = True
+    first_frame_drawn = False
+    accumulator = 0.0
+    previous_time = time.perf_counter()
+    while running:
+        frame_start = time.perf_counter()
+        profiler.begin_frame()
+        
+        # Handle events
+        with profiler.scope("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_r and game.game_over:
+                        game.reset()
+                        accumulator = 0.0
+                    elif event.key == pygame.K_F2:
+                        # Toggle rendering paths to compare their cost
+                        game.set_render_mode("full" if game.render_mode == "dirty" else "dirty")
+                    elif event.key == pygame.K_F3:
+                        profiler.toggle_overlay()
+                    elif event.key == pygame.K_BACKSPACE:
+                        if game.rewind():
+                            accumulator = 0.0
+        
+        # Update game state, catching up with several ticks if rendering lagged
+        with profiler.scope("update"):
+            now = time.perf_counter()
+            accumulator += now - previous_time
+            previous_time = now
+            ticks = 0
+            while accumulator >= TICK_DT and ticks < MAX_CATCH_UP_TICKS:
+                game.update()
+                accumulator -= TICK_DT
+                ticks += 1
+            if ticks == MAX_CATCH_UP_TICKS:
+                # Too far behind to catch up; drop the backlog rather than spiral
+                accumulator = min(accumulator, TICK_DT)
+        
+        # At half rate every other frame is left undrawn; the ticks above still ran
+        if not quality.skip_frame():
+            # Draw everything between the last two ticks
+            with profiler.scope("draw"):
+                dirty_rects = game.draw(screen, min(1.0, accumulator / TICK_DT))
             
-            font = pygame.font.SysFont(None, 32)
-            restart_text = font.render("Press R to restart", True, BLACK)
-            surface.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2 + 180))
-
-# Create game
-game = Game()
-
-# Main game loop
-running = True
-while running:
-    # Handle events
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
+            # Update the display
+            with profiler.scope("flip"):
+                if dirty_rects is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(dirty_rects)
+        text_renderer.end_frame()
+        if not first_frame_drawn:
+            timer.mark("first frame")
+            first_frame_drawn = True
+        
+        # Sounds join in at a frame boundary once the loader has them
+        if loader.attach():
+            game.start_music()
+            timer.mark("sounds attached")
+        if args.measure_startup and loader.done:
             running = False
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_r and game.game_over:
-                game.reset()
+        
+        # Trade drawing detail for frame time, and log every change for operators
+        if quality.end_frame(time.perf_counter() - frame_start) is not None:
+            if quality.low_res != (screen.get_width() != SCREEN_WIDTH):
+                screen = set_display(quality.low_res)
+            game.apply_quality()
+            print(quality.status())
+        
+        # Control the frame rate
+        with profiler.scope("tick"):
+            clock.tick(FPS)
+        profiler.end_frame()
     
-    # Update game state
-    game.update()
+    if args.measure_startup:
+        report_startup(timer)
     
-    # Draw everything
-    game.draw(screen)
+    # Report cache counters when asked, to confirm the frame loop never loaded from disk
+    if args.sound_stats:
+        print(f"Sound bank: {sound_bank.stats()}")
+    if args.text_stats:
+        print(f"Text cache: {text_renderer.stats()}")
     
-    # Update the display
-    pygame.display.flip()
+    if telemetry is not None:
+        telemetry.close()
+        print(f"Telemetry: {telemetry.path} {telemetry.stats()}")
     
-    # Control the frame rate
-    clock.tick(FPS)
+    # Clean up, letting the loader finish before SDL goes away under it
+    loader.join()
+    profiler.close()
+    pygame.quit()
+    sys.exit()
+
 
-# Clean up
-pygame.quit()
-sys.exit()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
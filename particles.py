@@ -0,0 +1,280 @@
+"""
+Array-backed particle system for the parachute game's weather effects.
+
+Particles (wind specks, the puff of a canopy opening, landing dust) are
+cosmetic, so they live in the pygame front-end rather than the simulation.
+They are stored as a struct of arrays: position, velocity, gravity, wind
+drift, remaining life, size and colour each sit in one contiguous NumPy
+array with a slot per particle. A tick updates every slot with a handful of
+vectorized operations that write into the existing arrays. Dead slots go on
+a free list and the next emit() reuses them, so a running system never
+allocates per particle.
+
+Drawing is batched the same way. Live particles are written straight into
+the target surface's pixels as small squares, with one array assignment
+per pixel offset in the square instead of a draw call per particle.
+
+    python3 particles.py --counts 100 1000 10000
+
+benchmarks particle updates against the per-object Cloud.update path.
+"""
+
+import argparse
+import os
+import random
+import time
+
+import numpy as np
+import pygame
+
+from simulation import SCREEN_WIDTH, SCREEN_HEIGHT, GROUND_Y
+
+# Largest particle, in pixels per side
+MAX_SIZE = 3
+
+# Particles this far past the sides of the view are dropped
+MARGIN = 40
+
+# Pixel offsets within the largest square, and the smallest size that covers each
+_OFFSET_X, _OFFSET_Y = np.divmod(np.arange(MAX_SIZE * MAX_SIZE), MAX_SIZE)
+_OFFSET_MAX = np.maximum(_OFFSET_X, _OFFSET_Y)
+
+
+class ParticleSystem:
+    def __init__(self, capacity=4096, seed=0):
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        # How many pixels per tick a full-strength wind pushes the particle
+        self.drift = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.size = np.zeros(capacity, dtype=np.uint8)
+        self.color = np.zeros(capacity, dtype=np.uint8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Stack of unused slots; the top is free[free_count - 1]
+        self.free = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self.free_count = capacity
+        # Palette index -> RGB; particles store the index
+        self.palette = []
+        self.dropped = 0
+        # Wind of the last update, so drawing can interpolate the drift too
+        self.wind = np.float32(0.0)
+        # Every live particle sits below this slot
+        self.high = 0
+        # Screen pixels written by the last draw()
+        self.drawn_x = None
+        self.drawn_y = None
+        # Scratch masks reused by every update
+        self._dead = np.zeros(capacity, dtype=bool)
+        self._mask = np.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        return self.capacity - self.free_count
+
+    def color_index(self, color):
+        """Palette index for an RGB colour, adding it on first use"""
+        color = tuple(color[:3])
+        if color not in self.palette:
+            if len(self.palette) == 256:
+                raise ValueError("Particle palette is full")
+            self.palette.append(color)
+        return self.palette.index(color)
+
+    def emit(self, count, x, y, color, speed=(0.0, 0.0), spread=(1.0, 1.0), life=(30, 60),
+             size=(1, 2), gravity=0.0, drift=0.0, area=(0.0, 0.0)):
+        """Start up to count particles around (x, y) and return how many started.
+
+        Velocities are speed plus a uniform jitter of +-spread, starting points
+        are spread uniformly over an area of the given width and height, and
+        lifetimes (ticks) and sizes are drawn from the inclusive ranges given.
+        When the system is full the rest are dropped."""
+        started = min(count, self.free_count)
+        self.dropped += count - started
+        if started <= 0:
+            return 0
+        slots = self.free[self.free_count - started:self.free_count]
+        self.free_count -= started
+
+        rng = self.rng
+        self.x[slots] = x + rng.uniform(-area[0] / 2, area[0] / 2, started)
+        self.y[slots] = y + rng.uniform(-area[1] / 2, area[1] / 2, started)
+        self.vx[slots] = speed[0] + rng.uniform(-spread[0], spread[0], started)
+        self.vy[slots] = speed[1] + rng.uniform(-spread[1], spread[1], started)
+        self.life[slots] = rng.integers(life[0], life[1] + 1, started)
+        self.size[slots] = rng.integers(size[0], min(size[1], MAX_SIZE) + 1, started)
+        self.gravity[slots] = gravity
+        self.drift[slots] = drift
+        self.color[slots] = self.color_index(color)
+        self.alive[slots] = True
+        self.high = max(self.high, int(slots.max()) + 1)
+        return started
+
+    def update(self, wind=0.0, left=0, right=SCREEN_WIDTH, floor=GROUND_Y):
+        """Advance every particle one tick in the given wind, recycling the ones
+        that ran out of life or left the area between left, right and floor.
+        Returns the number of particles still alive."""
+        # Slots past the high-water mark have never been used, so skip them
+        n = self.high
+        if n == 0:
+            return 0
+        x, y, vx, vy = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n]
+        life = self.life[:n]
+        self.wind = np.float32(wind)
+        vy += self.gravity[:n]
+        x += vx
+        x += self.drift[:n] * self.wind
+        y += vy
+        life -= 1
+
+        dead, mask = self._dead[:n], self._mask[:n]
+        np.less_equal(life, 0, out=dead)
+        np.less(x, left - MARGIN, out=mask)
+        dead |= mask
+        np.greater(x, right + MARGIN, out=mask)
+        dead |= mask
+        np.greater_equal(y, floor, out=mask)
+        dead |= mask
+        dead &= self.alive[:n]
+        if dead.any():
+            slots = np.flatnonzero(dead).astype(np.int32)
+            self.alive[slots] = False
+            self.free[self.free_count:self.free_count + len(slots)] = slots
+            self.free_count += len(slots)
+            if self.free_count == self.capacity:
+                self.clear()
+        return len(self)
+
+    def clear(self, seed=None):
+        """Kill every particle, restarting the random stream from seed if given"""
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.alive[:] = False
+        # Hand out low slots first so live particles stay packed below self.high
+        self.free[:] = np.arange(self.capacity - 1, -1, -1, dtype=np.int32)
+        self.free_count = self.capacity
+        self.high = 0
+
+    def screen_positions(self, alpha=1.0, offset_x=0, scale=1):
+        """Integer screen positions and slots of the live particles, drawn alpha
+        of the way into the current tick on a view scale times the screen size"""
+        slots = np.flatnonzero(self.alive[:self.high])
+        behind = np.float32(1.0 - alpha)
+        step_x = self.vx[slots] + self.drift[slots] * self.wind
+        xs = ((self.x[slots] - step_x * behind - offset_x) * scale).astype(np.intp)
+        ys = ((self.y[slots] - self.vy[slots] * behind) * scale).astype(np.intp)
+        return slots, xs, ys
+
+    def draw(self, surface, alpha=1.0, offset_x=0, scale=1):
+        """Write every live particle into surface as a filled square. A surface
+        smaller than the screen gets positions scaled by scale and keeps the
+        squares' sizes. Returns the number of particles drawn."""
+        if self.free_count == self.capacity:
+            self.drawn_x = self.drawn_y = None
+            return 0
+
+        slots, xs, ys = self.screen_positions(alpha, offset_x, scale)
+        width, height = surface.get_size()
+        colors = np.array([surface.map_rgb(color) for color in self.palette], dtype=np.int64)
+
+        # One row per particle, one column per pixel of the largest square;
+        # columns beyond a particle's own size or off the surface are masked out
+        px = xs[:, None] + _OFFSET_X
+        py = ys[:, None] + _OFFSET_Y
+        keep = _OFFSET_MAX < self.size[slots][:, None]
+        keep &= (px >= 0) & (px < width) & (py >= 0) & (py < height)
+        px = px[keep]
+        py = py[keep]
+        values = np.broadcast_to(colors[self.color[slots]][:, None], keep.shape)[keep]
+
+        pixels = pygame.surfarray.pixels2d(surface)
+        try:
+            pixels[px, py] = values
+        finally:
+            del pixels
+        # Kept for tile_rects()
+        self.drawn_x = px
+        self.drawn_y = py
+        return len(slots)
+
+    def tile_rects(self, tile=32):
+        """Rects of the tile x tile screen cells touched by the last draw(), for
+        dirty-rectangle rendering"""
+        if self.drawn_x is None or not len(self.drawn_x):
+            return []
+        columns = SCREEN_WIDTH // tile + 1
+        cells = np.unique((self.drawn_y // tile) * columns + self.drawn_x // tile)
+        return [pygame.Rect(col * tile, row * tile, tile, tile)
+                for row, col in (divmod(key, columns) for key in cells.tolist())]
+
+    def stats(self):
+        return {"alive": len(self), "capacity": self.capacity, "dropped": self.dropped}
+
+
+def benchmark(counts, ticks, seed):
+    from simulation import Cloud
+
+    print(f"{'particles':>10} {'Cloud.update/ms':>16} {'arrays/ms':>12} {'speedup':>8} {'tick ms':>8}")
+    for count in counts:
+        rng = random.Random(seed)
+        clouds = [Cloud(rng) for _ in range(count)]
+        start = time.perf_counter()
+        for _ in range(ticks):
+            for cloud in clouds:
+                cloud.save_position()
+                cloud.update()
+        object_time = time.perf_counter() - start
+
+        # Long lives and no walls keep every particle alive for the whole run
+        particles = ParticleSystem(count, seed)
+        particles.emit(count, SCREEN_WIDTH / 2, 125, (255, 255, 255), speed=(0.6, 0.0), spread=(0.4, 0.0),
+                       life=(ticks + 1, ticks + 1), drift=0.5, area=(SCREEN_WIDTH, 150))
+        start = time.perf_counter()
+        for tick in range(ticks):
+            particles.update(0.5, -1e9, 1e9)
+        array_time = time.perf_counter() - start
+        if len(particles) != count:
+            raise SystemExit(f"Particles died during the benchmark ({len(particles)} of {count} alive)")
+
+        object_rate = count * ticks / (object_time * 1000)
+        array_rate = count * ticks / (array_time * 1000)
+        print(f"{count:>10} {object_rate:>16.0f} {array_rate:>12.0f} {array_rate / object_rate:>7.1f}x "
+              f"{array_time * 1000 / ticks:>8.3f}")
+
+
+def benchmark_draw(counts, frames, seed):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    print(f"{'particles':>10} {'draw ms':>8} {'particles/ms':>13}")
+    for count in counts:
+        particles = ParticleSystem(count, seed)
+        particles.emit(count, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, (255, 255, 255), size=(1, MAX_SIZE),
+                       area=(SCREEN_WIDTH, SCREEN_HEIGHT))
+        start = time.perf_counter()
+        for _ in range(frames):
+            particles.draw(screen, 0.5)
+        elapsed = (time.perf_counter() - start) / frames
+        print(f"{count:>10} {elapsed * 1000:>8.3f} {count / (elapsed * 1000):>13.0f}")
+    pygame.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the particle system against per-object updates")
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 5000, 20000],
+                        help="particle counts to benchmark")
+    parser.add_argument("--ticks", type=int, default=300, help="ticks to update per count")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--draw", action="store_true", help="also time batched drawing headless")
+    args = parser.parse_args(argv)
+    benchmark(args.counts, args.ticks, args.seed)
+    if args.draw:
+        print()
+        benchmark_draw(args.counts, 100, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""
+Ideal-line planner and difficulty grading for parachute layouts.
+
+A freshly reset Simulation already fixes everything the player does not
+control. The jump tick and position come from the plane. The wind for every
+tick comes from the gameplay random stream, which nothing but the wind timer
+draws from after the layout is built. The vertical fall depends only on the
+tick the parachute opens. What is left to search is the horizontal steering:
+left, right or nothing on each tick, over the Player.move rules.
+
+For each candidate deploy tick the planner sweeps forward one tick at a time
+over the set of reachable (x, speed_x) states. Every state is expanded with
+the three inputs at once in NumPy, states that hit an obstacle are dropped,
+and the survivors are merged per 2 px column of x: only the slowest and the
+fastest state in each column are kept, since the speeds between them can be
+reached from one or the other. On the last tick only x matters, so one state
+per column is kept. That is dynamic programming over a discretized x, but
+the kept states are never rounded, so the best landing found is an exact
+input sequence that replays bit for bit in Simulation.step(). Fall profiles
+and per-height obstacle masks depend only on the deploy tick and the layout,
+so they are memoized across candidates.
+
+Deploy ticks are tried earliest first, which has the largest height bonus
+and the most time to steer. The search stops once the best score found
+reaches the upper bound of every later deploy tick.
+
+The reachable landings also grade the layout. The landing columns of every
+deploy tick searched are pooled, and the share of them inside a safe zone
+sets the difficulty. The chosen plan's own landing is among them, so a plan
+that lands safely always earns a grade.
+
+    python3 planner.py --layouts 1000 --verify     # nightly batch with replay checks
+    python3 planner.py --seed 42 --layouts 1 --show
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from batch_sim import JUMP_TICK, JUMP_X, JUMP_Y, PLAYER_HEIGHT, PLAYER_WIDTH, from_simulations, score_landings
+from simulation import GROUND_Y, SCREEN_WIDTH, NO_INPUT, Inputs, Simulation
+
+X_MAX = SCREEN_WIDTH - PLAYER_WIDTH
+
+# Width in pixels of the x cells that states are merged in
+X_STEP = 2.0
+
+# Inputs of the three steering actions, without and with the parachute opening
+ACTIONS = (Inputs(False, False, False), Inputs(True, False, False), Inputs(False, True, False))
+DEPLOY_ACTIONS = tuple(inputs._replace(deploy=True) for inputs in ACTIONS)
+
+# Share of reachable landing columns inside a safe zone for each grade, best first
+GRADES = (("easy", 0.6), ("medium", 0.4), ("hard", 0.0))
+
+
+class FallProfile:
+    """Vertical motion after the jump for one deploy tick, which steering never changes"""
+    __slots__ = ("deploy_tick", "deploy_height", "ys", "landing_speed")
+
+    def __init__(self, deploy_tick):
+        self.deploy_tick = deploy_tick
+        self.deploy_height = None
+        self.ys = []
+        # Same steps as Player.deploy_parachute() and Player.move()
+        y, speed_y, gravity, max_speed = JUMP_Y, 1, 0.2, 7
+        tick = JUMP_TICK
+        while True:
+            if tick == deploy_tick:
+                self.deploy_height = y
+                gravity, max_speed = 0.05, 2
+            speed_y = min(max_speed, speed_y + gravity)
+            y += speed_y
+            self.ys.append(y)
+            if y + PLAYER_HEIGHT >= GROUND_Y:
+                break
+            tick += 1
+        self.landing_speed = speed_y
+
+    @property
+    def landing_tick(self):
+        return JUMP_TICK + len(self.ys) - 1
+
+    @property
+    def survivable(self):
+        return self.deploy_height is not None and self.landing_speed <= 3
+
+
+_profiles = {}
+
+
+def fall_profile(deploy_tick):
+    profile = _profiles.get(deploy_tick)
+    if profile is None:
+        profile = _profiles[deploy_tick] = FallProfile(deploy_tick)
+    return profile
+
+
+class Plan:
+    """Best descent found for one layout"""
+    __slots__ = ("seed", "inputs", "deploy_tick", "score", "alive", "safe_zone", "landing_x", "path",
+                 "difficulty", "grade", "reachable_columns", "safe_columns", "candidates", "states",
+                 "verified", "elapsed")
+
+    def as_dict(self):
+        return {
+            "seed": self.seed,
+            "score": self.score,
+            "safe_zone": self.safe_zone,
+            "deploy_tick": self.deploy_tick,
+            "landing_x": round(self.landing_x, 2) if self.landing_x is not None else None,
+            "ticks": len(self.inputs),
+            "difficulty": round(self.difficulty, 3),
+            "grade": self.grade,
+            "reachable_columns": self.reachable_columns,
+            "safe_columns": self.safe_columns,
+            "candidates": self.candidates,
+            "states": self.states,
+            "verified": self.verified,
+            "ms": round(self.elapsed * 1000, 2),
+        }
+
+
+class Planner:
+    def __init__(self, sim):
+        """Plan the layout of sim, which must be freshly reset (tick 0)"""
+        if sim.tick != 0:
+            raise ValueError("Planner needs a simulation straight after reset()")
+        self.seed = sim.seed
+        layouts, wind = from_simulations([sim])
+        self.layouts = layouts
+        self.obstacles = [(obstacle.x, obstacle.y, obstacle.width) for obstacle in sim.obstacles]
+        self.highest = min((obstacle.y for obstacle in sim.obstacles), default=GROUND_Y)
+        self.wind = self.wind_by_tick(wind["timers"][0], wind["directions"][0])
+        self._blocked = {}
+        self._layout_rows = {}
+        self.states = 0
+
+    @staticmethod
+    def wind_by_tick(timers, directions):
+        """Wind direction in effect during each tick, as update_wind() sets it"""
+        wind = [0.0]
+        tick = 1
+        for timer, direction in zip(timers.tolist(), directions.tolist()):
+            end = tick + timer
+            wind.extend([direction] * (end - tick))
+            tick = end
+        return wind
+
+    def blocked(self, y):
+        """Columns int(x) where a player at height y overlaps an obstacle, or
+        None while the player is above them all"""
+        top = int(y) + PLAYER_HEIGHT
+        if top <= self.highest:
+            return None
+        mask = self._blocked.get(top)
+        if mask is None:
+            mask = np.zeros(X_MAX + 1, dtype=bool)
+            for ox, oy, width in self.obstacles:
+                if oy < top:
+                    mask[max(0, ox - PLAYER_WIDTH + 1):max(0, ox + width)] = True
+            self._blocked[top] = mask
+        return mask
+
+    def layout_rows(self, n):
+        """The layout repeated n times, for scoring many landings at once"""
+        rows = self._layout_rows.get(n)
+        if rows is None:
+            pick = np.zeros(n, dtype=np.intp)
+            rows = self._layout_rows[n] = {key: value[pick] for key, value in self.layouts.items()}
+        return rows
+
+    def score(self, x, deploy_height):
+        """Simulation.compute_score() for landings at each x, and whether each is in a safe zone"""
+        n = len(x)
+        return score_landings(self.layout_rows(n), x, np.full(n, float(deploy_height)), np.ones(n, dtype=bool))
+
+    def upper_bound(self):
+        """Best landing score anywhere clear of the obstacles, before the height bonus"""
+        x = np.arange(X_MAX + 1, dtype=float)
+        landing = self.blocked(GROUND_Y - PLAYER_HEIGHT)
+        if landing is not None:
+            x = x[~landing]
+        scores, _ = self.score(x, 200)
+        # Scores between whole pixels can be at most one point higher
+        return float(scores.max()) + 1
+
+    def search(self, profile):
+        """Sweep the reachable states of one fall profile. Returns the final
+        x positions and, per tick, each state's parent and action."""
+        x = np.array([float(JUMP_X)])
+        speed = np.zeros(1)
+        parents = []
+        actions = []
+        last = len(profile.ys) - 1
+        for i, y in enumerate(profile.ys):
+            tick = JUMP_TICK + i
+            n = len(x)
+            # Player.move() for the three inputs; the select is a sum with one
+            # non-zero term, as in batch_sim, so it stays bit-exact
+            slowed = np.maximum(speed - 0.1, 0.0)
+            slowed += np.minimum(speed + 0.1, 0.0)
+            new_speed = np.concatenate((slowed, np.maximum(speed - 0.2, -3.0), np.minimum(speed + 0.2, 3.0)))
+            if tick >= profile.deploy_tick:
+                new_speed += self.wind[tick] * 0.1
+            new_x = np.tile(x, 3)
+            new_x += new_speed
+
+            # keep_in_bounds()
+            out = (new_x < 0.0) | (new_x > X_MAX)
+            if out.any():
+                np.clip(new_x, 0.0, X_MAX, out=new_x)
+                new_speed[out] = 0.0
+
+            # Drop everything that hit an obstacle this tick
+            blocked = self.blocked(y)
+            if blocked is None:
+                keep = None
+                kept_x, kept_speed = new_x, new_speed
+            else:
+                keep = np.flatnonzero(~blocked[new_x.astype(np.intp)])
+                kept_x, kept_speed = new_x[keep], new_speed[keep]
+
+            cell = (kept_x / X_STEP).astype(np.int64)
+            if i < last:
+                # Keep the slowest and the fastest state of every x cell: any
+                # speed between them can be reached from one or the other
+                order = np.argsort(cell * 8.0 + (kept_speed + 4.0), kind="stable")
+                cell = cell[order]
+                edge = np.flatnonzero(cell[1:] != cell[:-1])
+                ends = np.empty(2 * len(edge) + 2, dtype=np.intp)
+                ends[0] = 0
+                ends[1:-1:2] = edge
+                ends[2:-1:2] = edge + 1
+                ends[-1] = len(cell) - 1
+                # A cell holding a single state is both its first and its last
+                chosen = order[ends[np.concatenate(([True], ends[1:] != ends[:-1]))]]
+            else:
+                # Only x matters once on the ground
+                _, chosen = np.unique(cell, return_index=True)
+            if keep is not None:
+                chosen = keep[chosen]
+
+            parents.append(chosen % n)
+            actions.append(chosen // n)
+            x = new_x[chosen]
+            speed = new_speed[chosen]
+            self.states += len(x)
+            if not len(x):
+                break
+        return x, parents, actions
+
+    def inputs_for(self, profile, parents, actions, index):
+        """Input sequence from tick 1 that leads to final state index"""
+        steps = []
+        for parent, action in zip(reversed(parents), reversed(actions)):
+            steps.append(int(action[index]))
+            index = parent[index]
+        steps.reverse()
+        inputs = [NO_INPUT] * (JUMP_TICK - 1)
+        for i, action in enumerate(steps):
+            inputs.append(DEPLOY_ACTIONS[action] if JUMP_TICK + i == profile.deploy_tick else ACTIONS[action])
+        return inputs
+
+    def plan(self):
+        start = time.perf_counter()
+        plan = Plan()
+        plan.seed = self.seed
+        plan.inputs = []
+        plan.deploy_tick = None
+        plan.score = 0
+        plan.alive = False
+        plan.safe_zone = False
+        plan.landing_x = None
+        plan.path = []
+        plan.candidates = 0
+        plan.reachable_columns = 0
+        plan.safe_columns = 0
+
+        bound = self.upper_bound()
+        best = None
+        # Landing columns reached, and those inside a safe zone, over every deploy tick searched
+        reached = []
+        reached_safe = []
+        freefall = fall_profile(None)
+        for deploy_tick in range(JUMP_TICK, freefall.landing_tick + 1):
+            profile = fall_profile(deploy_tick)
+            if not profile.survivable:
+                continue
+            bonus = max(0, 200 - profile.deploy_height)
+            if best is not None and best[0] >= bound + bonus:
+                # Later deploys only open lower, so none of them can do better
+                break
+            plan.candidates += 1
+            x, parents, actions = self.search(profile)
+            if not len(x):
+                continue
+            scores, safe = self.score(x, profile.deploy_height)
+            columns = x.astype(np.int64)
+            reached.append(columns)
+            reached_safe.append(columns[safe])
+            index = int(scores.argmax())
+            if best is None or scores[index] > best[0]:
+                best = (float(scores[index]), profile, parents, actions, index)
+
+        if reached:
+            plan.reachable_columns = len(np.unique(np.concatenate(reached)))
+            plan.safe_columns = len(np.unique(np.concatenate(reached_safe)))
+        share = plan.safe_columns / plan.reachable_columns if plan.reachable_columns else 0.0
+        plan.difficulty = 1.0 - share
+        plan.grade = next((name for name, low in GRADES if share > low), "no-safe-zone")
+        expected = 0
+        if best is not None:
+            expected, profile, parents, actions, index = best
+            plan.deploy_tick = profile.deploy_tick
+            plan.inputs = self.inputs_for(profile, parents, actions, index)
+        self.replay(plan, expected)
+        plan.states = self.states
+        plan.elapsed = time.perf_counter() - start
+        return plan
+
+    def replay(self, plan, expected):
+        """Run the plan through the real rules to fill in its ghost path and score,
+        and check that they agree with the search"""
+        sim = Simulation(self.seed)
+        for inputs in plan.inputs:
+            sim.step(inputs)
+            if sim.jumping:
+                plan.path.append((sim.player.x, sim.player.y))
+        plan.score = sim.score
+        plan.verified = sim.game_over and sim.score == expected
+        plan.alive = sim.player.alive and sim.game_over
+        plan.safe_zone = plan.alive and sim.in_safe_zone()
+        plan.landing_x = sim.player.x if sim.game_over else None
+
+
+def plan_layout(sim):
+    """Best descent and difficulty grade for a freshly reset simulation"""
+    return Planner(sim).plan()
+
+
+def plan_seed(seed):
+    return plan_layout(Simulation(seed)).as_dict()
+
+
+def plan_seeds(seeds, workers=None):
+    """Plan many layouts, spreading them over a process pool"""
+    if workers == 1 or len(seeds) < 2:
+        return [plan_seed(seed) for seed in seeds]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(plan_seed, seeds, chunksize=max(1, len(seeds) // 64)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plan ideal descents and grade layouts")
+    parser.add_argument("--seed", type=int, default=0, help="first layout seed")
+    parser.add_argument("--layouts", type=int, default=100, help="number of consecutive seeds to plan")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes (0 for one per CPU)")
+    parser.add_argument("--out", metavar="PATH", help="write one JSON line per layout")
+    parser.add_argument("--verify", action="store_true",
+                        help="fail unless every plan replays to the score the search predicted")
+    parser.add_argument("--show", action="store_true", help="print every plan")
+    args = parser.parse_args(argv)
+
+    seeds = list(range(args.seed, args.seed + args.layouts))
+    start = time.perf_counter()
+    results = plan_seeds(seeds, args.workers or None)
+    elapsed = time.perf_counter() - start
+
+    if args.out:
+        with open(args.out, "w") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+    if args.show:
+        for result in results:
+            print(json.dumps(result))
+
+    times = np.array([result["ms"] for result in results])
+    grades = {}
+    for result in results:
+        grades[result["grade"]] = grades.get(result["grade"], 0) + 1
+    unverified = [result["seed"] for result in results if not result["verified"]]
+    safe = sum(result["safe_zone"] for result in results)
+    print(f"{len(results)} layouts in {elapsed:.2f}s: {np.mean(times):.1f} ms mean, "
+          f"{np.percentile(times, 99):.1f} ms p99, {times.max():.1f} ms max per layout")
+    print(f"Safe zone reached in {safe}/{len(results)}, mean score "
+          f"{np.mean([result['score'] for result in results]):.1f}")
+    print("Grades: " + ", ".join(f"{name} {grades.get(name, 0)}"
+                                 for name in [g[0] for g in GRADES] + ["no-safe-zone"]))
+    if unverified:
+        print(f"{len(unverified)} plans did not replay to the predicted score, e.g. seeds {unverified[:5]}")
+    return 1 if args.verify and unverified else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""
+Lightweight frame profiler for the parachute game.
+
+Code marks the phases of a frame with named scopes:
+
+    with profiler.scope("draw/clouds"):
+        ...
+
+While the profiler is disabled, scope() hands back one shared no-op context
+manager and the frame hooks return at once, so the instrumentation can stay
+in production builds. When enabled, each frame's scope times are kept in a
+short history for the overlay (frame-time percentiles and the slowest scope).
+They can also be streamed to a CSV or JSON file for offline analysis.
+"""
+
+import csv
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+
+_NULL_SCOPE = nullcontext()
+
+# Overlay numbers are recomputed this often, so the text cache is not flooded
+OVERLAY_REFRESH_FRAMES = 30
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        times = self.profiler.frame_scopes
+        times[self.name] = times.get(self.name, 0.0) + elapsed
+        return False
+
+
+class Profiler:
+    def __init__(self, enabled=False, history=300, idle_scopes=("tick",)):
+        self.enabled = enabled
+        # Scopes that only wait, such as frame pacing, never count as the slowest
+        self.idle_scopes = set(idle_scopes)
+        self.show_overlay = False
+        self.history = deque(maxlen=history)
+        self.frame_scopes = {}
+        self.frame_start = 0.0
+        self.frame_index = 0
+        self.scopes = {}
+        self.export_file = None
+        self.export_writer = None
+        self.export_format = None
+        self.exported_frames = 0
+        self.overlay_lines = []
+
+    def scope(self, name):
+        """Context manager timing the enclosed block under name"""
+        if not self.enabled:
+            return _NULL_SCOPE
+        scope = self.scopes.get(name)
+        if scope is None:
+            scope = self.scopes[name] = _Scope(self, name)
+        return scope
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.frame_scopes = {}
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Close the current frame and record its scope times"""
+        if not self.enabled or not self.frame_start:
+            return
+        frame_time = time.perf_counter() - self.frame_start
+        self.history.append((frame_time, self.frame_scopes))
+        if self.export_file is not None:
+            self._export_frame(frame_time, self.frame_scopes)
+        self.frame_index += 1
+        self.frame_start = 0.0
+
+    def toggle_overlay(self):
+        """Show or hide the overlay, profiling only while something needs the numbers"""
+        self.show_overlay = not self.show_overlay
+        self.enabled = self.show_overlay or self.export_file is not None
+        self.history.clear()
+        self.frame_scopes = {}
+        self.overlay_lines = []
+
+    def stats(self):
+        """Frame-time percentiles and mean scope times over the recent history, in ms"""
+        if not self.history:
+            return None
+        frame_times = sorted(frame_time for frame_time, _ in self.history)
+        totals = {}
+        for _, scopes in self.history:
+            for name, elapsed in scopes.items():
+                totals[name] = totals.get(name, 0.0) + elapsed
+        frames = len(self.history)
+        scope_means = {name: total * 1000 / frames for name, total in totals.items()}
+
+        # Only busy leaf scopes compete for slowest; a parent always contains its children
+        leaves = [name for name in scope_means if name not in self.idle_scopes
+                  and not any(other.startswith(name + "/") for other in scope_means)]
+        slowest = max(leaves, key=scope_means.get) if leaves else None
+
+        def percentile(pct):
+            return frame_times[min(frames - 1, int(pct / 100 * frames))] * 1000
+
+        return {
+            "frames": frames,
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "p99_ms": percentile(99),
+            "max_ms": frame_times[-1] * 1000,
+            "scopes_ms": scope_means,
+            "slowest": slowest,
+        }
+
+    def draw_overlay(self, surface, text_renderer, color=(0, 0, 0)):
+        """Draw the overlay in the top right corner. Returns the rects drawn."""
+        if not self.show_overlay:
+            return []
+        if not self.overlay_lines or self.frame_index % OVERLAY_REFRESH_FRAMES == 0:
+            self.overlay_lines = self._overlay_lines()
+
+        rects = []
+        y = 10
+        for line in self.overlay_lines:
+            text = text_renderer.render(line, 20, color)
+            rects.append(surface.blit(text, (surface.get_width() - text.get_width() - 10, y)))
+            y += text.get_height()
+        return rects
+
+    def _overlay_lines(self):
+        stats = self.stats()
+        if stats is None:
+            return ["Profiler: collecting..."]
+        lines = [
+            f"frame p50 {stats['p50_ms']:.2f}  p95 {stats['p95_ms']:.2f}  p99 {stats['p99_ms']:.2f} ms",
+        ]
+        if stats["slowest"] is not None:
+            lines.append(f"slowest: {stats['slowest']} {stats['scopes_ms'][stats['slowest']]:.2f} ms")
+        for name, mean in sorted(stats["scopes_ms"].items()):
+            if "/" not in name:
+                lines.append(f"{name} {mean:.2f} ms")
+        return lines
+
+    def start_export(self, path):
+        """Stream every profiled frame to path, as JSON if it ends in .json and CSV otherwise"""
+        self.close()
+        self.export_file = open(path, "w", newline="")
+        self.exported_frames = 0
+        if path.endswith(".json"):
+            self.export_format = "json"
+            self.export_file.write("[\n")
+        else:
+            self.export_format = "csv"
+            self.export_writer = csv.writer(self.export_file)
+            self.export_writer.writerow(["frame", "scope", "ms"])
+        self.enabled = True
+
+    def _export_frame(self, frame_time, scopes):
+        if self.export_format == "json":
+            record = {"frame": self.frame_index, "frame_ms": round(frame_time * 1000, 4),
+                      "scopes": {name: round(elapsed * 1000, 4) for name, elapsed in scopes.items()}}
+            if self.exported_frames:
+                self.export_file.write(",\n")
+            self.export_file.write(json.dumps(record))
+        else:
+            rows = [(self.frame_index, "frame", round(frame_time * 1000, 4))]
+            rows.extend((self.frame_index, name, round(elapsed * 1000, 4)) for name, elapsed in scopes.items())
+            self.export_writer.writerows(rows)
+        self.exported_frames += 1
+
+    def close(self):
+        """Finish and close the export file, if any"""
+        if self.export_file is None:
+            return
+        if self.export_format == "json":
+            self.export_file.write("\n]\n")
+        self.export_file.close()
+        self.export_file = None
+        self.export_writer = None
+        self.export_format = None
+        self.enabled = self.show_overlay
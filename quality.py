@@ -0,0 +1,142 @@
+"""
+Adaptive rendering quality for the parachute game.
+
+The main loop reports how long each frame's work took: events, update, draw
+and flip, but not the sleep in clock.tick(). QualityController keeps a
+rolling window of those times. When their mean blows the frame budget, it
+steps down one level. Each level keeps the savings of the ones before it:
+
+    full           everything drawn
+    fewer-clouds   every other cloud is drawn
+    flat-zones     no translucent landing-zone surfaces, only their markings
+    simple-player  the player is a plain body and canopy
+    low-res        the frame is drawn at half resolution, and pygame.SCALED scales it up
+    half-rate      every other frame is drawn, while the simulation keeps ticking
+
+Once frames have had plenty of headroom for a while, it steps back up. A
+level that had to be dropped again soon after stepping up waits longer
+before the next attempt, so a machine on the edge settles instead of
+flickering between two levels. Only what is drawn changes. The simulation,
+scores and replays are the same at every level.
+"""
+
+from collections import deque
+
+LEVELS = ("full", "fewer-clouds", "flat-zones", "simple-player", "low-res", "half-rate")
+FULL, FEWER_CLOUDS, FLAT_ZONES, SIMPLE_PLAYER, LOW_RES, HALF_RATE = range(len(LEVELS))
+
+# Frames averaged before deciding, and the mean, as a share of the budget,
+# above which quality drops and below which it may rise again
+WINDOW_FRAMES = 60
+DOWN_LOAD = 1.0
+UP_LOAD = 0.6
+
+# Frames with headroom needed before stepping up, and its limit once a step
+# up has been undone over and over
+UP_FRAMES = 180
+MAX_UP_FRAMES = 60 * 60
+
+
+class QualityController:
+    def __init__(self, budget, adaptive=True, level=FULL):
+        self.budget = budget
+        self.adaptive = adaptive
+        self.level = level
+        self.disabled = set()
+        self.times = deque(maxlen=WINDOW_FRAMES)
+        self.total = 0.0
+        self.load = 0.0
+        self.calm_frames = 0
+        self.up_frames = UP_FRAMES
+        self.frames_at_level = 0
+        self.raised = False
+        self.frame = 0
+        self.changes = 0
+
+    @property
+    def name(self):
+        return LEVELS[self.level]
+
+    def active(self, stage):
+        """Whether the saving of stage is in effect"""
+        return self.level >= stage and stage not in self.disabled
+
+    @property
+    def cloud_step(self):
+        return 2 if self.active(FEWER_CLOUDS) else 1
+
+    @property
+    def zone_alpha(self):
+        return not self.active(FLAT_ZONES)
+
+    @property
+    def simple_player(self):
+        return self.active(SIMPLE_PLAYER)
+
+    @property
+    def low_res(self):
+        return self.active(LOW_RES)
+
+    def skip_frame(self):
+        """Whether to leave this frame undrawn"""
+        self.frame += 1
+        return self.active(HALF_RATE) and self.frame % 2 == 0
+
+    def disable(self, stage):
+        """Skip a stage this machine cannot do, such as a display without SCALED"""
+        self.disabled.add(stage)
+        if self.adaptive and self.level == stage:
+            self.set_level(self._next(1))
+
+    def set_level(self, level):
+        """Switch to level and start measuring afresh"""
+        self.raised = level < self.level
+        self.level = level
+        self.times.clear()
+        self.total = 0.0
+        self.calm_frames = 0
+        self.frames_at_level = 0
+        self.changes += 1
+
+    def _next(self, step):
+        """The nearest level step away that is not disabled, or None past either end"""
+        level = self.level + step
+        while 0 <= level < len(LEVELS) and level in self.disabled:
+            level += step
+        return level if 0 <= level < len(LEVELS) else None
+
+    def end_frame(self, seconds):
+        """Record one frame's work time. Returns the new level if it changed, else None."""
+        if len(self.times) == self.times.maxlen:
+            self.total -= self.times[0]
+        self.times.append(seconds)
+        self.total += seconds
+        self.frames_at_level += 1
+        if not self.adaptive or len(self.times) < self.times.maxlen:
+            return None
+
+        load = self.load = self.total / len(self.times) / self.budget
+        if load > DOWN_LOAD:
+            level = self._next(1)
+            if level is None:
+                return None
+            # Stepping up did not hold, so wait longer before trying again
+            if self.raised and self.frames_at_level < 2 * WINDOW_FRAMES:
+                self.up_frames = min(self.up_frames * 2, MAX_UP_FRAMES)
+            self.set_level(level)
+            return level
+
+        if load < UP_LOAD and self.level > FULL:
+            self.calm_frames += 1
+            if self.calm_frames >= self.up_frames:
+                level = self._next(-1)
+                self.set_level(level)
+                return level
+        else:
+            self.calm_frames = 0
+        return None
+
+    def status(self):
+        """Status line naming the active level and the frame load last measured,
+        which is what moved it after a change"""
+        return f"Quality: {self.name} ({self.level}/{len(LEVELS) - 1}), frame load {self.load:.0%}"
@@ -0,0 +1,248 @@
+"""
+Compact replays for the parachute game.
+
+The simulation is deterministic for a given seed, so a run is fully described
+by the seed passed to Simulation.reset() and the inputs of every tick until
+the descent ended. Each tick's left, right and deploy keys are packed into a
+3-bit code, and runs of identical codes are stored as LEB128 varints of
+(length << 3 | code). A typical descent fits in well under a kilobyte.
+
+File layout (little endian):
+
+    magic    4s   b"PCRP"
+    version  H
+    seed     q
+    score    d    score reached when the run was recorded
+    ticks    I    number of recorded ticks
+    crc32    I    checksum of the run-length data
+    runs     ...  varints up to the end of the file
+
+Replays are verified by re-simulating them headless and comparing the final
+score:
+
+    python3 replay.py replays/            # verify every replay in parallel
+    python3 replay.py run.rpl --workers 1
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+import zlib
+from collections import namedtuple
+
+from simulation import Inputs, Simulation
+
+MAGIC = b"PCRP"
+VERSION = 1
+HEADER = struct.Struct("<4sHqdII")
+EXTENSION = ".rpl"
+
+Replay = namedtuple("Replay", ["seed", "score", "inputs"])
+
+# Result of re-simulating one replay
+Verification = namedtuple("Verification", ["path", "ok", "expected", "actual", "ticks", "error"])
+
+
+def pack_inputs(inputs):
+    """Pack one tick's inputs into a 3-bit code"""
+    return (1 if inputs.left else 0) | (2 if inputs.right else 0) | (4 if inputs.deploy else 0)
+
+
+def unpack_inputs(code):
+    """Inverse of pack_inputs"""
+    return Inputs(bool(code & 1), bool(code & 2), bool(code & 4))
+
+
+# Every code maps to one shared Inputs tuple, so decoding allocates nothing per tick
+_CODES = tuple(unpack_inputs(code) for code in range(8))
+
+
+def encode_runs(codes):
+    """Run-length encode a sequence of 3-bit codes as varints"""
+    out = bytearray()
+    previous = None
+    length = 0
+    for code in codes:
+        if code == previous:
+            length += 1
+            continue
+        if length:
+            _write_varint(out, (length << 3) | previous)
+        previous = code
+        length = 1
+    if length:
+        _write_varint(out, (length << 3) | previous)
+    return bytes(out)
+
+
+def decode_runs(data):
+    """Yield (code, length) pairs from run-length encoded data"""
+    value = 0
+    shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        yield value & 7, value >> 3
+        value = 0
+        shift = 0
+    if shift:
+        raise ValueError("truncated replay data")
+
+
+def _write_varint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def encode(replay):
+    """Serialize a Replay to bytes"""
+    runs = encode_runs(pack_inputs(inputs) for inputs in replay.inputs)
+    header = HEADER.pack(MAGIC, VERSION, replay.seed, replay.score, len(replay.inputs), zlib.crc32(runs))
+    return header + runs
+
+
+def decode(data):
+    """Parse bytes written by encode(). Raises ValueError on corrupt data."""
+    if len(data) < HEADER.size:
+        raise ValueError("replay is too short")
+    magic, version, seed, score, ticks, crc = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a replay file")
+    if version != VERSION:
+        raise ValueError(f"unsupported replay version {version}")
+    runs = data[HEADER.size:]
+    if zlib.crc32(runs) != crc:
+        raise ValueError("replay checksum mismatch")
+
+    inputs = []
+    for code, length in decode_runs(runs):
+        inputs.extend([_CODES[code]] * length)
+    if len(inputs) != ticks:
+        raise ValueError(f"replay has {len(inputs)} ticks, header says {ticks}")
+    return Replay(seed, score, inputs)
+
+
+def save(path, replay, overwrite=True):
+    """Write a replay atomically, so a crash never leaves a half-written file.
+    Without overwrite, raises FileExistsError if path already exists."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(encode(replay))
+    if overwrite:
+        os.replace(tmp_path, path)
+        return
+    try:
+        # Unlike a rename, a hard link never replaces an existing file
+        os.link(tmp_path, path)
+    finally:
+        os.remove(tmp_path)
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return decode(f.read())
+
+
+class Recorder:
+    """Collects the inputs of one descent for a simulation seed"""
+
+    def __init__(self):
+        self.seed = None
+        self.inputs = []
+
+    def start(self, seed):
+        self.seed = seed
+        self.inputs = []
+
+    def record(self, inputs):
+        self.inputs.append(inputs)
+
+    def truncate(self, ticks):
+        """Forget the inputs after the first ticks, after the game was rewound"""
+        del self.inputs[ticks:]
+
+    def finish(self, score):
+        return Replay(self.seed, score, self.inputs)
+
+
+def play(replay):
+    """Re-simulate a replay headless and return the finished simulation"""
+    sim = Simulation(replay.seed)
+    step = sim.step
+    for inputs in replay.inputs:
+        step(inputs)
+    return sim
+
+
+def verify_file(path):
+    """Load and re-simulate one replay, returning a Verification"""
+    try:
+        replay = load(path)
+    except (OSError, ValueError, struct.error) as e:
+        return Verification(path, False, None, None, 0, str(e))
+    sim = play(replay)
+    ok = sim.game_over and sim.score == replay.score
+    error = None if sim.game_over else "run did not finish"
+    return Verification(path, ok, replay.score, sim.score, len(replay.inputs), error)
+
+
+def replay_paths(paths):
+    """Expand directories into the replay files they contain"""
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(EXTENSION):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def verify_all(paths, workers=None):
+    """Verify many replays, spreading them over a process pool"""
+    paths = list(replay_paths(paths))
+    if workers == 1 or len(paths) < 2:
+        return [verify_file(path) for path in paths]
+    # Imported here so the game, which only records, does not load multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(verify_file, paths, chunksize=max(1, len(paths) // 64)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify parachute game replays by re-simulating them")
+    parser.add_argument("paths", nargs="+", help="replay files or directories of replays")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--quiet", action="store_true", help="only report failures")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = verify_all(args.paths, args.workers)
+    elapsed = time.perf_counter() - start
+
+    failures = 0
+    ticks = 0
+    for result in results:
+        ticks += result.ticks
+        if result.ok:
+            if not args.quiet:
+                print(f"ok    {result.path}: score {result.actual}")
+        else:
+            failures += 1
+            reason = result.error or f"expected {result.expected}, got {result.actual}"
+            print(f"FAIL  {result.path}: {reason}")
+
+    rate = ticks / elapsed if elapsed > 0 else 0.0
+    print(f"{len(results) - failures}/{len(results)} replays verified in {elapsed:.2f}s "
+          f"({ticks} ticks, {rate:,.0f} ticks/s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
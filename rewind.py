@@ -0,0 +1,182 @@
+"""
+Rewind buffer for the parachute game.
+
+Simulation.pack_state() packs one tick of mutable state (player, plane,
+clouds, wind and timers) into a few hundred bytes. The layout is rebuilt
+from the seed, and the random streams are shared by reference, so they are
+never copied. SnapshotRing keeps the last few seconds of ticks in one
+preallocated bytearray. Pushing a tick writes into the next slot with
+struct.pack_into, with no allocation and no deep copies in the frame loop.
+
+The game pushes every tick of a descent and rewinds a couple of seconds
+when Backspace is pressed. Tools can take a Snapshot from the ring (or from
+Simulation.snapshot()) and re-simulate from the middle of a run instead of
+replaying from tick 0.
+
+    python3 rewind.py --verify
+
+checks that restoring and stepping on reproduces the original runs exactly,
+and reports what a snapshot costs.
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from simulation import TICK_RATE, Inputs, Simulation, Snapshot, state_struct
+
+
+class SnapshotRing:
+    def __init__(self, capacity=10 * TICK_RATE):
+        self.capacity = capacity
+        self.buffer = None
+        self.size = 0
+        self.seeds = [None] * capacity
+        self.rng_states = [None] * capacity
+        self.cloud_rng_states = [None] * capacity
+        # Slot the next push goes to, and how many slots hold ticks
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def push(self, sim):
+        """Store the simulation's current tick, overwriting the oldest when full"""
+        if self.buffer is None:
+            self.size = state_struct(len(sim.clouds)).size
+            self.buffer = bytearray(self.size * self.capacity)
+        slot = self.head
+        sim.pack_state(self.buffer, slot * self.size)
+        self.seeds[slot] = sim.seed
+        self.rng_states[slot], self.cloud_rng_states[slot] = sim.random_states()
+        self.head = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def _slot(self, age):
+        if not 0 <= age < self.count:
+            raise IndexError(f"No tick {age} back in a ring of {self.count}")
+        return (self.head - 1 - age) % self.capacity
+
+    def snapshot(self, age=0):
+        """Snapshot of the tick age ticks before the newest one"""
+        slot = self._slot(age)
+        start = slot * self.size
+        return Snapshot(self.seeds[slot], bytes(self.buffer[start:start + self.size]),
+                        self.rng_states[slot], self.cloud_rng_states[slot])
+
+    def rewind(self, sim, ticks):
+        """Restore sim to the tick ticks back, dropping everything newer, and
+        return how many ticks it went back. The oldest tick is always kept."""
+        if not self.count:
+            return 0
+        ticks = max(0, min(ticks, self.count - 1))
+        self.count -= ticks
+        self.head = (self.head - ticks) % self.capacity
+        slot = self._slot(0)
+        sim.restore_state(self.seeds[slot], self.buffer, slot * self.size,
+                          self.rng_states[slot], self.cloud_rng_states[slot])
+        return ticks
+
+
+def random_policy(rng):
+    """Inputs that hold each random choice for a while, like a player would"""
+    state = {"inputs": Inputs(False, False, False), "left": 0}
+
+    def policy(sim):
+        if state["left"] <= 0:
+            state["inputs"] = Inputs(rng.random() < 0.3, rng.random() < 0.3, rng.random() < 0.02)
+            state["left"] = rng.randint(5, 40)
+        state["left"] -= 1
+        return state["inputs"]
+    return policy
+
+
+def verify(runs, seed):
+    """Rewind every run part way and check that stepping on reproduces it"""
+    rng = random.Random(seed)
+    failures = 0
+    for run in range(runs):
+        sim = Simulation(rng.getrandbits(32))
+        policy = random_policy(random.Random(run))
+        ring = SnapshotRing()
+        inputs = []
+        states = []
+        while not sim.game_over and sim.tick < 5000:
+            inputs.append(policy(sim))
+            sim.step(inputs[-1])
+            ring.push(sim)
+            states.append(sim.pack_state())
+        # Keep stepping past the end so the clouds wrap and draw from their stream
+        for _ in range(600):
+            inputs.append(Inputs(False, False, False))
+            sim.step(inputs[-1])
+            ring.push(sim)
+            states.append(sim.pack_state())
+
+        back = rng.randint(1, len(ring) - 1)
+        start = sim.tick - back
+        ring.rewind(sim, back)
+        snapshot = ring.snapshot()
+        for tick in range(start, len(inputs)):
+            if sim.pack_state() != states[tick - 1]:
+                print(f"MISMATCH run {run} rewound to tick {start}: diverged at tick {tick}")
+                failures += 1
+                break
+            sim.step(inputs[tick])
+
+        # A fresh simulation restored from the snapshot carries on identically too
+        other = Simulation()
+        other.restore(snapshot)
+        for tick in range(start, len(inputs)):
+            other.step(inputs[tick])
+        if other.pack_state() != states[-1] or other.score != sim.score:
+            print(f"MISMATCH run {run}: fresh simulation restored at tick {start} ended differently")
+            failures += 1
+    print(f"{runs - failures}/{runs} rewound runs reproduced exactly")
+    return failures == 0
+
+
+def measure(count=20000):
+    sim = Simulation(1)
+    for _ in range(100):
+        sim.step(Inputs(False, False, False))
+    ring = SnapshotRing()
+    timings = {}
+    for name, func in (("push", lambda: ring.push(sim)),
+                       ("snapshot", sim.snapshot),
+                       ("pack_state", sim.pack_state)):
+        start = time.perf_counter()
+        for _ in range(count):
+            func()
+        timings[name] = (time.perf_counter() - start) / count * 1e6
+    snapshot = sim.snapshot()
+    start = time.perf_counter()
+    for _ in range(count):
+        sim.restore(snapshot)
+    timings["restore"] = (time.perf_counter() - start) / count * 1e6
+
+    print(f"State: {len(snapshot.data)} bytes per tick, "
+          f"{ring.capacity} ticks ({ring.capacity // TICK_RATE} s) in {len(ring.buffer)} bytes")
+    for name, us in timings.items():
+        print(f"{name:>10}: {us:.2f} us")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check and time simulation snapshots")
+    parser.add_argument("--verify", action="store_true", help="check that rewound runs replay exactly")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    ok = verify(args.runs, args.seed) if args.verify else True
+    measure()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Crash-safe high-score store for the parachute game.
+
+Scores are appended to an SQLite database in WAL mode instead of rewriting a
+JSON list on every landing. Each insert is its own transaction, so a crash
+never truncates the table, and several game instances on one machine can
+write at the same time: readers never block, and writers wait on the busy
+timeout instead of failing. The top scores come from an index, so loading
+them does not scan the full history.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from collections import namedtuple
+
+ScoreEntry = namedtuple("ScoreEntry", ["score", "created", "seed", "deploy_height", "safe_zone", "ticks"])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    score REAL NOT NULL,
+    created REAL NOT NULL,
+    seed INTEGER,
+    deploy_height REAL,
+    safe_zone INTEGER NOT NULL DEFAULT 0,
+    ticks INTEGER
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC);
+"""
+
+
+class ScoreStore:
+    def __init__(self, path="high_scores.db", timeout=5.0):
+        self.path = path
+        # Autocommit mode: every statement below manages its own transaction
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL can only lose the last commits on power loss, never corrupt
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def add(self, score, seed=None, deploy_height=None, safe_zone=False, ticks=None, created=None):
+        """Append one run atomically and return its row id"""
+        cursor = self.conn.execute(
+            "INSERT INTO scores (score, created, seed, deploy_height, safe_zone, ticks) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (score, time.time() if created is None else created, seed, deploy_height, int(bool(safe_zone)), ticks),
+        )
+        return cursor.lastrowid
+
+    def top(self, k=10):
+        """Return the k best runs, best first"""
+        rows = self.conn.execute(
+            "SELECT score, created, seed, deploy_height, safe_zone, ticks "
+            "FROM scores ORDER BY score DESC LIMIT ?",
+            (k,),
+        )
+        return [ScoreEntry(score, created, seed, height, bool(safe), ticks)
+                for score, created, seed, height, safe, ticks in rows]
+
+    def top_scores(self, k=10):
+        """Return just the k best scores, best first"""
+        rows = self.conn.execute("SELECT score FROM scores ORDER BY score DESC LIMIT ?", (k,))
+        return [score for (score,) in rows]
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def import_json(self, json_path):
+        """Copy scores from the old high_scores.json list into an empty store.
+        Returns the number of scores imported."""
+        if not os.path.exists(json_path):
+            return 0
+        try:
+            with open(json_path, "r") as f:
+                scores = json.load(f)
+        except ValueError:
+            # The old writer could leave the file empty or truncated
+            return 0
+        if not isinstance(scores, list):
+            return 0
+
+        created = os.path.getmtime(json_path)
+        rows = [(float(score), created) for score in scores if isinstance(score, (int, float))]
+        # Take the write lock before checking, so two instances starting together
+        # cannot both import; a crash mid-import rolls back and it is retried
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            if self.count():
+                return 0
+            self.conn.executemany("INSERT INTO scores (score, created) VALUES (?, ?)", rows)
+        return len(rows)
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,717 @@
+"""
+Authoritative session server for the parachute game.
+
+Hosts many concurrent descents on one asyncio event loop with the same
+headless rules as the desktop game (simulation.py). Each WebSocket
+connection owns a session. Every session is stepped together on one shared
+60 Hz tick with the latest inputs its client sent. After each tick the
+client gets a compact delta with only the fields that changed. When a
+descent ends, the server sends the score it computed itself and can store
+it, so clients never report their own scores.
+
+The WebSocket layer is a small RFC 6455 implementation on asyncio streams
+(handshake, masked client frames, ping/pong and close), so the server
+needs nothing beyond the standard library.
+
+Messages are binary, little-endian:
+
+    hello    server -> client  type, session id, seed, tick rate, layout
+    input    client -> server  type, bits 0/1/2 = left/right/deploy
+    delta    server -> client  type, tick, changed-field mask, changed fields
+    result   server -> client  type, tick, alive, score
+    restart  client -> server  type; starts a new descent
+
+    python3 server.py --port 8765
+    python3 server.py --loopback 1000 --seconds 10
+
+The second form starts the server with 1000 headless loopback clients in a
+separate process and reports tick times and p99 tick latency.
+--bench-sessions 1000 2000 times the tick itself (stepping and encoding)
+without sockets, which is the server's share when clients are remote.
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import itertools
+import multiprocessing
+import os
+import random
+import struct
+import time
+from collections import deque
+
+from simulation import TICK_RATE, Inputs, NO_INPUT, Simulation
+from score_store import ScoreStore
+
+WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+# Longest client message accepted; real ones are a byte or two
+MAX_MESSAGE = 1024
+
+# Seconds a client gets to send its upgrade request, and may then go without
+# sending any frame (inputs, pings) before the connection is dropped
+HANDSHAKE_TIMEOUT = 10.0
+IDLE_TIMEOUT = 60.0
+
+# Deltas are skipped for a client whose unsent data grows past this,
+# so one slow connection cannot hold up the shared tick
+MAX_WRITE_BUFFER = 64 * 1024
+
+MSG_HELLO = 1
+MSG_INPUT = 2
+MSG_DELTA = 3
+MSG_RESULT = 4
+MSG_RESTART = 5
+
+HELLO_HEADER = struct.Struct("<BIIHBB")    # type, session, seed, tick rate, obstacles, zones
+HELLO_OBSTACLE = struct.Struct("<HHH")     # x, width, height
+HELLO_ZONE = struct.Struct("<HH")          # x, width
+DELTA_HEADER = struct.Struct("<BIB")       # type, tick, mask
+RESULT = struct.Struct("<BI?d")            # type, tick, alive, score
+
+# Fields a delta can carry, in mask bit order
+DELTA_FIELDS = ("player_x", "player_y", "plane_x", "wind", "flags")
+DELTA_FORMATS = ("f", "f", "f", "f", "B")
+ALL_FIELDS = (1 << len(DELTA_FIELDS)) - 1
+
+FLAG_JUMPING = 1
+FLAG_PARACHUTE = 2
+FLAG_ALIVE = 4
+FLAG_LANDED = 8
+FLAG_GAME_OVER = 16
+FLAG_PLANE = 32
+
+_delta_structs = {}
+
+
+def delta_struct(mask):
+    """Struct for the fields selected by mask, after the delta header"""
+    packer = _delta_structs.get(mask)
+    if packer is None:
+        fields = "".join(fmt for bit, fmt in enumerate(DELTA_FORMATS) if mask & (1 << bit))
+        packer = _delta_structs[mask] = struct.Struct("<" + fields)
+    return packer
+
+
+# Per mask: the whole WebSocket frame of a delta (frame header, delta header
+# and fields) as one Struct, plus which fields it selects
+_delta_frames = []
+for _mask in range(ALL_FIELDS + 1):
+    _length = DELTA_HEADER.size + delta_struct(_mask).size
+    _delta_frames.append((struct.Struct("<BB" + DELTA_HEADER.format[1:] + delta_struct(_mask).format[1:]),
+                          _length, tuple(bool(_mask & (1 << bit)) for bit in range(len(DELTA_FIELDS)))))
+
+
+# --- WebSocket framing -------------------------------------------------------
+
+def accept_key(key):
+    """Sec-WebSocket-Accept value for a client's Sec-WebSocket-Key"""
+    return base64.b64encode(hashlib.sha1(key.encode("ascii") + WS_GUID).digest()).decode("ascii")
+
+
+def apply_mask(data, mask):
+    """XOR data with the repeating 4-byte mask, in one big-integer operation"""
+    if not data:
+        return data
+    repeated = (mask * (len(data) // 4 + 1))[:len(data)]
+    return (int.from_bytes(data, "big") ^ int.from_bytes(repeated, "big")).to_bytes(len(data), "big")
+
+
+def encode_frame(payload, opcode=OP_BINARY, mask=None):
+    """One final frame; clients must pass a 4-byte mask, servers must not"""
+    length = len(payload)
+    mask_bit = 0x80 if mask is not None else 0
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, mask_bit | length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, mask_bit | 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, mask_bit | 127, length)
+    if mask is None:
+        return header + payload
+    return header + mask + apply_mask(payload, mask)
+
+
+async def read_frame(reader, require_mask):
+    """Read one frame and return (fin, opcode, unmasked payload)"""
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    if length > MAX_MESSAGE:
+        raise ValueError(f"Frame of {length} bytes is too long")
+    masked = second & 0x80
+    if require_mask and not masked:
+        raise ValueError("Client frames must be masked")
+    mask = await reader.readexactly(4) if masked else None
+    payload = await reader.readexactly(length)
+    if mask is not None:
+        payload = apply_mask(payload, mask)
+    return bool(first & 0x80), first & 0x0F, payload
+
+
+async def read_message(reader, writer, require_mask=True, mask=None):
+    """Next complete data message as (opcode, payload), answering pings on the way.
+    Returns (OP_CLOSE, b"") once the peer closes."""
+    parts = []
+    message_opcode = None
+    while True:
+        fin, opcode, payload = await read_frame(reader, require_mask)
+        if opcode == OP_CLOSE:
+            return OP_CLOSE, payload
+        if opcode == OP_PING:
+            writer.write(encode_frame(payload, OP_PONG, mask))
+            continue
+        if opcode == OP_PONG:
+            continue
+        if opcode != OP_CONTINUATION:
+            message_opcode = opcode
+            parts = []
+        parts.append(payload)
+        if sum(len(part) for part in parts) > MAX_MESSAGE:
+            raise ValueError("Message is too long")
+        if fin:
+            return message_opcode, b"".join(parts)
+
+
+async def read_http_headers(reader):
+    """Read an HTTP request or response head. Returns (start line, headers)."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return lines[0], headers
+
+
+async def server_handshake(reader, writer):
+    """Answer a WebSocket upgrade request. Returns the request path, or None if refused."""
+    request, headers = await read_http_headers(reader)
+    parts = request.split()
+    key = headers.get("sec-websocket-key")
+    if (len(parts) < 2 or parts[0] != "GET" or key is None
+            or headers.get("upgrade", "").lower() != "websocket"):
+        writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+        return None
+    writer.write(("HTTP/1.1 101 Switching Protocols\r\n"
+                  "Upgrade: websocket\r\n"
+                  "Connection: Upgrade\r\n"
+                  f"Sec-WebSocket-Accept: {accept_key(key)}\r\n\r\n").encode("ascii"))
+    await writer.drain()
+    return parts[1]
+
+
+async def client_handshake(reader, writer, host, path="/"):
+    """Send a WebSocket upgrade request and check the server's answer"""
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    writer.write((f"GET {path} HTTP/1.1\r\n"
+                  f"Host: {host}\r\n"
+                  "Upgrade: websocket\r\n"
+                  "Connection: Upgrade\r\n"
+                  f"Sec-WebSocket-Key: {key}\r\n"
+                  "Sec-WebSocket-Version: 13\r\n\r\n").encode("ascii"))
+    await writer.drain()
+    status, headers = await read_http_headers(reader)
+    if " 101 " not in status + " " or headers.get("sec-websocket-accept") != accept_key(key):
+        raise ConnectionError(f"WebSocket handshake refused: {status}")
+
+
+# --- Sessions ----------------------------------------------------------------
+
+class SessionSimulation(Simulation):
+    def reset(self, seed=None):
+        super().reset(seed)
+        # Clouds are scenery the client draws for itself
+        self.clouds = []
+
+
+class Session:
+    __slots__ = ("id", "sim", "writer", "inputs", "sent", "finished")
+
+    def __init__(self, session_id, writer, seed=None):
+        self.id = session_id
+        self.sim = SessionSimulation(seed)
+        self.writer = writer
+        self.inputs = NO_INPUT
+        # Field values the client has, so deltas only carry changes
+        self.sent = None
+        self.finished = False
+
+    def restart(self, seed=None):
+        self.sim.reset(seed)
+        self.inputs = NO_INPUT
+        self.sent = None
+        self.finished = False
+
+    def hello(self):
+        sim = self.sim
+        parts = [HELLO_HEADER.pack(MSG_HELLO, self.id, sim.seed, TICK_RATE,
+                                   len(sim.obstacles), len(sim.landing_zones))]
+        parts.extend(HELLO_OBSTACLE.pack(o.x, o.width, o.height) for o in sim.obstacles)
+        parts.extend(HELLO_ZONE.pack(zone.x, zone.width) for zone in sim.landing_zones)
+        return b"".join(parts)
+
+    def fields(self):
+        sim = self.sim
+        player = sim.player
+        flags = (sim.jumping * FLAG_JUMPING
+                 | player.parachute_deployed * FLAG_PARACHUTE
+                 | player.alive * FLAG_ALIVE
+                 | player.landed * FLAG_LANDED
+                 | sim.game_over * FLAG_GAME_OVER
+                 | sim.plane.active * FLAG_PLANE)
+        return (player.x, player.y, sim.plane.x, sim.wind_direction, flags)
+
+    def delta(self):
+        """Delta message for the fields that changed since the last one sent, or None"""
+        frame = self.delta_frame()
+        return None if frame is None else frame[2:]
+
+    def delta_frame(self):
+        """delta() as a complete WebSocket frame, built with a single pack"""
+        current = self.fields()
+        sent = self.sent
+        if sent is None:
+            mask = ALL_FIELDS
+        else:
+            # Unrolled: this runs for every session on every tick
+            x, y, plane_x, wind, flags = current
+            old_x, old_y, old_plane_x, old_wind, old_flags = sent
+            mask = ((x != old_x) | (y != old_y) << 1 | (plane_x != old_plane_x) << 2
+                    | (wind != old_wind) << 3 | (flags != old_flags) << 4)
+            if not mask:
+                return None
+        self.sent = current
+        packer, length, selectors = _delta_frames[mask]
+        return packer.pack(0x80 | OP_BINARY, length, MSG_DELTA, self.sim.tick, mask,
+                           *itertools.compress(current, selectors))
+
+
+class SessionServer:
+    def __init__(self, scores_path=None, send_every=1, history=TICK_RATE * 60):
+        self.sessions = {}
+        self.ids = itertools.count(1)
+        self.send_every = send_every
+        self.score_store = ScoreStore(scores_path) if scores_path else None
+        self.seed_rng = random.Random()
+        self.running = False
+        self.closed = False
+        self.tick_count = 0
+        self.peak_sessions = 0
+        # Per tick: time spent stepping and sending, and how long after its
+        # scheduled time the tick finished
+        self.tick_times = deque(maxlen=history)
+        self.latencies = deque(maxlen=history)
+        self.late_ticks = 0
+        self.bytes_sent = 0
+        self.messages_sent = 0
+        self.skipped = 0
+        self.results = 0
+
+    def send(self, session, payload):
+        # Server messages are short, so the frame header is two bytes
+        frame = bytes((0x80 | OP_BINARY, len(payload))) + payload if len(payload) < 126 else encode_frame(payload)
+        session.writer.write(frame)
+        self.bytes_sent += len(frame)
+        self.messages_sent += 1
+
+    async def handle(self, reader, writer):
+        """Serve one client connection for its whole lifetime"""
+        session = None
+        try:
+            path = await asyncio.wait_for(server_handshake(reader, writer), HANDSHAKE_TIMEOUT)
+            if path is None or self.closed:
+                return
+            session = Session(next(self.ids), writer, self.seed_rng.getrandbits(32))
+            self.sessions[session.id] = session
+            self.peak_sessions = max(self.peak_sessions, len(self.sessions))
+            self.send(session, session.hello())
+            while True:
+                opcode, payload = await asyncio.wait_for(read_message(reader, writer), IDLE_TIMEOUT)
+                if opcode == OP_CLOSE:
+                    writer.write(encode_frame(payload[:2], OP_CLOSE))
+                    break
+                if opcode != OP_BINARY or not payload:
+                    continue
+                if payload[0] == MSG_INPUT and len(payload) >= 2:
+                    bits = payload[1]
+                    session.inputs = Inputs(bool(bits & 1), bool(bits & 2), bool(bits & 4))
+                elif payload[0] == MSG_RESTART and session.finished:
+                    session.restart(self.seed_rng.getrandbits(32))
+                    self.send(session, session.hello())
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                ConnectionError, ValueError):
+            # Stalled or dropped connections, request heads over the stream
+            # limit and malformed frames
+            pass
+        finally:
+            if session is not None:
+                self.sessions.pop(session.id, None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    def tick(self):
+        """Step every live session once and send the deltas"""
+        self.tick_count += 1
+        send = self.tick_count % self.send_every == 0
+        sent_bytes = 0
+        messages = 0
+        for session in list(self.sessions.values()):
+            if session.finished:
+                continue
+            sim = session.sim
+            sim.step(session.inputs)
+            if sim.game_over:
+                session.finished = True
+                self.record_result(session)
+                delta = session.delta()
+                if delta is not None:
+                    self.send(session, delta)
+                self.send(session, RESULT.pack(MSG_RESULT, sim.tick, sim.player.alive, sim.score))
+                continue
+            if not send:
+                continue
+            writer = session.writer
+            if writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                self.skipped += 1
+                continue
+            frame = session.delta_frame()
+            if frame is not None:
+                writer.write(frame)
+                sent_bytes += len(frame)
+                messages += 1
+        self.bytes_sent += sent_bytes
+        self.messages_sent += messages
+
+    def record_result(self, session):
+        self.results += 1
+        sim = session.sim
+        if self.score_store is None or not sim.player.alive:
+            return
+        try:
+            self.score_store.add(sim.score, seed=sim.seed, ticks=sim.tick, safe_zone=sim.in_safe_zone(),
+                                 deploy_height=sim.player.parachute_deploy_height
+                                 if sim.player.parachute_deployed else None)
+        except Exception as e:
+            print(f"Error saving score: {e}")
+
+    async def run_ticks(self):
+        """Run the shared tick at TICK_RATE until stop() is called"""
+        loop = asyncio.get_running_loop()
+        tick_dt = 1.0 / TICK_RATE
+        self.running = True
+        next_tick = loop.time()
+        while self.running:
+            next_tick += tick_dt
+            delay = next_tick - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif delay < -tick_dt:
+                # More than a tick behind: skip ahead rather than spiral
+                self.late_ticks += 1
+                next_tick = loop.time()
+            start = time.perf_counter()
+            busy = bool(self.sessions)
+            self.tick()
+            # Idle ticks would only flatter the percentiles
+            if busy:
+                self.tick_times.append(time.perf_counter() - start)
+                self.latencies.append(loop.time() - next_tick)
+            if delay <= 0:
+                # Let connections read their inputs before the next tick
+                await asyncio.sleep(0)
+
+    def stop(self):
+        """End the tick loop and turn away connections still handshaking"""
+        self.running = False
+        self.closed = True
+
+    def stats(self):
+        def percentile(values, pct):
+            if not values:
+                return 0.0
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))] * 1000
+
+        return {
+            "sessions": len(self.sessions),
+            "peak_sessions": self.peak_sessions,
+            "ticks": self.tick_count,
+            "tick_p50_ms": round(percentile(self.tick_times, 50), 3),
+            "tick_p99_ms": round(percentile(self.tick_times, 99), 3),
+            "latency_p99_ms": round(percentile(self.latencies, 99), 3),
+            "late_ticks": self.late_ticks,
+            "messages": self.messages_sent,
+            "bytes": self.bytes_sent,
+            "skipped": self.skipped,
+            "results": self.results,
+        }
+
+
+async def serve(host, port, scores_path=None, send_every=1, report=10.0, ready=None, seconds=None):
+    """Run the server; ready(port) is called once it listens. Returns the final stats."""
+    sessions = SessionServer(scores_path, send_every)
+    server = await asyncio.start_server(sessions.handle, host, port, backlog=4096)
+    port = server.sockets[0].getsockname()[1]
+    print(f"Serving on ws://{host}:{port}/")
+    ticker = asyncio.create_task(sessions.run_ticks())
+    if ready is not None:
+        ready(port)
+    loop = asyncio.get_running_loop()
+    end = None if seconds is None else loop.time() + seconds
+    try:
+        while end is None or loop.time() < end:
+            await asyncio.sleep(report if end is None else min(report, max(0.0, end - loop.time())))
+            print(f"Server: {sessions.stats()}")
+    finally:
+        sessions.stop()
+        await ticker
+        server.close()
+        for session in list(sessions.sessions.values()):
+            session.writer.close()
+    return sessions.stats()
+
+
+# --- Loopback client ---------------------------------------------------------
+
+class LoopbackClient:
+    """Headless client that plays descents against the server"""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.state = dict.fromkeys(DELTA_FIELDS, 0.0)
+        self.zones = []
+        self.inputs_sent = None
+        self.results = []
+        self.messages = 0
+        self.bytes = 0
+        self.mask = None
+
+    def decode_hello(self, payload):
+        _, session_id, seed, tick_rate, obstacles, zones = HELLO_HEADER.unpack_from(payload)
+        offset = HELLO_HEADER.size + obstacles * HELLO_OBSTACLE.size
+        self.zones = [HELLO_ZONE.unpack_from(payload, offset + i * HELLO_ZONE.size) for i in range(zones)]
+        self.state = dict.fromkeys(DELTA_FIELDS, 0.0)
+        self.inputs_sent = None
+        # Each descent opens the parachute at a different height
+        self.deploy_y = self.rng.uniform(150, 450)
+
+    def apply_delta(self, payload):
+        _, tick, mask = DELTA_HEADER.unpack_from(payload)
+        values = iter(delta_struct(mask).unpack_from(payload, DELTA_HEADER.size))
+        for bit, name in enumerate(DELTA_FIELDS):
+            if mask & (1 << bit):
+                self.state[name] = next(values)
+
+    def choose_inputs(self):
+        state = self.state
+        if not int(state["flags"]) & FLAG_JUMPING:
+            return NO_INPUT
+        center = state["player_x"] + 20
+        left = right = False
+        if self.zones:
+            target = min((x + width / 2 for x, width in self.zones), key=lambda x: abs(x - center))
+            left = center > target + 5
+            right = center < target - 5
+        return Inputs(left, right, state["player_y"] > self.deploy_y)
+
+    async def send(self, writer, payload):
+        writer.write(encode_frame(payload, OP_BINARY, os.urandom(4)))
+
+    async def play(self, host, port, until):
+        """Play descents back to back until the loop time reaches until"""
+        loop = asyncio.get_running_loop()
+        try:
+            # The server may go quiet first, so never wait much past the end
+            await asyncio.wait_for(self._play(host, port, until), until + 1.0 - loop.time())
+        except asyncio.TimeoutError:
+            pass
+
+    async def _play(self, host, port, until):
+        loop = asyncio.get_running_loop()
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            await client_handshake(reader, writer, host)
+            while loop.time() < until:
+                opcode, payload = await read_message(reader, writer, require_mask=False, mask=os.urandom(4))
+                if opcode == OP_CLOSE:
+                    return
+                self.messages += 1
+                self.bytes += len(payload)
+                kind = payload[0]
+                if kind == MSG_HELLO:
+                    self.decode_hello(payload)
+                elif kind == MSG_DELTA:
+                    self.apply_delta(payload)
+                    inputs = self.choose_inputs()
+                    if inputs != self.inputs_sent:
+                        self.inputs_sent = inputs
+                        bits = inputs.left | inputs.right << 1 | inputs.deploy << 2
+                        await self.send(writer, bytes((MSG_INPUT, bits)))
+                elif kind == MSG_RESULT:
+                    _, tick, alive, score = RESULT.unpack(payload)
+                    self.results.append((alive, score))
+                    await self.send(writer, bytes((MSG_RESTART,)))
+            writer.write(encode_frame(struct.pack("!H", 1000), OP_CLOSE, os.urandom(4)))
+        finally:
+            writer.close()
+
+
+async def run_clients(host, port, count, seconds, seed=0):
+    loop = asyncio.get_running_loop()
+    until = loop.time() + seconds
+    clients = [LoopbackClient(random.Random(seed + i)) for i in range(count)]
+    tasks = []
+    for client in clients:
+        tasks.append(asyncio.create_task(client.play(host, port, until)))
+        # Spread the connections out a little, like real players
+        await asyncio.sleep(0.001)
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    errors = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+    results = [result for client in clients for result in client.results]
+    return {
+        "clients": count,
+        "errors": len(errors),
+        "first_error": repr(errors[0]) if errors else None,
+        "descents": len(results),
+        "landed": sum(1 for alive, _ in results if alive),
+        "messages": sum(client.messages for client in clients),
+        "bytes": sum(client.bytes for client in clients),
+    }
+
+
+def _client_process(host, port, count, seconds, seed, queue):
+    # Clients share the machine with the server; keep them from preempting its ticks
+    os.nice(10)
+    queue.put(asyncio.run(run_clients(host, port, count, seconds, seed)))
+
+
+async def loopback(count, seconds, processes, send_every):
+    """Serve count loopback clients from separate processes and report"""
+    queue = multiprocessing.Queue()
+    workers = []
+
+    def start_clients(port):
+        per_process = -(-count // processes)
+        for i in range(processes):
+            n = min(per_process, count - i * per_process)
+            if n <= 0:
+                break
+            worker = multiprocessing.Process(target=_client_process,
+                                             args=("127.0.0.1", port, n, seconds, i * per_process, queue))
+            worker.start()
+            workers.append(worker)
+
+    stats = await serve("127.0.0.1", 0, send_every=send_every, report=max(1.0, seconds / 4),
+                        ready=start_clients, seconds=seconds + 2)
+    loop = asyncio.get_running_loop()
+    reports = [await loop.run_in_executor(None, queue.get) for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    descents = sum(r["descents"] for r in reports)
+    client_bytes = sum(r["bytes"] for r in reports)
+    print(f"Clients: {stats['peak_sessions']} of {count} connected at once, {descents} descents finished, {sum(r['landed'] for r in reports)} landed, "
+          f"{sum(r['errors'] for r in reports)} errors")
+    for r in reports:
+        if r["first_error"]:
+            print(f"  first error: {r['first_error']}")
+    print(f"Server: {stats['ticks']} ticks, tick p50 {stats['tick_p50_ms']} ms "
+          f"({stats['tick_p50_ms'] * 1000 / max(1, stats['peak_sessions']):.1f} us per session), p99 {stats['tick_p99_ms']} ms, "
+          f"p99 latency {stats['latency_p99_ms']} ms, {stats['late_ticks']} late")
+    if descents:
+        print(f"Traffic: {client_bytes / max(1, count) / seconds:.0f} payload bytes per client per second")
+    return stats
+
+
+class _CountingTransport:
+    def get_write_buffer_size(self):
+        return 0
+
+
+class _CountingWriter:
+    """Writer that only counts bytes, to time ticks without sockets"""
+    transport = _CountingTransport()
+
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, data):
+        self.bytes += len(data)
+
+
+def bench_sessions(count, send_every=1, ticks=600):
+    """Time the shared tick (stepping and encoding) for count sessions without any I/O"""
+    sessions = SessionServer(send_every=send_every)
+    rng = random.Random(0)
+    writers = []
+    for i in range(count):
+        writer = _CountingWriter()
+        writers.append(writer)
+        session = Session(i, writer, rng.getrandbits(32))
+        session.inputs = Inputs(rng.random() < 0.3, rng.random() < 0.3, rng.random() < 0.5)
+        sessions.sessions[i] = session
+    times = []
+    for _ in range(ticks):
+        for session in sessions.sessions.values():
+            if session.finished:
+                session.restart(rng.getrandbits(32))
+        start = time.perf_counter()
+        sessions.tick()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    p50 = times[len(times) // 2] * 1000
+    p99 = times[min(len(times) - 1, int(len(times) * 0.99))] * 1000
+    print(f"{count} sessions: tick p50 {p50:.2f} ms ({p50 * 1000 / count:.1f} us per session), "
+          f"p99 {p99:.2f} ms, {sum(w.bytes for w in writers) / count / (ticks / TICK_RATE):.0f} "
+          f"bytes per session per second")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Authoritative parachute game session server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--scores-db", default=None, help="SQLite database to store verified scores in")
+    parser.add_argument("--send-every", type=int, default=1, help="send deltas every N ticks")
+    parser.add_argument("--report", type=float, default=10.0, help="seconds between stats lines")
+    parser.add_argument("--loopback", type=int, metavar="N",
+                        help="benchmark with N local headless clients instead of serving")
+    parser.add_argument("--seconds", type=float, default=10.0, help="length of the loopback benchmark")
+    parser.add_argument("--client-processes", type=int, default=1,
+                        help="processes the loopback clients are spread over")
+    parser.add_argument("--bench-sessions", type=int, nargs="+", metavar="N",
+                        help="time the tick for N in-process sessions without sockets")
+    args = parser.parse_args(argv)
+
+    if args.bench_sessions:
+        for count in args.bench_sessions:
+            bench_sessions(count, args.send_every)
+        return
+    if args.loopback:
+        asyncio.run(loopback(args.loopback, args.seconds, args.client_processes, args.send_every))
+        return
+    try:
+        asyncio.run(serve(args.host, args.port, args.scores_db, args.send_every, args.report))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,561 @@
+"""
+Headless simulation core for the parachute game.
+
+Physics, collisions, wind and scoring live here with no dependency on pygame,
+so the rules can be imported quickly and stepped thousands of times per second
+without a display or mixer. The pygame client in parachute_game.py subclasses
+these classes to add drawing and turns the events returned by
+Simulation.step() into sounds.
+"""
+
+import random
+import struct
+from collections import namedtuple
+
+from spatial_index import CenterSums, IntervalIndex
+
+# World dimensions
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+GROUND_Y = SCREEN_HEIGHT - 20
+
+# The rules run at a fixed tick rate: every speed is in pixels per tick and
+# every timer counts ticks, independent of how fast frames are rendered
+TICK_RATE = 60
+TICK_DT = 1.0 / TICK_RATE
+
+# Events returned by Simulation.step()
+EVENT_JUMP = "jump"
+EVENT_PARACHUTE = "parachute_open"
+EVENT_WIND = "wind"
+EVENT_CRASH = "crash"
+EVENT_LANDING = "landing"
+
+# Player controls for one tick
+Inputs = namedtuple("Inputs", ["left", "right", "deploy"])
+NO_INPUT = Inputs(False, False, False)
+
+
+# Integer rectangle with the same semantics as pygame.Rect for the rules we need
+class Rect:
+    __slots__ = ("x", "y", "width", "height")
+
+    def __init__(self, x, y, width, height):
+        self.x = int(x)
+        self.y = int(y)
+        self.width = int(width)
+        self.height = int(height)
+
+    @property
+    def left(self):
+        return self.x
+
+    @property
+    def top(self):
+        return self.y
+
+    @property
+    def right(self):
+        return self.x + self.width
+
+    @property
+    def bottom(self):
+        return self.y + self.height
+
+    @property
+    def centerx(self):
+        return self.x + self.width // 2
+
+    def colliderect(self, other):
+        if self.width <= 0 or self.height <= 0 or other.width <= 0 or other.height <= 0:
+            return False
+        return (self.x < other.x + other.width and other.x < self.x + self.width and
+                self.y < other.y + other.height and other.y < self.y + self.height)
+
+    def collidepoint(self, x, y):
+        x = int(x)
+        y = int(y)
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.width, self.height))
+
+    def __repr__(self):
+        return f"Rect({self.x}, {self.y}, {self.width}, {self.height})"
+
+
+# Base class for anything that moves, so front-ends can draw between ticks
+class Body:
+    def save_position(self):
+        """Remember the current position as the start of the next tick"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def interpolate(self, alpha):
+        """Position blended between the previous and the current tick"""
+        if alpha >= 1:
+            return self.x, self.y
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
+
+
+# Player class
+class Player(Body):
+    def __init__(self):
+        self.width = 40
+        self.height = 60
+        self.x = SCREEN_WIDTH // 2
+        self.y = 50
+        self.parachute_deployed = False
+        self.parachute_width = 80
+        self.parachute_height = 40
+        self.speed_x = 0
+        self.speed_y = 1
+        self.gravity = 0.2
+        self.max_speed = 7
+        self.alive = True
+        self.landed = False
+        self.wind = 0
+        self.parachute_deploy_height = 0  # Track height when parachute was deployed
+        self.save_position()
+
+    def deploy_parachute(self):
+        """Open the parachute. Returns True if it was not already open."""
+        if self.parachute_deployed:
+            return False
+        self.parachute_deployed = True
+        # Record the deployment height for scoring
+        self.parachute_deploy_height = self.y
+        self.gravity = 0.05
+        self.max_speed = 2
+        return True
+
+    def move(self, inputs):
+        # Left-right movement based on inputs
+        if inputs.left:
+            self.speed_x = max(-3, self.speed_x - 0.2)
+        elif inputs.right:
+            self.speed_x = min(3, self.speed_x + 0.2)
+        else:
+            # Gradually slow down when no key is pressed
+            if self.speed_x > 0:
+                self.speed_x = max(0, self.speed_x - 0.1)
+            elif self.speed_x < 0:
+                self.speed_x = min(0, self.speed_x + 0.1)
+
+        # Apply wind effect when parachute is deployed
+        if self.parachute_deployed:
+            self.speed_x += self.wind * 0.1
+
+        # Update position
+        self.x += self.speed_x
+
+        # Keep player within screen bounds
+        self.keep_in_bounds()
+
+        # Apply gravity
+        if not self.landed:
+            self.speed_y = min(self.max_speed, self.speed_y + self.gravity)
+            self.y += self.speed_y
+
+    def keep_in_bounds(self):
+        if self.x < 0:
+            self.x = 0
+            self.speed_x = 0
+        elif self.x > SCREEN_WIDTH - self.width:
+            self.x = SCREEN_WIDTH - self.width
+            self.speed_x = 0
+
+    def check_collision(self, obstacle_index):
+        """Check obstacles (an IntervalIndex of their rects) and the ground.
+        Returns True once the descent is over."""
+        player_rect = Rect(self.x, self.y, self.width, self.height)
+
+        if obstacle_index.collidelist(player_rect) >= 0:
+            self.alive = False
+            return True
+
+        # Check if player has reached the ground
+        if self.y + self.height >= GROUND_Y:
+            self.y = GROUND_Y - self.height
+            self.landed = True
+
+            # Too fast landing - crash
+            if self.speed_y > 3:
+                self.alive = False
+
+            return self.landed
+
+        return False
+
+
+# Obstacle class
+class Obstacle:
+    def __init__(self, x, width, height):
+        self.x = x
+        self.width = width
+        self.height = height
+        self.y = GROUND_Y - height  # Position at ground level
+        self.rect = Rect(self.x, self.y, self.width, self.height)
+
+
+# Plane class
+class Plane(Body):
+    def __init__(self):
+        self.width = 100
+        self.height = 30
+        self.x = -self.width
+        self.y = 30
+        self.speed = 3
+        self.active = True
+        self.save_position()
+
+    def update(self):
+        if self.active:
+            self.x += self.speed
+
+            # Reset plane when it goes off-screen
+            if self.x > SCREEN_WIDTH:
+                self.x = -self.width
+                self.active = False
+
+
+# Cloud class
+class Cloud(Body):
+    def __init__(self, rng):
+        self.rng = rng
+        self.width = rng.randint(50, 150)
+        self.height = rng.randint(30, 60)
+        self.x = rng.randint(0, SCREEN_WIDTH)
+        self.y = rng.randint(50, 200)
+        self.speed = rng.uniform(0.2, 1.0)
+        self.save_position()
+
+    def update(self):
+        """Drift one tick. Returns True when the cloud wrapped around and drew from its rng."""
+        self.x += self.speed
+        if self.x > SCREEN_WIDTH:
+            self.x = -self.width
+            self.y = self.rng.randint(50, 200)
+            # Wrap around without interpolating across the whole screen
+            self.save_position()
+            return True
+        return False
+
+
+def make_obstacles(rng, obstacle_class=Obstacle, left=0, right=SCREEN_WIDTH):
+    """Create 5-8 obstacles at random positions between left and right"""
+    num_obstacles = rng.randint(5, 8)
+    obstacle_positions = sorted(rng.sample(range(left + 100, right - 100), num_obstacles))
+
+    obstacles = []
+    for pos in obstacle_positions:
+        width = rng.randint(30, 80)
+        height = rng.randint(40, 100)
+        obstacles.append(obstacle_class(pos, width, height))
+    return obstacles
+
+
+def make_landing_zones(obstacles, left=0, right=SCREEN_WIDTH):
+    """Create safe landing zones in the gaps between obstacles spanning left to right"""
+    landing_zones = []
+
+    # Sort obstacles by x position
+    sorted_obstacles = sorted(obstacles, key=lambda o: o.x)
+
+    # Add a landing zone before the first obstacle
+    if sorted_obstacles and sorted_obstacles[0].x - left > 100:
+        width = min(100, sorted_obstacles[0].x - left - 50)
+        landing_zones.append(Rect(
+            sorted_obstacles[0].x - width - 10,
+            SCREEN_HEIGHT - 30,
+            width,
+            10
+        ))
+
+    # Add landing zones between obstacles
+    for i in range(len(sorted_obstacles) - 1):
+        gap = sorted_obstacles[i+1].x - (sorted_obstacles[i].x + sorted_obstacles[i].width)
+        if gap > 80:  # Only create a zone if there's enough space
+            zone_width = min(gap - 20, 100)  # Leave some margin
+            zone_x = sorted_obstacles[i].x + sorted_obstacles[i].width + (gap - zone_width) // 2
+            landing_zones.append(Rect(
+                zone_x,
+                SCREEN_HEIGHT - 30,
+                zone_width,
+                10
+            ))
+
+    # Add a landing zone after the last obstacle
+    if sorted_obstacles and sorted_obstacles[-1].x + sorted_obstacles[-1].width < right - 100:
+        width = min(100, right - (sorted_obstacles[-1].x + sorted_obstacles[-1].width) - 50)
+        landing_zones.append(Rect(
+            sorted_obstacles[-1].x + sorted_obstacles[-1].width + 10,
+            SCREEN_HEIGHT - 30,
+            width,
+            10
+        ))
+
+    return landing_zones
+
+
+# Mutable state of one tick, packed by Simulation.pack_state(). Layout, cloud
+# sizes and speeds only change on reset, so the seed stands in for them.
+STATE_HEADER = "<I??ddi"        # tick, game_over, jumping, score, wind_direction, wind_timer
+STATE_PLAYER = "10d???"         # position, previous position, speeds, physics and flags
+STATE_PLANE = "dd?"             # x, prev_x, active
+STATE_CLOUD = "4d"              # x, y, prev_x, prev_y
+
+_state_structs = {}
+
+
+def state_struct(clouds):
+    """Packed layout of the state for a simulation with the given number of clouds"""
+    packer = _state_structs.get(clouds)
+    if packer is None:
+        packer = _state_structs[clouds] = struct.Struct(STATE_HEADER + STATE_PLAYER + STATE_PLANE
+                                                        + STATE_CLOUD * clouds)
+    return packer
+
+
+class Snapshot:
+    """One tick of a simulation: the packed state plus the random streams it continues with"""
+    __slots__ = ("seed", "data", "rng_state", "cloud_rng_state")
+
+    def __init__(self, seed, data, rng_state, cloud_rng_state):
+        self.seed = seed
+        self.data = data
+        # Shared with the simulation and other snapshots, never copied
+        self.rng_state = rng_state
+        self.cloud_rng_state = cloud_rng_state
+
+    @property
+    def tick(self):
+        return struct.unpack_from("<I", self.data)[0]
+
+
+# Simulation class
+class Simulation:
+    # Front-ends swap these for subclasses that know how to draw themselves
+    player_class = Player
+    plane_class = Plane
+    obstacle_class = Obstacle
+    cloud_class = Cloud
+
+    def __init__(self, seed=None, rng=None):
+        # Layout and wind come from self.rng; clouds are cosmetic and draw from
+        # their own stream so they never change the gameplay sequence
+        self.rng = rng if rng is not None else random.Random()
+        self.cloud_rng = random.Random()
+        self.seed = None
+        # Bumped whenever either random stream is drawn from, so snapshots only
+        # capture the generator states again after they changed
+        self.rng_draws = 0
+        self._random_states = None
+        self.reset(seed)
+
+    def reset(self, seed=None, level=None):
+        """Start a new descent. The same seed always produces the same layout and wind.
+        A level from a LevelPack brings its seed and a prebuilt layout."""
+        if level is not None:
+            seed = level.seed
+        elif seed is None:
+            seed = self.rng.getrandbits(32)
+        self.seed = seed
+        self.rng.seed(seed)
+        self.cloud_rng.seed(seed + 1)
+        self.rng_draws += 1
+
+        self.tick = 0
+        self.player = self.player_class()
+        self.plane = self.plane_class()
+        self.clouds = [self.cloud_class(self.cloud_rng) for _ in range(5)]
+        self.game_over = False
+        self.jumping = False
+        self.score = 0
+        self.wind_direction = 0
+        self.wind_timer = 0
+        if level is None:
+            self.create_layout()
+        else:
+            self.load_layout(level)
+
+    def create_layout(self):
+        """Place the obstacles and landing zones for this seed"""
+        self.obstacles = make_obstacles(self.rng, self.obstacle_class)
+
+        # Create landing zones between obstacles
+        self.create_landing_zones()
+        self.build_index()
+
+    def load_layout(self, level):
+        """Use a prebuilt layout instead of generating one. The gameplay stream
+        skips the words generating it would have drawn, so the wind is the same."""
+        self.obstacles = [self.obstacle_class(x, width, height) for x, width, height in level.obstacles]
+        self.landing_zones = [Rect(x, SCREEN_HEIGHT - 30, width, 10) for x, width in level.landing_zones]
+        if level.draws:
+            self.rng.getrandbits(32 * level.draws)
+        self.build_index()
+
+    def build_index(self):
+        """Index the static obstacles and landing zones for collision and scoring queries"""
+        self.obstacle_index = IntervalIndex([obstacle.rect for obstacle in self.obstacles])
+        self.zone_index = IntervalIndex(self.landing_zones)
+        self.obstacle_centers = CenterSums(obstacle.x + obstacle.width // 2 for obstacle in self.obstacles)
+
+    def create_landing_zones(self):
+        """Create safe landing zones between obstacles"""
+        self.landing_zones = make_landing_zones(self.obstacles)
+
+    def update_wind(self):
+        """Count down the wind timer. Returns True when the wind changed."""
+        self.wind_timer -= 1
+        if self.wind_timer <= 0:
+            self.wind_timer = self.rng.randint(3 * TICK_RATE, 6 * TICK_RATE)  # 3-6 seconds
+            self.wind_direction = self.rng.uniform(-1, 1)
+            self.player.wind = self.wind_direction
+            self.rng_draws += 1
+            return True
+        return False
+
+    def in_safe_zone(self):
+        """True if the player's centre is over one of the landing zones"""
+        return self.zone_index.collidepoint(self.player.x + self.player.width // 2, SCREEN_HEIGHT - 21) >= 0
+
+    def compute_score(self):
+        """Score a safe landing from position, safe zone bonus and deploy height"""
+        # Base score from the mean distance to the obstacle centres
+        landing_score = 1000 - self.obstacle_centers.distance_sum(self.player.x) // len(self.obstacle_centers)
+
+        # Bonus for landing in safe zone
+        if self.in_safe_zone():
+            landing_score += 500
+
+        # Speed bonus for deploying parachute later
+        time_bonus = max(0, 200 - self.player.parachute_deploy_height)
+
+        return max(0, landing_score + time_bonus)
+
+    def step(self, inputs=NO_INPUT):
+        """Advance the game by one tick and return the list of events that happened"""
+        events = []
+        self.tick += 1
+
+        # Start interpolation for this tick from where everything is now
+        self.player.save_position()
+        self.plane.save_position()
+        for cloud in self.clouds:
+            cloud.save_position()
+
+        # Update plane
+        self.plane.update()
+
+        # Update clouds
+        for cloud in self.clouds:
+            if cloud.update():
+                self.rng_draws += 1
+
+        # Update wind
+        if self.update_wind():
+            events.append(EVENT_WIND)
+
+        # Check if player should jump from plane
+        if not self.jumping and self.plane.x + self.plane.width // 2 > SCREEN_WIDTH // 3:
+            self.jumping = True
+            self.player.x = self.plane.x + self.plane.width // 2
+            self.player.y = self.plane.y + self.plane.height
+            self.player.save_position()
+            events.append(EVENT_JUMP)
+
+        # If player has jumped, allow movement
+        if self.jumping and not self.game_over and self.player.alive:
+            # Deploy parachute
+            if inputs.deploy and self.player.deploy_parachute():
+                events.append(EVENT_PARACHUTE)
+
+            # Update player position
+            self.player.move(inputs)
+
+            # Check for collisions
+            if self.player.check_collision(self.obstacle_index):
+                self.game_over = True
+                events.append(EVENT_LANDING if self.player.alive else EVENT_CRASH)
+
+            # Update score based on progress
+            if self.player.landed and self.player.alive:
+                self.score = self.compute_score()
+                self.game_over = True
+
+        return events
+
+    def random_states(self):
+        """States of the gameplay and cloud random streams"""
+        cached = self._random_states
+        if cached is None or cached[0] != self.rng_draws:
+            cached = self._random_states = (self.rng_draws, self.rng.getstate(), self.cloud_rng.getstate())
+        return cached[1], cached[2]
+
+    def pack_state(self, buffer=None, offset=0):
+        """Pack this tick's mutable state into buffer at offset, or return it as bytes"""
+        player = self.player
+        plane = self.plane
+        values = [
+            self.tick, self.game_over, self.jumping, self.score, self.wind_direction, self.wind_timer,
+            player.x, player.y, player.prev_x, player.prev_y, player.speed_x, player.speed_y,
+            player.gravity, player.max_speed, player.wind, player.parachute_deploy_height,
+            player.alive, player.landed, player.parachute_deployed,
+            plane.x, plane.prev_x, plane.active,
+        ]
+        for cloud in self.clouds:
+            values += (cloud.x, cloud.y, cloud.prev_x, cloud.prev_y)
+        packer = state_struct(len(self.clouds))
+        if buffer is None:
+            return packer.pack(*values)
+        packer.pack_into(buffer, offset, *values)
+        return None
+
+    def unpack_state(self, buffer, offset=0):
+        """Load mutable state packed by pack_state() for the current layout"""
+        values = state_struct(len(self.clouds)).unpack_from(buffer, offset)
+        player = self.player
+        plane = self.plane
+        (self.tick, self.game_over, self.jumping, self.score, self.wind_direction, self.wind_timer,
+         player.x, player.y, player.prev_x, player.prev_y, player.speed_x, player.speed_y,
+         player.gravity, player.max_speed, player.wind, player.parachute_deploy_height,
+         player.alive, player.landed, player.parachute_deployed,
+         plane.x, plane.prev_x, plane.active) = values[:22]
+        i = 22
+        for cloud in self.clouds:
+            cloud.x, cloud.y, cloud.prev_x, cloud.prev_y = values[i:i + 4]
+            i += 4
+
+    def snapshot(self):
+        """Capture the current tick so restore() can return to it"""
+        rng_state, cloud_rng_state = self.random_states()
+        return Snapshot(self.seed, self.pack_state(), rng_state, cloud_rng_state)
+
+    def restore(self, snapshot):
+        """Return to the tick captured by snapshot(); stepping on gives the same run"""
+        self.restore_state(snapshot.seed, snapshot.data, 0, snapshot.rng_state, snapshot.cloud_rng_state)
+
+    def restore_state(self, seed, buffer, offset, rng_state, cloud_rng_state):
+        """restore() from state packed into buffer at offset"""
+        if seed != self.seed:
+            self.reset(seed)
+        self.unpack_state(buffer, offset)
+        # Streams that have not been drawn from since the snapshot are already in place
+        cached = self._random_states
+        if (cached is None or cached[0] != self.rng_draws
+                or cached[1] is not rng_state or cached[2] is not cloud_rng_state):
+            self.rng.setstate(rng_state)
+            self.cloud_rng.setstate(cloud_rng_state)
+            self.rng_draws += 1
+            self._random_states = (self.rng_draws, rng_state, cloud_rng_state)
+
+    def run(self, policy, max_ticks=10000):
+        """Step until the game is over, asking policy(simulation) for each tick's inputs"""
+        for _ in range(max_ticks):
+            if self.game_over:
+                break
+            self.step(policy(self))
+        return self.score
@@ -0,0 +1,161 @@
+"""
+Preloaded sound bank for the parachute game.
+
+Every WAV file in the sounds directory is decoded once at startup, or sounds
+synthesized in memory are handed over, and kept keyed by file name. Decoding
+can run on a loader thread with decode_all() while the first frames are drawn;
+attach() then hands the sounds over on the main thread. Until then play() is a
+no-op. Playback goes through a fixed pool of reserved
+mixer channels so overlapping effects never allocate new voices: when the pool
+is full, the oldest sound with the lowest priority is stopped to make room.
+"""
+
+import os
+import time
+
+import pygame
+
+# Default priorities: higher values win when the channel pool is full
+SOUND_PRIORITIES = {
+    "background.wav": 4,
+    "crash.wav": 3,
+    "landing.wav": 3,
+    "parachute_open.wav": 2,
+    "jump.wav": 2,
+    "wind.wav": 1,
+}
+
+
+class SoundBank:
+    def __init__(self, sound_dir="sounds", num_channels=6, volume=0.7):
+        self.sound_dir = sound_dir
+        self.num_channels = num_channels
+        self.volume = volume
+        self.sounds = {}
+        self.channels = []
+        self.channel_priority = []
+        self.channel_started = []
+
+        # Counters so callers can check that gameplay never hits the disk
+        self.hits = 0
+        self.misses = 0
+        self.files_loaded = 0
+        self.generated = 0
+        self.load_time = 0.0
+        self.steals = 0
+        self.dropped = 0
+
+    def load_all(self):
+        """Decode every WAV file in the sound directory and reserve the channel pool"""
+        self.attach(self.decode_all())
+
+    def decode_all(self):
+        """Decode every WAV file in the sound directory and return them keyed by
+        file name, without touching the bank's sounds or channels"""
+        start = time.perf_counter()
+        try:
+            names = sorted(os.listdir(self.sound_dir))
+        except OSError as e:
+            print(f"Error reading sound directory {self.sound_dir}: {e}")
+            names = []
+
+        sounds = {}
+        for name in names:
+            if not name.lower().endswith(".wav"):
+                continue
+            try:
+                sounds[name] = pygame.mixer.Sound(os.path.join(self.sound_dir, name))
+                self.files_loaded += 1
+            except pygame.error as e:
+                print(f"Error loading sound {name}: {e}")
+        self.load_time += time.perf_counter() - start
+        return sounds
+
+    def load_sounds(self, sounds):
+        """Use already built Sound objects keyed by file name instead of reading WAV files"""
+        self.generated += len(sounds)
+        self.attach(sounds)
+
+    def attach(self, sounds):
+        """Add decoded sounds to the bank and reserve the channel pool"""
+        start = time.perf_counter()
+        for name, sound in sounds.items():
+            sound.set_volume(self.volume)
+            self.sounds[name] = sound
+
+        self._reserve_channels()
+        self.load_time += time.perf_counter() - start
+
+    def _reserve_channels(self):
+        try:
+            if pygame.mixer.get_num_channels() < self.num_channels:
+                pygame.mixer.set_num_channels(self.num_channels)
+            # Keep the pool out of reach of Sound.play() so only the bank uses it
+            pygame.mixer.set_reserved(self.num_channels)
+            self.channels = [pygame.mixer.Channel(i) for i in range(self.num_channels)]
+        except pygame.error as e:
+            print(f"Error reserving mixer channels: {e}")
+            self.channels = []
+        self.channel_priority = [0] * len(self.channels)
+        self.channel_started = [0.0] * len(self.channels)
+
+    def get(self, name):
+        """Return the decoded sound for name, or None if it was never loaded"""
+        sound = self.sounds.get(name)
+        if sound is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return sound
+
+    def _pick_channel(self, priority):
+        # Prefer an idle channel
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return i
+
+        # Otherwise steal the oldest voice with the lowest priority not above ours
+        victim = None
+        for i in range(len(self.channels)):
+            if self.channel_priority[i] > priority:
+                continue
+            if victim is None or (self.channel_priority[i], self.channel_started[i]) < (
+                self.channel_priority[victim],
+                self.channel_started[victim],
+            ):
+                victim = i
+        if victim is not None:
+            self.channels[victim].stop()
+            self.steals += 1
+        return victim
+
+    def play(self, name, loops=0, priority=None):
+        """Play a preloaded sound on the channel pool. Returns the channel used or None."""
+        sound = self.get(name)
+        if sound is None or not self.channels:
+            return None
+        if priority is None:
+            priority = SOUND_PRIORITIES.get(name, 0)
+
+        index = self._pick_channel(priority)
+        if index is None:
+            self.dropped += 1
+            return None
+
+        channel = self.channels[index]
+        channel.play(sound, loops=loops)
+        self.channel_priority[index] = priority
+        self.channel_started[index] = time.perf_counter()
+        return channel
+
+    def stats(self):
+        """Return cache and pool counters as a dictionary"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "files_loaded": self.files_loaded,
+            "generated": self.generated,
+            "load_time_ms": round(self.load_time * 1000, 3),
+            "steals": self.steals,
+            "dropped": self.dropped,
+        }
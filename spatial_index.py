@@ -0,0 +1,148 @@
+"""
+Broad-phase spatial index for the parachute game.
+
+Obstacles and landing zones never move once a layout is built, so they are
+indexed once per reset instead of being scanned every tick. IntervalIndex
+keeps rects sorted by left edge with a running maximum of right edges. A
+query for an x-range then needs two bisections to find the few candidates
+that can overlap it. CenterSums keeps sorted obstacle centres with prefix
+sums, so the summed distance from a point to every centre (the landing score)
+takes one bisection instead of a loop over all obstacles.
+
+    python3 spatial_index.py --obstacles 10000 20000 40000
+
+benchmarks queries against a linear scan at several layout sizes.
+"""
+
+import argparse
+import random
+import time
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+
+class IntervalIndex:
+    def __init__(self, rects):
+        self.rects = list(rects)
+        # Positions in self.rects, ordered by left edge
+        self.order = sorted(range(len(self.rects)), key=lambda i: self.rects[i].left)
+        self.lefts = [self.rects[i].left for i in self.order]
+        # max_rights[j] is the furthest right edge among the first j + 1 rects,
+        # which only grows, so it can be bisected too
+        self.max_rights = list(accumulate((self.rects[i].right for i in self.order), max))
+
+    def __len__(self):
+        return len(self.rects)
+
+    def query_range(self, left, right):
+        """Indices of the rects whose x-extent overlaps [left, right), ordered by left edge"""
+        # Rects from hi on start at or after right; rects before lo end at or before left
+        hi = bisect_left(self.lefts, right)
+        lo = bisect_right(self.max_rights, left, 0, hi)
+        rects = self.rects
+        return [i for i in self.order[lo:hi] if rects[i].right > left]
+
+    def collidelistall(self, rect):
+        """Indices of every rect colliding with rect, in list order, like Rect.collidelistall"""
+        rects = self.rects
+        hits = [i for i in self.query_range(rect.left, rect.right) if rect.colliderect(rects[i])]
+        hits.sort()
+        return hits
+
+    def collidelist(self, rect):
+        """Index of the first rect colliding with rect, or -1, like Rect.collidelist"""
+        rects = self.rects
+        first = -1
+        for i in self.query_range(rect.left, rect.right):
+            if (first < 0 or i < first) and rect.colliderect(rects[i]):
+                first = i
+        return first
+
+    def collidelist_batch(self, rects):
+        """collidelist() for many rects at once"""
+        return [self.collidelist(rect) for rect in rects]
+
+    def collidepoint(self, x, y):
+        """Index of the first rect containing the point, or -1"""
+        x = int(x)
+        rects = self.rects
+        first = -1
+        for i in self.query_range(x, x + 1):
+            if (first < 0 or i < first) and rects[i].collidepoint(x, y):
+                first = i
+        return first
+
+
+class CenterSums:
+    """Sorted points with prefix sums for summed distances"""
+
+    def __init__(self, centers):
+        self.centers = sorted(centers)
+        self.prefix = [0]
+        self.prefix.extend(accumulate(self.centers))
+
+    def __len__(self):
+        return len(self.centers)
+
+    def distance_sum(self, x):
+        """sum(abs(x - c) for c in centers) with one bisection"""
+        k = bisect_right(self.centers, x)
+        # Points at or left of x contribute x - c, the rest c - x
+        return x * (2 * k - len(self.centers)) + (self.prefix[-1] - 2 * self.prefix[k])
+
+
+def _linear_collidelist(rects, rect):
+    for i, other in enumerate(rects):
+        if rect.colliderect(other):
+            return i
+    return -1
+
+
+def benchmark(sizes, queries, seed):
+    from simulation import GROUND_Y, Rect
+
+    rng = random.Random(seed)
+    print(f"{'obstacles':>10} {'linear us':>10} {'index us':>10} {'speedup':>8} {'score us':>9}")
+    for size in sizes:
+        # A level size screens wide with the same obstacle density as one screen
+        width = size * 100
+        rects = [Rect(rng.randrange(width), GROUND_Y - 100, rng.randint(30, 80), 100) for _ in range(size)]
+        probes = [Rect(rng.randrange(width), rng.randint(GROUND_Y - 160, GROUND_Y - 60), 40, 60)
+                  for _ in range(queries)]
+
+        start = time.perf_counter()
+        index = IntervalIndex(rects)
+        sums = CenterSums(r.centerx for r in rects)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        linear = [_linear_collidelist(rects, probe) for probe in probes]
+        linear_time = (time.perf_counter() - start) / queries
+
+        start = time.perf_counter()
+        indexed = index.collidelist_batch(probes)
+        index_time = (time.perf_counter() - start) / queries
+
+        start = time.perf_counter()
+        for probe in probes:
+            sums.distance_sum(probe.x)
+        score_time = (time.perf_counter() - start) / queries
+
+        if linear != indexed:
+            raise SystemExit(f"Index disagrees with linear scan at {size} obstacles")
+        print(f"{size:>10} {linear_time * 1e6:>10.2f} {index_time * 1e6:>10.2f} "
+              f"{linear_time / index_time:>7.0f}x {score_time * 1e6:>9.2f}   (built in {build * 1000:.1f} ms)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the obstacle index against a linear scan")
+    parser.add_argument("--obstacles", type=int, nargs="+", default=[100, 1000, 10000, 40000],
+                        help="layout sizes to benchmark")
+    parser.add_argument("--queries", type=int, default=2000, help="collision queries per size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    benchmark(args.obstacles, args.queries, args.seed)
+
+
+if __name__ == "__main__":
+    main()
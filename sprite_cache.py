@@ -0,0 +1,219 @@
+"""
+Pre-rendered sprite cache for the parachute game.
+
+The player, plane and clouds only have a handful of distinct looks:
+freefall, parachute open, crashed, the plane, and one per cloud size. Each
+look is drawn once with the usual pygame.draw calls into a surface keyed by
+pose and dimensions. Every frame after that costs one blit per entity
+instead of a dozen or more draw calls. The shapes are opaque with hard
+edges, so sprites use an RLE-accelerated colour key rather than per-pixel
+alpha: the same pixels, with blits several times faster.
+
+SpriteCache.draw() snaps interpolated positions to whole pixels, for the
+sprite and the procedural drawing alike. A sprite that would hang off the
+edge of the target is drawn procedurally instead: there pygame clips each
+line and ellipse separately and truncates negative coordinates toward zero,
+so the shape itself shifts as it crosses the edge and no single sprite
+matches it. Either way the result is pixel-identical to drawing without the
+cache, which --verify checks at whole, fractional and edge positions:
+
+    python3 sprite_cache.py --verify
+
+Frames drawn at a reduced resolution use scaled copies of the sprites,
+cached alongside the full-size ones.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import OrderedDict
+
+import pygame
+
+# Background of every sprite; none of the game's colours use it
+TRANSPARENT = (255, 0, 255)
+
+
+class Sprite:
+    __slots__ = ("surface", "origin_x", "origin_y")
+
+    def __init__(self, surface, origin_x, origin_y):
+        self.surface = surface
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+
+    def blit(self, target, x, y):
+        """Draw the sprite with its origin at (x, y). Returns the rect drawn."""
+        return target.blit(self.surface, (int(x) - self.origin_x, int(y) - self.origin_y))
+
+
+class SpriteCache:
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.enabled = True
+        self.sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.render_time = 0.0
+
+    def get(self, key, size, origin, draw):
+        """Return the sprite for key, calling draw(surface, origin_x, origin_y) to build it"""
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        start = time.perf_counter()
+        surface = pygame.Surface(size)
+        surface.fill(TRANSPARENT)
+        draw(surface, origin[0], origin[1])
+        if pygame.display.get_surface() is not None:
+            # Match the display's pixel format so blits take the fast path
+            surface = surface.convert()
+        surface.set_colorkey(TRANSPARENT, pygame.RLEACCEL)
+        sprite = Sprite(surface, origin[0], origin[1])
+        self.render_time += time.perf_counter() - start
+        self.misses += 1
+        self._store(key, sprite)
+        return sprite
+
+    def get_scaled(self, key, size, origin, draw, scale):
+        """Return the sprite for key shrunk or grown by scale, cached next to the full-size one"""
+        scaled_key = (key, scale)
+        sprite = self.sprites.get(scaled_key)
+        if sprite is not None:
+            self.sprites.move_to_end(scaled_key)
+            self.hits += 1
+            return sprite
+
+        full = self.get(key, size, origin, draw)
+        start = time.perf_counter()
+        # Nearest-neighbour scaling keeps the colour key's pixels exact
+        surface = pygame.transform.scale(full.surface, (max(1, round(size[0] * scale)),
+                                                        max(1, round(size[1] * scale))))
+        surface.set_colorkey(TRANSPARENT, pygame.RLEACCEL)
+        sprite = Sprite(surface, int(origin[0] * scale), int(origin[1] * scale))
+        self.render_time += time.perf_counter() - start
+        self.misses += 1
+        self._store(scaled_key, sprite)
+        return sprite
+
+    def _store(self, key, sprite):
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_entries:
+            self.sprites.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.sprites.clear()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "sprites": len(self.sprites),
+            "evictions": self.evictions,
+            "render_ms": round(self.render_time * 1000, 3),
+        }
+
+    def draw(self, surface, key, size, origin, draw, x, y, scale=1):
+        """Draw the look cached under key with its origin at (x, y), snapped to
+        whole pixels. Draws procedurally when the cache is off or the sprite
+        would be clipped by the surface. On a view scale times the screen size,
+        the position is scaled and a scaled sprite is always blitted, since
+        there is no procedural drawing at that size."""
+        if scale != 1:
+            self.get_scaled(key, size, origin, draw, scale).blit(surface, x * scale, y * scale)
+            return
+        x, y = int(x), int(y)
+        if self.enabled and surface.get_clip().contains((x - origin[0], y - origin[1]) + tuple(size)):
+            self.get(key, size, origin, draw).blit(surface, x, y)
+        else:
+            draw(surface, x, y)
+
+
+def count_differences(a, b):
+    """Number of pixels that differ between two surfaces of the same size"""
+    import numpy as np
+
+    return int(np.any(pygame.surfarray.array3d(a) != pygame.surfarray.array3d(b), axis=2).sum())
+
+
+def verify():
+    """Compare cached and procedural drawing of every pose at whole, fractional
+    and edge-clipped positions"""
+    import parachute_game
+    from parachute_game import SKY_BLUE, Cloud, Plane, Player
+    from simulation import SCREEN_WIDTH, SCREEN_HEIGHT
+    import random
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    cached = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    procedural = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    cache = parachute_game.sprite_cache
+
+    entities = []
+    for deployed in (False, True):
+        for alive in (True, False):
+            player = Player()
+            if deployed:
+                player.deploy_parachute()
+            player.alive = alive
+            entities.append((f"player deployed={deployed} alive={alive}", player))
+    entities.append(("plane", Plane()))
+    rng = random.Random(0)
+    entities.extend((f"cloud {i}", Cloud(rng)) for i in range(20))
+
+    # Whole pixels, then the fractional positions interpolation produces,
+    # then positions hanging off each edge of the screen
+    positions = [(400, 300), (123, 457), (200, 60), (600, 200),
+                 (400.5, 300.25), (123.9, 457.1), (200.01, 60.99),
+                 (0, 0), (-30, 250), (-30.6, 250.4), (SCREEN_WIDTH - 20, 300),
+                 (SCREEN_WIDTH - 20.5, 300.5), (300, -20), (300.3, -20.7),
+                 (300, SCREEN_HEIGHT - 30), (300.8, SCREEN_HEIGHT - 30.2)]
+    # Previous positions and blend factors, as the main loop draws between ticks
+    steps = [(0.0, 0.0, 1.0), (-3.0, 7.0, 0.37), (5.5, -2.25, 0.81)]
+
+    failures = 0
+    checks = 0
+    for name, entity in entities:
+        for x, y in positions:
+            for dx, dy, alpha in steps:
+                entity.x, entity.y = x, y
+                entity.prev_x, entity.prev_y = x + dx, y + dy
+                procedural.fill(SKY_BLUE)
+                cached.fill(SKY_BLUE)
+                cache.enabled = False
+                entity.draw(procedural, alpha)
+                cache.enabled = True
+                entity.draw(cached, alpha)
+                checks += 1
+                if pygame.image.tostring(procedural, "RGB") != pygame.image.tostring(cached, "RGB"):
+                    failures += 1
+                    print(f"MISMATCH {name} at {entity.interpolate(alpha)}: "
+                          f"{count_differences(procedural, cached)} pixels")
+
+    print(f"{checks - failures}/{checks} sprite draws pixel-identical "
+          f"({len(cache.sprites)} sprites cached)")
+    pygame.quit()
+    return failures == 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sprite cache checks")
+    parser.add_argument("--verify", action="store_true",
+                        help="check cached sprites against procedural drawing")
+    args = parser.parse_args(argv)
+    if args.verify:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        return 0 if verify() else 1
+    parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
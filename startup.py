@@ -0,0 +1,154 @@
+"""
+Startup for the parachute game.
+
+The first frame only needs the display and the fonts. The game initializes
+just those SDL subsystems, then an AssetLoader opens the mixer on a
+background thread. That thread also decodes the WAV files, or synthesizes
+the sounds. The plane run is drawn in the meantime, and the main loop
+attaches the sounds at a frame boundary once they are ready. Until then the
+sound bank plays nothing.
+
+StartupTimer records when each phase ends, counted from the moment the game
+module started importing. `parachute_game.py --measure-startup` prints those
+phases and the import costs gathered with `python -X importtime`, then
+exits:
+
+    python3 parachute_game.py --measure-startup
+"""
+
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+import pygame
+
+import synth
+
+# "import time: self [us] | cumulative | name", the name indented two spaces per level
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+class StartupTimer:
+    def __init__(self, start):
+        self.start = start
+        # (thread, phase, seconds since start), appended from the main and loader threads
+        self.marks = []
+
+    def mark(self, phase, thread="main"):
+        self.marks.append((thread, phase, time.perf_counter() - self.start))
+
+    def elapsed(self, phase):
+        """Seconds from the start to the end of phase, or None if it has not happened"""
+        for _, name, at in self.marks:
+            if name == phase:
+                return at
+        return None
+
+    def report(self):
+        """Phase lines, each with its own duration and its end time"""
+        lines = [f"{'thread':<8}{'phase':<18}{'took ms':>9}{'at ms':>9}"]
+        previous = {}
+        for thread, phase, at in self.marks:
+            # A thread's first phase counts from the main thread's last mark, around when it started
+            took = at - previous.get(thread, previous.get("main", 0.0))
+            previous[thread] = at
+            lines.append(f"{thread:<8}{phase:<18}{took * 1000:9.1f}{at * 1000:9.1f}")
+        return lines
+
+
+def import_costs(module, top=10):
+    """Import times of module in a fresh interpreter, from -X importtime.
+
+    Returns (interpreter startup, module cumulative, heaviest direct imports as
+    (name, cumulative) pairs), in seconds."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True)
+    interpreter = 0.0
+    total = None
+    children = []
+    pending = []
+    # Modules are listed after everything they import, so direct imports come
+    # just before their parent
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match is None:
+            continue
+        cumulative = int(match.group(2)) / 1e6
+        depth = (len(match.group(3)) - 1) // 2
+        name = match.group(4)
+        if depth == 1:
+            pending.append((name, cumulative))
+        elif depth == 0:
+            if name == module:
+                total = cumulative
+                children = pending
+            else:
+                interpreter += cumulative
+            pending = []
+    if total is None:
+        raise RuntimeError(f"Could not import {module}: {result.stderr.strip()[-500:]}")
+    children.sort(key=lambda child: child[1], reverse=True)
+    return interpreter, total, children[:top]
+
+
+class AssetLoader:
+    """Opens the mixer and decodes the sounds on a background thread"""
+
+    def __init__(self, sound_bank, synthesize=False, timer=None):
+        self.sound_bank = sound_bank
+        self.synthesize = synthesize
+        self.timer = timer
+        self.sounds = None
+        self.attached = False
+        self.thread = threading.Thread(target=self._run, name="asset-loader", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _mark(self, phase):
+        if self.timer is not None:
+            self.timer.mark(phase, "loader")
+
+    def _run(self):
+        try:
+            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+        except pygame.error as e:
+            print(f"Error initializing sound: {e}")
+            return
+        self._mark("mixer init")
+        try:
+            if self.synthesize:
+                self.sounds = synth.make_sounds()
+            else:
+                self.sounds = self.sound_bank.decode_all()
+        except Exception as e:
+            print(f"Error loading sounds: {e}")
+            return
+        self._mark("sounds decoded")
+
+    @property
+    def done(self):
+        return self.attached or not self.thread.is_alive()
+
+    def attach(self):
+        """Hand the decoded sounds to the sound bank on the calling thread.
+        Returns True on the one call that attached them."""
+        if self.attached or self.thread.is_alive():
+            return False
+        self.attached = True
+        if not self.sounds:
+            return False
+        if self.synthesize:
+            self.sound_bank.load_sounds(self.sounds)
+        else:
+            self.sound_bank.attach(self.sounds)
+        self.sounds = None
+        return True
+
+    def join(self):
+        self.thread.join()
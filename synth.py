@@ -0,0 +1,180 @@
+"""
+Vectorized sound synthesis for the parachute game.
+
+Every effect is generated as a whole NumPy array (oscillators, filtered noise
+and envelopes are array expressions, never per-sample Python loops), so all
+six sounds are ready in a few milliseconds. The results are stereo int16
+buffers that pygame.sndarray turns straight into mixer Sounds, so the game can
+start without reading any WAV files. The same buffers can be exported as WAV
+files:
+
+    python3 synth.py --out sounds
+"""
+
+import argparse
+import os
+import time
+import wave
+
+import numpy as np
+
+SAMPLE_RATE = 44100
+
+# Sounds are deterministic: noise always comes from the same seed
+NOISE_SEED = 1234
+
+
+def timeline(duration, sample_rate):
+    """Sample times in seconds for a sound of the given duration"""
+    return np.arange(int(duration * sample_rate), dtype=np.float64) / sample_rate
+
+
+def envelope(n, sample_rate, attack=0.01, release=0.05):
+    """Linear fade in and fade out over n samples, so sounds never click"""
+    env = np.ones(n)
+    a = min(n, int(attack * sample_rate))
+    r = min(n - a, int(release * sample_rate))
+    if a:
+        env[:a] = np.linspace(0.0, 1.0, a, endpoint=False)
+    if r:
+        env[n - r:] = np.linspace(1.0, 0.0, r)
+    return env
+
+
+def sweep(t, start_freq, end_freq):
+    """Sine whose frequency glides linearly from start_freq to end_freq"""
+    duration = t[-1] if len(t) > 1 else 1.0
+    phase = 2 * np.pi * (start_freq * t + (end_freq - start_freq) * t * t / (2 * duration))
+    return np.sin(phase)
+
+
+def lowpass_noise(n, rng, width):
+    """White noise smoothed by a moving average of width samples"""
+    white = rng.uniform(-1.0, 1.0, n + width)
+    summed = np.cumsum(white)
+    smooth = (summed[width:] - summed[:-width]) / width
+    return smooth / max(1e-9, np.abs(smooth).max())
+
+
+def jump(sample_rate, rng):
+    t = timeline(0.2, sample_rate)
+    return sweep(t, 400, 800) * envelope(len(t), sample_rate, 0.005, 0.08) * 0.6
+
+
+def parachute_open(sample_rate, rng):
+    t = timeline(0.5, sample_rate)
+    # A whoosh of noise as the canopy fills, over a falling tone
+    whoosh = lowpass_noise(len(t), rng, 24) * np.exp(-t * 6)
+    tone = sweep(t, 300, 180) * 0.4
+    return (whoosh * 0.7 + tone) * envelope(len(t), sample_rate, 0.01, 0.15) * 0.8
+
+
+def wind(sample_rate, rng):
+    t = timeline(1.0, sample_rate)
+    # Slowly swelling filtered noise; one full swell per second so it loops
+    gust = 0.6 + 0.4 * np.sin(2 * np.pi * t - np.pi / 2)
+    return lowpass_noise(len(t), rng, 60) * gust * envelope(len(t), sample_rate, 0.05, 0.05) * 0.5
+
+
+def crash(sample_rate, rng):
+    t = timeline(0.8, sample_rate)
+    noise = rng.uniform(-1.0, 1.0, len(t)) * np.exp(-t * 8)
+    thud = np.sin(2 * np.pi * 100 * t) * np.exp(-t * 4)
+    return (noise * 0.6 + thud * 0.6) * envelope(len(t), sample_rate, 0.002, 0.1)
+
+
+def landing(sample_rate, rng):
+    t = timeline(0.3, sample_rate)
+    # Two-note rising chime
+    freq = np.where(t < 0.12, 500.0, 750.0)
+    phase = 2 * np.pi * np.cumsum(freq) / sample_rate
+    return np.sin(phase) * np.exp(-(t % 0.12) * 12) * envelope(len(t), sample_rate, 0.005, 0.05) * 0.7
+
+
+def background(sample_rate, rng):
+    t = timeline(3.0, sample_rate)
+    # Soft major chord on 350 Hz; every partial completes whole cycles in
+    # 3 seconds, so the music loops without a seam
+    chord = (np.sin(2 * np.pi * 350 * t)
+             + 0.5 * np.sin(2 * np.pi * 437.5 * t)
+             + 0.5 * np.sin(2 * np.pi * 525 * t))
+    pulse = 0.7 + 0.3 * np.sin(2 * np.pi * t)
+    return chord / 2.0 * pulse * 0.3
+
+
+SOUND_GENERATORS = {
+    "jump.wav": jump,
+    "parachute_open.wav": parachute_open,
+    "wind.wav": wind,
+    "crash.wav": crash,
+    "landing.wav": landing,
+    "background.wav": background,
+}
+
+
+def to_int16(mono, channels=2):
+    """Clip a float waveform in [-1, 1] to int16 with one column per channel"""
+    samples = (np.clip(mono, -1.0, 1.0) * 32767).astype(np.int16)
+    if channels == 1:
+        return samples
+    return np.ascontiguousarray(np.repeat(samples[:, None], channels, axis=1))
+
+
+def generate_all(sample_rate=SAMPLE_RATE, channels=2, seed=NOISE_SEED):
+    """Return a dict mapping sound file name to its int16 sample buffer"""
+    rng = np.random.default_rng(seed)
+    return {name: to_int16(generate(sample_rate, rng), channels)
+            for name, generate in SOUND_GENERATORS.items()}
+
+
+def make_sounds(buffers=None):
+    """Build pygame mixer Sounds from generated buffers, matching the mixer's format"""
+    import pygame
+
+    frequency, _size, channels = pygame.mixer.get_init()
+    if buffers is None:
+        buffers = generate_all(frequency, channels)
+    return {name: pygame.sndarray.make_sound(samples) for name, samples in buffers.items()}
+
+
+def write_wav(path, samples, sample_rate=SAMPLE_RATE):
+    """Write an int16 buffer of shape (n,) or (n, channels) to a WAV file"""
+    channels = 1 if samples.ndim == 1 else samples.shape[1]
+    with wave.open(path, "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.astype("<i2").tobytes())
+
+
+def export(directory="sounds", sample_rate=SAMPLE_RATE, channels=2):
+    """Generate every sound and write it to directory as a WAV file"""
+    os.makedirs(directory, exist_ok=True)
+    for name, samples in generate_all(sample_rate, channels).items():
+        path = os.path.join(directory, name)
+        write_wav(path, samples, sample_rate)
+        print(f"Created {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the parachute game sounds")
+    parser.add_argument("--out", default="sounds", help="directory to write WAV files to")
+    parser.add_argument("--sample-rate", type=int, default=SAMPLE_RATE)
+    parser.add_argument("--mono", action="store_true", help="write mono instead of stereo files")
+    parser.add_argument("--timing", action="store_true",
+                        help="only report how long synthesis takes, without writing files")
+    args = parser.parse_args(argv)
+
+    channels = 1 if args.mono else 2
+    if args.timing:
+        start = time.perf_counter()
+        buffers = generate_all(args.sample_rate, channels)
+        elapsed = time.perf_counter() - start
+        samples = sum(len(b) for b in buffers.values())
+        print(f"Generated {len(buffers)} sounds ({samples} frames) in {elapsed * 1000:.1f} ms")
+        return
+    export(args.out, args.sample_rate, channels)
+
+
+if __name__ == "__main__":
+    main()
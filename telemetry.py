@@ -0,0 +1,456 @@
+"""
+Per-tick flight telemetry for the parachute game.
+
+TelemetryRecorder captures one row per simulation tick of a descent: the
+player's position and speed, the inputs held, the wind, state flags and the
+events of that tick. Rows go into preallocated NumPy column buffers. When a
+chunk fills up, or a descent ends, the buffers are handed to a writer thread
+and a spare set takes their place, so the frame loop never waits on the disk.
+
+Each recording session is a directory of append-only column files:
+
+    columns.json    column names and dtypes
+    <column>.bin    raw little-endian values, one per row
+
+Rows are only ever appended. After a crash, the columns may differ in
+length, so a reader trusts the shortest one. The analysis memory-maps the
+columns and walks them in chunks. It first finds the few rows that carry
+events, then gathers the other columns only at those rows. Landing
+heatmaps, deploy-altitude histograms and crash causes over millions of
+descents therefore never load whole columns into memory.
+
+    python3 parachute_game.py --telemetry telemetry
+    python3 telemetry.py telemetry --simulate 20000 --workers 0
+    python3 telemetry.py telemetry
+"""
+
+import argparse
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+
+import numpy as np
+
+import simulation
+from rewind import random_policy
+from simulation import GROUND_Y, SCREEN_WIDTH
+
+COLUMNS = (
+    ("run", "<u4"),
+    ("tick", "<u4"),
+    ("x", "<f4"),
+    ("y", "<f4"),
+    ("speed_x", "<f4"),
+    ("speed_y", "<f4"),
+    ("wind", "<f4"),
+    ("inputs", "u1"),
+    ("flags", "u1"),
+    ("events", "u1"),
+)
+SCHEMA_FILE = "columns.json"
+
+# Bits of the inputs column
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_DEPLOY = 4
+
+# Bits of the flags column, describing the state after the tick
+FLAG_JUMPING = 1
+FLAG_PARACHUTE = 2
+FLAG_ALIVE = 4
+FLAG_LANDED = 8
+FLAG_SAFE_ZONE = 16
+FLAG_REWOUND = 32
+
+# Bits of the events column
+EVENT_BITS = {
+    simulation.EVENT_JUMP: 1,
+    simulation.EVENT_PARACHUTE: 2,
+    simulation.EVENT_WIND: 4,
+    simulation.EVENT_CRASH: 8,
+    simulation.EVENT_LANDING: 16,
+}
+END_EVENTS = EVENT_BITS[simulation.EVENT_CRASH] | EVENT_BITS[simulation.EVENT_LANDING]
+ANALYSED_EVENTS = END_EVENTS | EVENT_BITS[simulation.EVENT_PARACHUTE]
+
+# Rows per buffer chunk, and spare chunks the writer can fill before the recorder has to allocate
+CHUNK_ROWS = 1 << 16
+SPARE_CHUNKS = 2
+
+PLAYER_WIDTH = 40
+PLAYER_HEIGHT = 60
+
+HEATMAP_BIN = 40
+ALTITUDE_BIN = 50
+WIND_BINS = 5
+
+
+def session_name():
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+
+
+class TelemetryWriter:
+    """Appends filled column chunks to a session directory on a background thread"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        schema = os.path.join(path, SCHEMA_FILE)
+        if not os.path.exists(schema):
+            partial = schema + ".tmp"
+            with open(partial, "w") as f:
+                json.dump({"columns": [list(column) for column in COLUMNS]}, f)
+            os.replace(partial, schema)
+        self.files = [open(os.path.join(path, name + ".bin"), "ab") for name, _ in COLUMNS]
+        self.pending = queue.Queue()
+        self.free = queue.Queue()
+        self.rows_written = 0
+        self.write_time = 0.0
+        self.failed = False
+        self.thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, columns, rows):
+        """Queue the first rows of columns for writing; the writer hands them back through free"""
+        self.pending.put((columns, rows))
+
+    def _run(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            columns, rows = item
+            start = time.perf_counter()
+            if not self.failed:
+                try:
+                    for f, column in zip(self.files, columns):
+                        f.write(memoryview(column[:rows]))
+                        f.flush()
+                    self.rows_written += rows
+                except OSError as e:
+                    # Keep the game running; later chunks are dropped rather than half written
+                    print(f"Error writing telemetry to {self.path}: {e}")
+                    self.failed = True
+            self.write_time += time.perf_counter() - start
+            self.free.put(columns)
+
+    def close(self):
+        self.pending.put(None)
+        self.thread.join()
+        for f in self.files:
+            f.close()
+
+
+class TelemetryRecorder:
+    def __init__(self, root, session=None, chunk_rows=CHUNK_ROWS):
+        self.path = os.path.join(root, session or session_name())
+        self.chunk_rows = chunk_rows
+        self.writer = TelemetryWriter(self.path)
+        for _ in range(SPARE_CHUNKS):
+            self.writer.free.put(self._allocate())
+        self.columns = self._allocate()
+        self.row = 0
+        self.run = -1
+        self.rows = 0
+        # Chunks allocated because the writer had not handed one back yet
+        self.allocations = 0
+
+    def _allocate(self):
+        return tuple(np.zeros(self.chunk_rows, dtype) for _, dtype in COLUMNS)
+
+    def start_run(self):
+        """Begin a new descent; its rows share the next run number"""
+        self.run += 1
+
+    def record(self, sim, inputs, events):
+        """Store the tick sim has just stepped, with the inputs and events of that step"""
+        player = sim.player
+        flags = 0
+        if sim.jumping:
+            flags |= FLAG_JUMPING
+        if player.parachute_deployed:
+            flags |= FLAG_PARACHUTE
+        if player.alive:
+            flags |= FLAG_ALIVE
+        if player.landed:
+            flags |= FLAG_LANDED
+        event_bits = 0
+        for event in events:
+            event_bits |= EVENT_BITS[event]
+        if event_bits & END_EVENTS and sim.in_safe_zone():
+            flags |= FLAG_SAFE_ZONE
+        if getattr(sim, "rewound", False):
+            flags |= FLAG_REWOUND
+
+        i = self.row
+        run, tick, x, y, speed_x, speed_y, wind, input_bits, flag_bits, events_column = self.columns
+        run[i] = self.run
+        tick[i] = sim.tick
+        x[i] = player.x
+        y[i] = player.y
+        speed_x[i] = player.speed_x
+        speed_y[i] = player.speed_y
+        wind[i] = sim.wind_direction
+        input_bits[i] = inputs.left * INPUT_LEFT | inputs.right * INPUT_RIGHT | inputs.deploy * INPUT_DEPLOY
+        flag_bits[i] = flags
+        events_column[i] = event_bits
+        self.row = i + 1
+        self.rows += 1
+        if self.row == self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        """Hand the rows recorded so far to the writer thread and carry on in a spare chunk"""
+        if not self.row:
+            return
+        self.writer.submit(self.columns, self.row)
+        try:
+            self.columns = self.writer.free.get_nowait()
+        except queue.Empty:
+            self.columns = self._allocate()
+            self.allocations += 1
+        self.row = 0
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+    def stats(self):
+        return {
+            "rows": self.rows,
+            "rows_written": self.writer.rows_written,
+            "runs": self.run + 1,
+            "write_ms": round(self.writer.write_time * 1000, 3),
+            "allocations": self.allocations,
+        }
+
+
+class TelemetrySession:
+    """Read-only memory maps of one session directory's columns"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, SCHEMA_FILE)) as f:
+            columns = json.load(f)["columns"]
+        self.columns = {}
+        for name, dtype in columns:
+            dtype = np.dtype(dtype)
+            column_path = os.path.join(path, name + ".bin")
+            count = os.path.getsize(column_path) // dtype.itemsize if os.path.exists(column_path) else 0
+            # Empty files cannot be mapped
+            self.columns[name] = (np.memmap(column_path, dtype, mode="r", shape=(count,)) if count
+                                  else np.zeros(0, dtype))
+        # Columns are appended one after another, so a crash can leave some longer
+        self.rows = min(len(column) for column in self.columns.values())
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+
+def find_sessions(paths):
+    """Session directories among paths and their immediate subdirectories"""
+    for path in paths:
+        if os.path.exists(os.path.join(path, SCHEMA_FILE)):
+            yield path
+        elif os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if os.path.exists(os.path.join(path, name, SCHEMA_FILE)):
+                    yield os.path.join(path, name)
+
+
+def histogram(values, bin_width, top):
+    counts, edges = np.histogram(np.clip(values, 0, top - 1e-3), bins=np.arange(0, top + bin_width, bin_width))
+    return {"edges": edges.tolist(), "counts": counts.tolist()}
+
+
+def analyse_session(session, chunk_rows, totals):
+    """Add one session's landings, deploys, crashes and steering to totals"""
+    events = session["events"]
+    rows = session.rows
+
+    # A rewound descent is practice as a whole: its ticks from before the
+    # rewind, and an end it reached before, are left out too
+    rewound = []
+    for start in range(0, rows, chunk_rows):
+        end = min(rows, start + chunk_rows)
+        marked = (session["flags"][start:end] & FLAG_REWOUND) != 0
+        rewound.append(np.unique(session["run"][start:end][marked]))
+    rewound = np.unique(np.concatenate(rewound)) if rewound else np.zeros(0, np.uint32)
+
+    # The rows that carry events are a few per descent; everything else is
+    # only read as sums over chunks
+    event_rows = []
+    steering = np.zeros((WIND_BINS, 3), np.int64)
+    for start in range(0, rows, chunk_rows):
+        end = min(rows, start + chunk_rows)
+        event_rows.append(np.flatnonzero(events[start:end] & ANALYSED_EVENTS) + start)
+
+        # Steering under an open canopy: against the wind, with it, or not at all
+        flags = session["flags"][start:end]
+        gliding = (flags & (FLAG_PARACHUTE | FLAG_ALIVE | FLAG_LANDED)) == (FLAG_PARACHUTE | FLAG_ALIVE)
+        if len(rewound):
+            gliding &= ~np.isin(session["run"][start:end], rewound)
+        wind = session["wind"][start:end][gliding]
+        inputs = session["inputs"][start:end][gliding]
+        pushing_left = (inputs & INPUT_LEFT) != 0
+        pushing_right = (inputs & INPUT_RIGHT) != 0
+        against = np.where(wind > 0, pushing_left, pushing_right) & (wind != 0)
+        along = np.where(wind > 0, pushing_right, pushing_left) & (wind != 0)
+        strength = np.minimum((np.abs(wind) * WIND_BINS).astype(np.int64), WIND_BINS - 1)
+        kind = np.where(against, 0, np.where(along, 1, 2))
+        steering += np.bincount(strength * 3 + kind, minlength=WIND_BINS * 3).reshape(WIND_BINS, 3)
+    event_rows = np.concatenate(event_rows) if event_rows else np.zeros(0, np.int64)
+    totals["steering"] += steering
+
+    bits = np.asarray(events[event_rows])
+    run = np.asarray(session["run"][event_rows])
+    flags = np.asarray(session["flags"][event_rows])
+    x = np.asarray(session["x"][event_rows])
+    y = np.asarray(session["y"][event_rows])
+
+    # One end row per finished descent, leaving out the practice ones
+    ends = np.flatnonzero(bits & END_EVENTS)
+    practice = np.isin(run[ends], rewound)
+    totals["rewound"] += len(np.unique(run[ends[practice]]))
+    ends = ends[~practice]
+    totals["descents"] += len(ends)
+
+    end_flags = flags[ends]
+    center = x[ends] + PLAYER_WIDTH / 2
+    crashed = (end_flags & FLAG_ALIVE) == 0
+    in_zone = (end_flags & FLAG_SAFE_ZONE) != 0
+    totals["landing_x"]["safe_zone"].append(center[~crashed & in_zone])
+    totals["landing_x"]["outside_zones"].append(center[~crashed & ~in_zone])
+    totals["landing_x"]["crash"].append(center[crashed])
+
+    landed = (end_flags & FLAG_LANDED) != 0
+    parachute = (end_flags & FLAG_PARACHUTE) != 0
+    causes = totals["crash_causes"]
+    causes["obstacle_in_free_fall"] += int((crashed & ~landed & ~parachute).sum())
+    causes["obstacle_under_canopy"] += int((crashed & ~landed & parachute).sum())
+    causes["hard_landing_no_parachute"] += int((crashed & landed & ~parachute).sum())
+    causes["hard_landing_under_canopy"] += int((crashed & landed & parachute).sum())
+
+    # The last canopy opening before each end row of the same descent
+    deploys = np.flatnonzero(bits & EVENT_BITS[simulation.EVENT_PARACHUTE])
+    before = np.searchsorted(deploys, ends, side="right") - 1
+    matched = before >= 0
+    matched[matched] = run[deploys[before[matched]]] == run[ends[matched]]
+    deploy_rows = deploys[before[matched]]
+    totals["deploy_altitude"].append(GROUND_Y - (y[deploy_rows] + PLAYER_HEIGHT))
+    totals["never_deployed"] += int((~matched).sum())
+    totals["rows"] += rows
+
+
+def analyse(paths, chunk_rows=CHUNK_ROWS * 16):
+    totals = {
+        "rows": 0,
+        "descents": 0,
+        "rewound": 0,
+        "never_deployed": 0,
+        "landing_x": {"safe_zone": [], "outside_zones": [], "crash": []},
+        "deploy_altitude": [],
+        "crash_causes": {"obstacle_in_free_fall": 0, "obstacle_under_canopy": 0,
+                         "hard_landing_no_parachute": 0, "hard_landing_under_canopy": 0},
+        "steering": np.zeros((WIND_BINS, 3), np.int64),
+    }
+    start = time.perf_counter()
+    sessions = 0
+    for path in find_sessions(paths):
+        analyse_session(TelemetrySession(path), chunk_rows, totals)
+        sessions += 1
+    elapsed = time.perf_counter() - start
+
+    descents = totals["descents"]
+    landing_x = {kind: np.concatenate(parts) if parts else np.zeros(0)
+                 for kind, parts in totals["landing_x"].items()}
+    altitude = np.concatenate(totals["deploy_altitude"]) if totals["deploy_altitude"] else np.zeros(0)
+    steering = totals["steering"]
+    summary = {
+        "sessions": sessions,
+        "ticks": totals["rows"],
+        "descents": descents,
+        "rewound_descents_skipped": totals["rewound"],
+        "seconds": round(elapsed, 3),
+        "ticks_per_second": round(totals["rows"] / elapsed) if elapsed > 0 else None,
+        "outcomes": {kind: len(values) for kind, values in landing_x.items()},
+        "landing_heatmap": {kind: histogram(values, HEATMAP_BIN, SCREEN_WIDTH)
+                            for kind, values in landing_x.items()},
+        "deploy_altitude": histogram(altitude, ALTITUDE_BIN, GROUND_Y),
+        "never_deployed": totals["never_deployed"],
+        "crash_causes": totals["crash_causes"],
+        "steering_under_canopy": [
+            {"wind": [round(i / WIND_BINS, 2), round((i + 1) / WIND_BINS, 2)],
+             "against": round(float(row[0] / row.sum()), 4) if row.sum() else 0.0,
+             "with": round(float(row[1] / row.sum()), 4) if row.sum() else 0.0,
+             "ticks": int(row.sum())}
+            for i, row in enumerate(steering)
+        ],
+    }
+    if len(altitude):
+        summary["deploy_altitude"]["median"] = round(float(np.median(altitude)), 1)
+    return summary
+
+
+def simulate_session(root, session, runs, seed):
+    """Record runs seeded descents flown by the random rewind policy"""
+    recorder = TelemetryRecorder(root, session)
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for run in range(runs):
+        sim = simulation.Simulation(rng.getrandbits(32))
+        policy = random_policy(random.Random(rng.getrandbits(32)))
+        recorder.start_run()
+        while not sim.game_over and sim.tick < 5000:
+            inputs = policy(sim)
+            recorder.record(sim, inputs, sim.step(inputs))
+    elapsed = time.perf_counter() - start
+    recorder.close()
+    return recorder.stats(), elapsed
+
+
+def simulate(root, runs, workers=None, seed=0):
+    """Record runs descents, one session per worker process"""
+    workers = workers or os.cpu_count() or 1
+    shares = [runs // workers + (i < runs % workers) for i in range(workers)]
+    name = session_name()
+    jobs = [(root, f"{name}-sim{i}", share, seed + i) for i, share in enumerate(shares) if share]
+    start = time.perf_counter()
+    if len(jobs) == 1:
+        results = [simulate_session(*jobs[0])]
+    else:
+        # Imported here so the game, which only records, does not load multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            results = list(pool.map(simulate_session, *zip(*jobs)))
+    elapsed = time.perf_counter() - start
+    rows = sum(stats["rows"] for stats, _ in results)
+    busy = sum(seconds for _, seconds in results)
+    print(f"Recorded {runs} descents, {rows} ticks in {elapsed:.1f}s "
+          f"({busy / rows * 1e6:.2f} us per simulated and recorded tick), "
+          f"writer {sum(stats['write_ms'] for stats, _ in results):.0f} ms, "
+          f"{sum(stats['allocations'] for stats, _ in results)} extra chunk allocations", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record and analyse per-tick flight telemetry")
+    parser.add_argument("paths", nargs="+", help="telemetry directories, or session directories inside them")
+    parser.add_argument("--simulate", type=int, default=0, metavar="RUNS",
+                        help="first record RUNS simulated descents into the first path")
+    parser.add_argument("--workers", type=int, default=1, help="processes for --simulate (0 for one per CPU)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk", type=int, default=CHUNK_ROWS * 16, help="rows per analysis chunk")
+    args = parser.parse_args(argv)
+
+    if args.simulate:
+        simulate(args.paths[0], args.simulate, args.workers or None, args.seed)
+    print(json.dumps(analyse(args.paths, args.chunk), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
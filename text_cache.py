@@ -0,0 +1,96 @@
+"""
+Font and rendered-text cache for the parachute game HUD.
+
+Fonts are built once per size, and rendered text surfaces are cached by
+(text, size, color, antialias) with least-recently-used eviction, so only
+strings that actually change get re-rendered each frame.
+"""
+
+import time
+from collections import OrderedDict
+
+import pygame
+
+
+class TextRenderer:
+    def __init__(self, max_entries=128, font_name=None):
+        self.max_entries = max_entries
+        self.font_name = font_name
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+
+        # Counters for the frame in progress
+        self.frame_hits = 0
+        self.frame_misses = 0
+        self.frame_render_time = 0.0
+
+        # Stats from the last completed frame and running totals
+        self.last_frame = {"hits": 0, "misses": 0, "hit_rate": 1.0, "render_ms": 0.0}
+        self.frames = 0
+        self.total_hits = 0
+        self.total_misses = 0
+        self.total_render_time = 0.0
+        self.evictions = 0
+
+    def font(self, size):
+        """Return the font for size, creating it on first use"""
+        font = self.fonts.get(size)
+        if font is None:
+            if self.font_name is None:
+                # SysFont(None) gives the same default font, but only after
+                # scanning every installed font on its first call
+                font = pygame.font.Font(None, size)
+            else:
+                font = pygame.font.SysFont(self.font_name, size)
+            self.fonts[size] = font
+        return font
+
+    def render(self, text, size, color, antialias=True):
+        """Return a surface with text rendered, reusing a cached one when possible"""
+        key = (text, size, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.frame_hits += 1
+            return surface
+
+        start = time.perf_counter()
+        surface = self.font(size).render(text, antialias, color)
+        self.frame_render_time += time.perf_counter() - start
+        self.frame_misses += 1
+
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def end_frame(self):
+        """Close the current frame's counters and return its stats"""
+        lookups = self.frame_hits + self.frame_misses
+        self.last_frame = {
+            "hits": self.frame_hits,
+            "misses": self.frame_misses,
+            "hit_rate": self.frame_hits / lookups if lookups else 1.0,
+            "render_ms": self.frame_render_time * 1000,
+        }
+        self.frames += 1
+        self.total_hits += self.frame_hits
+        self.total_misses += self.frame_misses
+        self.total_render_time += self.frame_render_time
+        self.frame_hits = 0
+        self.frame_misses = 0
+        self.frame_render_time = 0.0
+        return self.last_frame
+
+    def stats(self):
+        """Return cache counters averaged over all completed frames"""
+        lookups = self.total_hits + self.total_misses
+        return {
+            "frames": self.frames,
+            "hit_rate": round(self.total_hits / lookups, 4) if lookups else 1.0,
+            "render_ms_per_frame": round(self.total_render_time * 1000 / max(1, self.frames), 4),
+            "cached_surfaces": len(self.surfaces),
+            "fonts": len(self.fonts),
+            "evictions": self.evictions,
+        }
@@ -28,6 +28,21 @@ const COLORS = {
   PLANE_SILVER: 0xe0e0e0
 };
 
+// Draw order of the baked static layers; everything that moves sits above
+// them at the default depth of 0
+const DEPTH = {
+  SKY: -4,
+  TERRAIN: -3,
+  SAFE_ZONE_PULSE: -2,
+  SAFE_ZONE_MARKINGS: -1
+};
+
+// Screen strips covered by the baked terrain and safe zone markings. Obstacles
+// are at most 100px tall, and the markings reach a few pixels around the ground line
+const TERRAIN_TOP = GROUND_Y - 110;
+const ZONE_MARKINGS_TOP = GROUND_Y - 20;
+const ZONE_MARKINGS_HEIGHT = 30;
+
 // Game state
 let gameState = {
   score: 0,
@@ -46,6 +61,23 @@ let gameState = {
   rKey: null
 };
 
+// Sound effects, rendered once into buffers at startup
+const SOUND_EFFECTS = {
+  jump: { frequency: 440, duration: 0.3, type: 'square' },
+  parachute: { frequency: 880, duration: 0.5, type: 'sawtooth' },
+  crash: { frequency: 220, duration: 0.8, type: 'square' },
+  landing: { frequency: 660, duration: 0.4, type: 'sine' },
+  wind: { frequency: 110, duration: 0.6, type: 'triangle' }
+};
+
+// Most effects that can sound at once; a new one steals the oldest voice
+const MAX_VOICES = 4;
+
+// Wind bed volume at full wind strength, and the filter range it sweeps
+const WIND_BED_LEVEL = 0.05;
+const WIND_BED_MIN_HZ = 300;
+const WIND_BED_MAX_HZ = 1200;
+
 // Sound management
 class SoundManager {
   constructor(scene) {
@@ -53,6 +85,8 @@ class SoundManager {
     this.sounds = {};
     this.audioContext = null;
     this.enabled = true;
+    this.voices = [];
+    this.wind = null;
     
     // Initialize Web Audio API for sound generation
     try {
@@ -60,48 +94,174 @@ class SoundManager {
     } catch (e) {
       console.warn('Web Audio API not supported');
       this.enabled = false;
+      return;
+    }
+    
+    const context = this.audioContext;
+    this.master = context.createGain();
+    this.master.connect(context.destination);
+    
+    // Fixed pool of gain chains; only the one-shot buffer sources are created per play
+    for (let i = 0; i < MAX_VOICES; i++) {
+      const gain = context.createGain();
+      gain.connect(this.master);
+      this.voices.push({ gain: gain, source: null, startedAt: 0 });
+    }
+    
+    this.renderEffects();
+    this.createWindBed();
+    
+    // Browsers keep audio suspended until the player interacts with the page
+    scene.input.keyboard.once('keydown', () => this.resume());
+    scene.input.once('pointerdown', () => this.resume());
+  }
+  
+  // Render every effect once with an OfflineAudioContext
+  renderEffects() {
+    const Offline = window.OfflineAudioContext || window.webkitOfflineAudioContext;
+    if (!Offline) {
+      console.warn('OfflineAudioContext not supported, sound effects disabled');
+      return;
+    }
+    
+    const sampleRate = this.audioContext.sampleRate;
+    for (const [name, effect] of Object.entries(SOUND_EFFECTS)) {
+      const offline = new Offline(1, Math.ceil(effect.duration * sampleRate), sampleRate);
+      const oscillator = offline.createOscillator();
+      const gainNode = offline.createGain();
+      
+      oscillator.connect(gainNode);
+      gainNode.connect(offline.destination);
+      
+      oscillator.frequency.setValueAtTime(effect.frequency, 0);
+      oscillator.type = effect.type;
+      
+      gainNode.gain.setValueAtTime(0.1, 0);
+      gainNode.gain.exponentialRampToValueAtTime(0.01, effect.duration);
+      
+      oscillator.start(0);
+      oscillator.stop(effect.duration);
+      
+      // oncomplete rather than the promise so older WebKit works too
+      offline.oncomplete = event => {
+        this.sounds[name] = event.renderedBuffer;
+      };
+      offline.startRendering();
     }
   }
   
-  // Generate a simple tone
-  generateTone(frequency, duration, type = 'sine') {
-    if (!this.enabled || !this.audioContext) return;
+  // Looping filtered noise whose level, brightness and pan follow the wind
+  createWindBed() {
+    const context = this.audioContext;
+    const noise = context.createBuffer(1, context.sampleRate * 2, context.sampleRate);
+    const samples = noise.getChannelData(0);
+    for (let i = 0; i < samples.length; i++) {
+      samples[i] = Math.random() * 2 - 1;
+    }
+    
+    const source = context.createBufferSource();
+    source.buffer = noise;
+    source.loop = true;
     
-    const oscillator = this.audioContext.createOscillator();
-    const gainNode = this.audioContext.createGain();
+    const filter = context.createBiquadFilter();
+    filter.type = 'lowpass';
+    filter.frequency.value = WIND_BED_MIN_HZ;
     
-    oscillator.connect(gainNode);
-    gainNode.connect(this.audioContext.destination);
+    const gain = context.createGain();
+    gain.gain.value = 0;
     
-    oscillator.frequency.setValueAtTime(frequency, this.audioContext.currentTime);
-    oscillator.type = type;
+    source.connect(filter);
+    filter.connect(gain);
+    if (context.createStereoPanner) {
+      const panner = context.createStereoPanner();
+      gain.connect(panner);
+      panner.connect(this.master);
+      this.wind = { source: source, filter: filter, gain: gain, panner: panner, direction: 0, started: false };
+    } else {
+      gain.connect(this.master);
+      this.wind = { source: source, filter: filter, gain: gain, panner: null, direction: 0, started: false };
+    }
+  }
+  
+  resume() {
+    if (!this.enabled) return;
+    if (this.audioContext.state === 'suspended') {
+      this.audioContext.resume();
+    }
+    if (!this.wind.started) {
+      this.wind.source.start();
+      this.wind.started = true;
+    }
+  }
+  
+  // Steer the wind bed towards a wind direction in [-1, 1]; the bed keeps
+  // playing, only its parameters glide to the new values
+  setWind(direction) {
+    if (!this.enabled || direction === this.wind.direction) return;
+    this.wind.direction = direction;
     
-    gainNode.gain.setValueAtTime(0.1, this.audioContext.currentTime);
-    gainNode.gain.exponentialRampToValueAtTime(0.01, this.audioContext.currentTime + duration);
+    const now = this.audioContext.currentTime;
+    const strength = Math.min(1, Math.abs(direction));
+    this.wind.gain.gain.setTargetAtTime(strength * WIND_BED_LEVEL, now, 0.5);
+    this.wind.filter.frequency.setTargetAtTime(
+      WIND_BED_MIN_HZ + strength * (WIND_BED_MAX_HZ - WIND_BED_MIN_HZ), now, 0.5);
+    if (this.wind.panner) {
+      this.wind.panner.pan.setTargetAtTime(direction * 0.8, now, 0.5);
+    }
+  }
+  
+  // Free voice if there is one, otherwise the one that started longest ago
+  claimVoice() {
+    let oldest = this.voices[0];
+    for (const voice of this.voices) {
+      if (!voice.source) return voice;
+      if (voice.startedAt < oldest.startedAt) oldest = voice;
+    }
+    oldest.source.onended = null;
+    oldest.source.stop();
+    oldest.source.disconnect();
+    oldest.source = null;
+    return oldest;
+  }
+  
+  // Play a pre-rendered effect through the voice pool
+  play(name) {
+    if (!this.enabled) return;
+    const buffer = this.sounds[name];
+    if (!buffer) return;
     
-    oscillator.start(this.audioContext.currentTime);
-    oscillator.stop(this.audioContext.currentTime + duration);
+    const voice = this.claimVoice();
+    const source = this.audioContext.createBufferSource();
+    source.buffer = buffer;
+    source.connect(voice.gain);
+    source.onended = () => {
+      source.disconnect();
+      if (voice.source === source) voice.source = null;
+    };
+    voice.source = source;
+    voice.startedAt = this.audioContext.currentTime;
+    source.start();
   }
   
   // Play different sound effects
   playJump() {
-    this.generateTone(440, 0.3, 'square');
+    this.play('jump');
   }
   
   playParachute() {
-    this.generateTone(880, 0.5, 'sawtooth');
+    this.play('parachute');
   }
   
   playCrash() {
-    this.generateTone(220, 0.8, 'square');
+    this.play('crash');
   }
   
   playLanding() {
-    this.generateTone(660, 0.4, 'sine');
+    this.play('landing');
   }
   
   playWind() {
-    this.generateTone(110, 0.6, 'triangle');
+    this.play('wind');
   }
 }
 
@@ -491,36 +651,35 @@ class Obstacle {
     this.width = width;
     this.height = height;
     this.y = GROUND_Y - height;
-    this.graphics = scene.add.graphics();
   }
   
-  draw() {
-    this.graphics.clear();
-    
+  // Obstacles never move, so they are drawn once per level into the baked
+  // terrain layer rather than every frame
+  draw(graphics) {
     // Obstacle shadow
-    this.graphics.fillStyle(0x000000, 0.3);
-    this.graphics.fillRoundedRect(this.x + 2, this.y + 2, this.width, this.height, 8);
+    graphics.fillStyle(0x000000, 0.3);
+    graphics.fillRoundedRect(this.x + 2, this.y + 2, this.width, this.height, 8);
     
     // Main obstacle with gradient effect
-    this.graphics.fillStyle(COLORS.OBSTACLE_GREEN);
-    this.graphics.fillRoundedRect(this.x, this.y, this.width, this.height, 8);
+    graphics.fillStyle(COLORS.OBSTACLE_GREEN);
+    graphics.fillRoundedRect(this.x, this.y, this.width, this.height, 8);
     
     // Obstacle highlight
-    this.graphics.fillStyle(COLORS.GREEN, 0.6);
-    this.graphics.fillRoundedRect(this.x + 3, this.y + 3, this.width - 6, 12, 4);
+    graphics.fillStyle(COLORS.GREEN, 0.6);
+    graphics.fillRoundedRect(this.x + 3, this.y + 3, this.width - 6, 12, 4);
     
     // Enhanced warning markers with better visibility
     const markerHeight = 15;
     for (let i = 0; i < this.width; i += 20) {
       if (Math.floor(i / 20) % 2 === 0) {
         // Warning stripes
-        this.graphics.fillStyle(COLORS.WARNING_YELLOW);
-        this.graphics.fillRoundedRect(this.x + i, this.y, Math.min(20, this.width - i), markerHeight, 2);
+        graphics.fillStyle(COLORS.WARNING_YELLOW);
+        graphics.fillRoundedRect(this.x + i, this.y, Math.min(20, this.width - i), markerHeight, 2);
         
         // Black diagonal stripes for hazard effect
-        this.graphics.lineStyle(2, COLORS.BLACK, 0.8);
+        graphics.lineStyle(2, COLORS.BLACK, 0.8);
         for (let j = 0; j < 20; j += 6) {
-          this.graphics.lineBetween(
+          graphics.lineBetween(
             this.x + i + j, this.y,
             this.x + i + j + 4, this.y + markerHeight
           );
@@ -530,19 +689,15 @@ class Obstacle {
     
     // Danger symbol on larger obstacles
     if (this.width > 50) {
-      this.graphics.fillStyle(COLORS.RED);
+      graphics.fillStyle(COLORS.RED);
       const centerX = this.x + this.width / 2;
       const centerY = this.y + this.height / 2;
       
       // Exclamation mark
-      this.graphics.fillRoundedRect(centerX - 2, centerY - 15, 4, 20, 2);
-      this.graphics.fillCircle(centerX, centerY + 10, 3);
+      graphics.fillRoundedRect(centerX - 2, centerY - 15, 4, 20, 2);
+      graphics.fillCircle(centerX, centerY + 10, 3);
     }
   }
-  
-  destroy() {
-    this.graphics.destroy();
-  }
 }
 
 // Cloud class
@@ -755,7 +910,6 @@ function resetGame(scene) {
   if (gameState.player) gameState.player.destroy();
   if (gameState.plane) gameState.plane.destroy();
   
-  gameState.obstacles.forEach(obstacle => obstacle.destroy());
   gameState.clouds.forEach(cloud => cloud.destroy());
   
   // Reset game state
@@ -770,6 +924,7 @@ function resetGame(scene) {
   gameState.plane = new Plane(scene);
   gameState.obstacles = createObstacles(scene);
   gameState.landingZones = createLandingZones(scene, gameState.obstacles);
+  bakeLevel(scene);
   
   // Create clouds
   gameState.clouds = [];
@@ -778,6 +933,116 @@ function resetGame(scene) {
   }
 }
 
+// Render a Graphics object once into a render texture, then drop the geometry
+function bakeLayer(scene, layer, draw) {
+  const graphics = scene.make.graphics({}, false);
+  draw(graphics);
+  layer.clear();
+  layer.draw(graphics, -layer.x, -layer.y);
+  graphics.destroy();
+}
+
+// The sky gradient is the same for every level, so it is baked once
+function bakeSky(scene) {
+  scene.cameras.main.setBackgroundColor(COLORS.SKY_GRADIENT_TOP);
+  scene.skyLayer = scene.add.renderTexture(0, 0, GAME_WIDTH, GAME_HEIGHT)
+    .setOrigin(0, 0)
+    .setDepth(DEPTH.SKY);
+  
+  bakeLayer(scene, scene.skyLayer, graphics => {
+    // Sky gradient layers
+    const gradientSteps = 10;
+    for (let i = 0; i < gradientSteps; i++) {
+      const alpha = 0.1 - (i * 0.01);
+      const y = (GAME_HEIGHT / gradientSteps) * i;
+      const height = GAME_HEIGHT / gradientSteps;
+      
+      graphics.fillStyle(COLORS.SKY_GRADIENT_BOTTOM, alpha);
+      graphics.fillRect(0, y, GAME_WIDTH, height);
+    }
+  });
+}
+
+// Ground, obstacles and safe zone markings do not move once a level is laid
+// out. They are rendered into textures here, once per level, and drawGame()
+// only updates the alpha of the pulsing safe zone fills and labels.
+function bakeLevel(scene) {
+  if (!scene.terrainLayer) {
+    scene.terrainLayer = scene.add.renderTexture(0, TERRAIN_TOP, GAME_WIDTH, GAME_HEIGHT - TERRAIN_TOP)
+      .setOrigin(0, 0)
+      .setDepth(DEPTH.TERRAIN);
+    scene.zoneMarkingsLayer = scene.add.renderTexture(0, ZONE_MARKINGS_TOP, GAME_WIDTH, ZONE_MARKINGS_HEIGHT)
+      .setOrigin(0, 0)
+      .setDepth(DEPTH.SAFE_ZONE_MARKINGS);
+    scene.zonePulses = [];
+    scene.safeTexts = [];
+  }
+  
+  bakeLayer(scene, scene.terrainLayer, graphics => {
+    // Ground shadow/depth
+    graphics.fillStyle(0x000000, 0.3);
+    graphics.fillRect(0, GROUND_Y + 2, GAME_WIDTH, 22);
+    
+    // Main ground
+    graphics.fillStyle(COLORS.GROUND_BROWN);
+    graphics.fillRect(0, GROUND_Y, GAME_WIDTH, 20);
+    
+    // Ground texture lines
+    graphics.lineStyle(1, 0x3e2723, 0.5);
+    for (let i = 0; i < GAME_WIDTH; i += 30) {
+      graphics.lineBetween(i, GROUND_Y + 2, i + 15, GROUND_Y + 18);
+    }
+    
+    gameState.obstacles.forEach(obstacle => obstacle.draw(graphics));
+  });
+  
+  bakeLayer(scene, scene.zoneMarkingsLayer, graphics => {
+    gameState.landingZones.forEach(zone => {
+      // Zone border with glow effect
+      graphics.lineStyle(4, COLORS.SAFE_ZONE, 0.8);
+      graphics.strokeRect(zone.x - 2, zone.y - 2, zone.width + 4, zone.height + 4);
+      
+      // Enhanced ground marking
+      graphics.lineStyle(5, COLORS.WHITE, 0.9);
+      graphics.lineBetween(zone.x, GROUND_Y, zone.x + zone.width, GROUND_Y);
+      
+      // Safety indicators (chevrons)
+      const chevronCount = Math.floor(zone.width / 20);
+      graphics.lineStyle(2, COLORS.WHITE, 0.7);
+      for (let i = 0; i < chevronCount; i++) {
+        const chevronX = zone.x + 10 + (i * 20);
+        graphics.lineBetween(chevronX - 5, GROUND_Y - 8, chevronX, GROUND_Y - 3);
+        graphics.lineBetween(chevronX, GROUND_Y - 3, chevronX + 5, GROUND_Y - 8);
+      }
+    });
+  });
+  
+  // Pulsing zone fills are plain rectangles whose alpha changes each frame
+  scene.zonePulses.forEach(pulse => pulse.destroy());
+  scene.zonePulses = gameState.landingZones.map(zone =>
+    scene.add.rectangle(zone.x, zone.y, zone.width, zone.height, COLORS.SAFE_ZONE)
+      .setOrigin(0, 0)
+      .setDepth(DEPTH.SAFE_ZONE_PULSE)
+  );
+  
+  // "SAFE" text with better styling; labels left over from a level with more
+  // zones are hidden
+  gameState.landingZones.forEach((zone, index) => {
+    if (!scene.safeTexts[index]) {
+      scene.safeTexts[index] = scene.add.text(0, 0, 'SAFE', {
+        font: 'bold 14px Orbitron',
+        fill: '#ffffff',
+        stroke: '#00e676',
+        strokeThickness: 2
+      }).setOrigin(0.5);
+    }
+    scene.safeTexts[index].setPosition(zone.x + zone.width / 2, GROUND_Y - 20).setVisible(true);
+  });
+  for (let i = gameState.landingZones.length; i < scene.safeTexts.length; i++) {
+    scene.safeTexts[i].setVisible(false);
+  }
+}
+
 // Phaser scene functions
 function preload() {
   // No assets to preload - we're using generated graphics
@@ -796,6 +1061,7 @@ function create() {
   gameState.highScores = loadHighScores();
   
   // Initialize game
+  bakeSky(this);
   resetGame(this);
   
   // UI Text objects with enhanced styling and proper positioning
@@ -855,6 +1121,7 @@ function create() {
 function update() {
   // Update wind
   updateWind();
+  this.soundManager.setWind(gameState.windDirection);
   
   // Update plane
   gameState.plane.update();
@@ -906,25 +1173,13 @@ function update() {
 }
 
 function drawGame(scene) {
-  // Enhanced background with gradient sky
-  scene.cameras.main.setBackgroundColor(COLORS.SKY_GRADIENT_TOP);
-  
-  // Draw atmospheric layers for depth
-  if (!scene.backgroundGraphics) {
-    scene.backgroundGraphics = scene.add.graphics();
-  }
-  scene.backgroundGraphics.clear();
-  
-  // Sky gradient layers
-  const gradientSteps = 10;
-  for (let i = 0; i < gradientSteps; i++) {
-    const alpha = 0.1 - (i * 0.01);
-    const y = (GAME_HEIGHT / gradientSteps) * i;
-    const height = GAME_HEIGHT / gradientSteps;
-    
-    scene.backgroundGraphics.fillStyle(COLORS.SKY_GRADIENT_BOTTOM, alpha);
-    scene.backgroundGraphics.fillRect(0, y, GAME_WIDTH, height);
-  }
+  // Sky, ground, obstacles and safe zone markings are baked in bakeSky() and
+  // bakeLevel(); the safe zones only need their pulse updated
+  const now = Date.now();
+  scene.zonePulses.forEach((pulse, index) => {
+    pulse.setAlpha(0.4 + 0.2 * Math.sin(now * 0.005 + index));
+    scene.safeTexts[index].setAlpha(0.8 + 0.2 * Math.sin(now * 0.008 + index));
+  });
   
   // Draw clouds first (background layer)
   gameState.clouds.forEach(cloud => cloud.draw());
@@ -932,75 +1187,6 @@ function drawGame(scene) {
   // Draw plane
   gameState.plane.draw();
   
-  // Enhanced ground with texture
-  if (!scene.groundGraphics) {
-    scene.groundGraphics = scene.add.graphics();
-  }
-  scene.groundGraphics.clear();
-  
-  // Ground shadow/depth
-  scene.groundGraphics.fillStyle(0x000000, 0.3);
-  scene.groundGraphics.fillRect(0, GROUND_Y + 2, GAME_WIDTH, 22);
-  
-  // Main ground
-  scene.groundGraphics.fillStyle(COLORS.GROUND_BROWN);
-  scene.groundGraphics.fillRect(0, GROUND_Y, GAME_WIDTH, 20);
-  
-  // Ground texture lines
-  scene.groundGraphics.lineStyle(1, 0x3e2723, 0.5);
-  for (let i = 0; i < GAME_WIDTH; i += 30) {
-    scene.groundGraphics.lineBetween(i, GROUND_Y + 2, i + 15, GROUND_Y + 18);
-  }
-  
-  // Enhanced landing zones with better visibility
-  if (!scene.landingZoneGraphics) {
-    scene.landingZoneGraphics = scene.add.graphics();
-  }
-  scene.landingZoneGraphics.clear();
-  
-  gameState.landingZones.forEach((zone, index) => {
-    // Pulsing safe zone effect
-    const pulseAlpha = 0.4 + 0.2 * Math.sin(Date.now() * 0.005 + index);
-    
-    // Zone background with pulse
-    scene.landingZoneGraphics.fillStyle(COLORS.SAFE_ZONE, pulseAlpha);
-    scene.landingZoneGraphics.fillRect(zone.x, zone.y, zone.width, zone.height);
-    
-    // Zone border with glow effect
-    scene.landingZoneGraphics.lineStyle(4, COLORS.SAFE_ZONE, 0.8);
-    scene.landingZoneGraphics.strokeRect(zone.x - 2, zone.y - 2, zone.width + 4, zone.height + 4);
-    
-    // Enhanced ground marking
-    scene.landingZoneGraphics.lineStyle(5, COLORS.WHITE, 0.9);
-    scene.landingZoneGraphics.lineBetween(zone.x, GROUND_Y, zone.x + zone.width, GROUND_Y);
-    
-    // Safety indicators (chevrons)
-    const chevronCount = Math.floor(zone.width / 20);
-    scene.landingZoneGraphics.lineStyle(2, COLORS.WHITE, 0.7);
-    for (let i = 0; i < chevronCount; i++) {
-      const chevronX = zone.x + 10 + (i * 20);
-      scene.landingZoneGraphics.lineBetween(chevronX - 5, GROUND_Y - 8, chevronX, GROUND_Y - 3);
-      scene.landingZoneGraphics.lineBetween(chevronX, GROUND_Y - 3, chevronX + 5, GROUND_Y - 8);
-    }
-    
-    // "SAFE" text with better styling
-    if (!scene.safeTexts) scene.safeTexts = [];
-    if (!scene.safeTexts[index]) {
-      scene.safeTexts[index] = scene.add.text(0, 0, 'SAFE', {
-        font: 'bold 14px Orbitron',
-        fill: '#ffffff',
-        stroke: '#00e676',
-        strokeThickness: 2
-      }).setOrigin(0.5);
-    }
-    
-    scene.safeTexts[index].setPosition(zone.x + zone.width / 2, GROUND_Y - 20);
-    scene.safeTexts[index].setAlpha(0.8 + 0.2 * Math.sin(Date.now() * 0.008 + index));
-  });
-  
-  // Draw obstacles (foreground)
-  gameState.obstacles.forEach(obstacle => obstacle.draw());
-  
   // Draw player if jumping
   if (gameState.jumping) {
     gameState.player.draw();
@@ -0,0 +1,196 @@
+"""
+Side-scrolling glide levels for the parachute game.
+
+A glide level is an endless strip of terrain cut into fixed-width chunks.
+Each chunk's obstacles and landing zones come from its own seed, derived
+from the level seed and the chunk number. A chunk can therefore be built
+on demand, thrown away once it is far behind, and rebuilt identically if
+the player comes back. Memory stays bounded however far the player drifts.
+
+World.stream() keeps the chunks around the camera loaded. Chunks the
+player could touch are built at once. Chunks ahead of the camera are built
+only while the frame's time budget lasts, so generation is spread across
+frames instead of landing in one.
+
+GlideSimulation runs the usual rules on such a level. The opened parachute
+glides forward instead of dropping straight down. Collisions, the safe zone
+test and the landing score only look at the chunks next to the player, so
+the outcome never depends on how far streaming has got.
+"""
+
+import random
+import time
+
+from simulation import (SCREEN_WIDTH, NO_INPUT, Obstacle, Player, Simulation, make_landing_zones,
+                        make_obstacles)
+from spatial_index import CenterSums, IntervalIndex
+
+CHUNK_WIDTH = SCREEN_WIDTH
+
+# Forward speed and maximum sink rate under an open parachute, in pixels per tick
+GLIDE_SPEED = 1.5
+GLIDE_SINK = 0.5
+
+
+def chunk_seed(world_seed, index):
+    """Seed for one chunk, so any chunk can be rebuilt without its neighbours"""
+    return (world_seed * 1000003 + index) & 0xFFFFFFFFFFFFFFFF
+
+
+class Chunk:
+    __slots__ = ("index", "left", "right", "obstacles", "landing_zones")
+
+    def __init__(self, index, obstacles, landing_zones):
+        self.index = index
+        self.left = index * CHUNK_WIDTH
+        self.right = self.left + CHUNK_WIDTH
+        self.obstacles = obstacles
+        self.landing_zones = landing_zones
+
+
+def generate_chunk(world_seed, index, obstacle_class=Obstacle):
+    """Build the terrain of one chunk with the same rules as a single-screen layout"""
+    rng = random.Random(chunk_seed(world_seed, index))
+    left = index * CHUNK_WIDTH
+    obstacles = make_obstacles(rng, obstacle_class, left, left + CHUNK_WIDTH)
+    return Chunk(index, obstacles, make_landing_zones(obstacles, left, left + CHUNK_WIDTH))
+
+
+class World:
+    def __init__(self, seed, obstacle_class=Obstacle, keep_behind=1, keep_ahead=2):
+        self.seed = seed
+        self.obstacle_class = obstacle_class
+        self.keep_behind = keep_behind
+        self.keep_ahead = keep_ahead
+        self.chunks = {}
+        self.generated = 0
+        self.evicted = 0
+        self._neighbourhood = None
+
+    @staticmethod
+    def chunk_at(x):
+        """Number of the chunk containing world x; the level starts at x = 0"""
+        return max(0, int(x // CHUNK_WIDTH))
+
+    def chunk(self, index):
+        """Return a chunk, building it now if it is not loaded"""
+        chunk = self.chunks.get(index)
+        if chunk is None:
+            chunk = self.chunks[index] = generate_chunk(self.seed, index, self.obstacle_class)
+            self.generated += 1
+        return chunk
+
+    def stream(self, left, right, budget=None, clock=time.perf_counter):
+        """Load the chunks covering [left, right) now and the ones ahead while the
+        budget in seconds lasts, then evict chunks outside the kept range.
+        Returns the number of chunks built."""
+        start = clock()
+        before = self.generated
+        first = self.chunk_at(left)
+        last = self.chunk_at(right - 1)
+        for index in range(first, last + 1):
+            self.chunk(index)
+
+        # Nearest chunks ahead first, stopping when the frame's time is used up
+        for index in range(last + 1, last + 1 + self.keep_ahead):
+            if budget is not None and clock() - start >= budget:
+                break
+            self.chunk(index)
+
+        low = first - self.keep_behind
+        high = last + self.keep_ahead
+        for index in [i for i in self.chunks if i < low or i > high]:
+            del self.chunks[index]
+            self.evicted += 1
+        return self.generated - before
+
+    def neighbourhood(self, x):
+        """Obstacle and zone indexes for the chunk at x and its two neighbours"""
+        index = self.chunk_at(x)
+        cached = self._neighbourhood
+        if cached is not None and cached[0] == index:
+            return cached[1]
+
+        chunks = [self.chunk(i) for i in range(max(0, index - 1), index + 2)]
+        obstacles = [obstacle for chunk in chunks for obstacle in chunk.obstacles]
+        zones = [zone for chunk in chunks for zone in chunk.landing_zones]
+        indexes = (IntervalIndex([obstacle.rect for obstacle in obstacles]),
+                   IntervalIndex(zones),
+                   CenterSums(obstacle.x + obstacle.width // 2 for obstacle in obstacles),
+                   obstacles, zones)
+        self._neighbourhood = (index, indexes)
+        return indexes
+
+    def loaded(self):
+        """Loaded chunks from left to right"""
+        return [self.chunks[i] for i in sorted(self.chunks)]
+
+    def stats(self):
+        return {"loaded": len(self.chunks), "generated": self.generated, "evicted": self.evicted}
+
+
+class Camera:
+    """Horizontal scroll position that keeps the player centred"""
+
+    def __init__(self):
+        self.x = 0.0
+
+    def follow(self, x, width):
+        # The level starts at 0, so never scroll left of it
+        self.x = max(0.0, x + width / 2 - SCREEN_WIDTH / 2)
+        return self.x
+
+    @property
+    def left(self):
+        return self.x
+
+    @property
+    def right(self):
+        return self.x + SCREEN_WIDTH
+
+
+class GlidePlayer(Player):
+    """Player whose open parachute glides forward over an unbounded level"""
+
+    def deploy_parachute(self):
+        opened = super().deploy_parachute()
+        if opened:
+            self.max_speed = GLIDE_SINK
+        return opened
+
+    def move(self, inputs):
+        super().move(inputs)
+        if self.parachute_deployed and not self.landed:
+            self.x += GLIDE_SPEED
+
+    def keep_in_bounds(self):
+        # Only the start of the level is a wall
+        if self.x < 0:
+            self.x = 0
+            self.speed_x = 0
+
+
+class GlideSimulation(Simulation):
+    player_class = GlidePlayer
+
+    def create_layout(self):
+        self.world = World(self.seed, self.obstacle_class)
+        self.use_neighbourhood(self.player.x)
+
+    def use_neighbourhood(self, x):
+        """Point collision, safe zone and scoring queries at the chunks around x"""
+        (self.obstacle_index, self.zone_index, self.obstacle_centers,
+         self.obstacles, self.landing_zones) = self.world.neighbourhood(x)
+
+    def unpack_state(self, buffer, offset=0):
+        super().unpack_state(buffer, offset)
+        self.use_neighbourhood(self.player.x)
+
+    def step(self, inputs=NO_INPUT):
+        self.use_neighbourhood(self.player.x)
+        return super().step(inputs)
+
+    def distance(self):
+        """How far the player has travelled along the level, in pixels"""
+        return self.player.x
+